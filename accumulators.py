@@ -0,0 +1,282 @@
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class HashSet:
+    """
+    Exact set of 64-bit hashes, 8 bytes per member, kept as disjoint sorted runs.
+
+    A batch drops the hashes already present and becomes a new run; the newest run
+    is merged into the previous one while that is at most twice its size, so every
+    hash is re-sorted O(log n) times in total rather than the whole set being
+    copied once per batch.
+    """
+    def __init__(self) -> None:
+        self.runs: List[np.ndarray] = []
+
+    def add(self, hashes: np.ndarray) -> None:
+        run = np.unique(hashes)
+        for existing in self.runs:
+            if not run.size:
+                return
+            positions = np.minimum(np.searchsorted(existing, run), existing.size - 1)
+            run = run[existing[positions] != run]
+        if not run.size:
+            return
+        self.runs.append(run)
+        while len(self.runs) > 1 and self.runs[-2].size <= 2 * self.runs[-1].size:
+            newest = self.runs.pop()
+            # two concatenated sorted runs: the stable (tim)sort merges them in linear time
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], newest]), kind="stable")
+
+    def merge(self, other: "HashSet") -> None:
+        for run in other.runs:
+            self.add(run)
+
+    def __len__(self) -> int:
+        return sum(run.size for run in self.runs)
+
+
+class RunningStats:
+    """Mergeable count/mean/variance/min/max over a stream of numeric chunks."""
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: Any) -> None:
+        """Fold a batch of values into the running state (NaN values are ignored)."""
+        arr = np.asarray(values, dtype="float64")
+        arr = arr[~np.isnan(arr)]
+        if arr.size == 0:
+            return
+        other = RunningStats()
+        other.count = int(arr.size)
+        other.mean = float(arr.mean())
+        other.m2 = float(((arr - other.mean) ** 2).sum())
+        other.min = float(arr.min())
+        other.max = float(arr.max())
+        self.merge(other)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Combine with another RunningStats (Chan et al. parallel variance update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> Optional[float]:
+        # Sample variance, matching pandas' default ddof=1
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        var = self.variance
+        return math.sqrt(var) if var is not None else None
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        empty = self.count == 0
+        return {
+            "count": float(self.count),
+            "mean": None if empty else self.mean,
+            "std": self.std,
+            "min": None if empty else self.min,
+            "max": None if empty else self.max,
+        }
+
+
+class TopKCounter:
+    """
+    Value counts with a bounded number of tracked candidates.
+
+    Counts are exact until more than 2 * capacity distinct values have been seen;
+    after that the tail is pruned and `truncated` is set, so the reported top-k may
+    under-count values that were pruned and later reappeared.
+    """
+    def __init__(self, capacity: int = 1000) -> None:
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.truncated = False
+
+    def update(self, series: pd.Series) -> None:
+        for value, count in series.value_counts(dropna=True).items():
+            self.counts[value] += int(count)
+        self._prune()
+
+    def merge(self, other: "TopKCounter") -> None:
+        self.counts.update(other.counts)
+        self.truncated = self.truncated or other.truncated
+        self._prune()
+
+    def _prune(self) -> None:
+        if len(self.counts) > 2 * self.capacity:
+            self.counts = Counter(dict(self.counts.most_common(self.capacity)))
+            self.truncated = True
+
+    def top(self, k: int = 10) -> Dict[Any, int]:
+        return dict(self.counts.most_common(k))
+
+    def modes(self) -> List[Any]:
+        """Values sharing the highest count, sorted like pandas' Series.mode()."""
+        if not self.counts:
+            return []
+        best = max(self.counts.values())
+        values = [value for value, count in self.counts.items() if count == best]
+        try:
+            return sorted(values)
+        except TypeError:
+            return values
+
+
+class ColumnAccumulator:
+    """
+    Per-column streaming state: null counts, numeric moments, top values and distinct values.
+
+    With exact=True the distinct count comes from a HashSet of value hashes (8 bytes per
+    distinct value); otherwise from a HyperLogLog of fixed size with relative standard
+    error `distinct_error`.
+    """
+    def __init__(self, name: str, top_capacity: int = 1000, exact: bool = True) -> None:
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.numeric = RunningStats()
+        self.is_numeric = True
+        self.values = TopKCounter(top_capacity)
+        self.exact = exact
+        if exact:
+            self._hashes: Any = HashSet()
+        else:
+            from sketches import HyperLogLog  # deferred: sketches imports RunningStats from here
+            self._hashes = HyperLogLog()
+
+    def update(self, series: pd.Series) -> None:
+        self.rows += len(series)
+        self.nulls += int(series.isnull().sum())
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            self.numeric.update(series.to_numpy(dtype="float64", na_value=np.nan))
+        else:
+            self.is_numeric = False
+        self.values.update(series)
+        non_null = series.dropna()
+        if len(non_null):
+            hashes = pd.util.hash_pandas_object(non_null, index=False).to_numpy()
+            if self.exact:
+                self._hashes.add(hashes)
+            else:
+                self._hashes.add_hashes(hashes)
+
+    def merge(self, other: "ColumnAccumulator") -> None:
+        if other.exact != self.exact:
+            raise ValueError("Exact and approximate column accumulators cannot be merged.")
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.numeric.merge(other.numeric)
+        self.is_numeric = self.is_numeric and other.is_numeric
+        self.values.merge(other.values)
+        self._hashes.merge(other._hashes)
+
+    @property
+    def distinct(self) -> int:
+        return len(self._hashes) if self.exact else self._hashes.estimate()
+
+    @property
+    def distinct_error(self) -> float:
+        return 0.0 if self.exact else self._hashes.relative_error
+
+
+class FrameAccumulator:
+    """
+    Single-pass summary of a DataFrame delivered in chunks.
+
+    Memory is bounded by the chunk size plus the per-column state: a few floats and
+    at most 2 * top_capacity value counts. Distinct values and duplicate rows are
+    exact by default, which costs 8 bytes per distinct value of every column and per
+    distinct row, so it grows with the data. With exact=False they are estimated by
+    a HyperLogLog per column (4 KiB each) and a Bloom filter sized for
+    `expected_rows` (about 1.2 bytes per row at a 1% false-positive rate).
+    Accumulators built over separate chunk ranges can be combined with `merge`.
+    """
+    def __init__(self, top_capacity: int = 1000, exact: bool = True, expected_rows: int = 1_000_000) -> None:
+        self.top_capacity = top_capacity
+        self.exact = exact
+        self.rows = 0
+        self.columns: Dict[str, ColumnAccumulator] = {}
+        if exact:
+            self._row_hashes: Any = HashSet()
+        else:
+            from sketches import BloomFilter  # deferred: sketches imports RunningStats from here
+            self._row_hashes = BloomFilter(expected_rows)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnAccumulator(col, self.top_capacity, self.exact)
+            self.columns[col].update(chunk[col])
+        if len(chunk):
+            hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+            if self.exact:
+                self._row_hashes.add(hashes)
+            else:
+                self._row_hashes.add_hashes(hashes)
+
+    def merge(self, other: "FrameAccumulator") -> None:
+        if other.exact != self.exact:
+            raise ValueError("Exact and approximate accumulators cannot be merged.")
+        self.rows += other.rows
+        for col, acc in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(acc)
+            else:
+                self.columns[col] = acc
+        self._row_hashes.merge(other._row_hashes)
+
+    @property
+    def duplicate_rows(self) -> int:
+        if self.exact:
+            return self.rows - len(self._row_hashes)
+        return self._row_hashes.estimate_duplicates()
+
+    def numeric_columns(self) -> List[str]:
+        return [col for col, acc in self.columns.items() if acc.is_numeric and acc.numeric.count]
+
+    def describe(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Streaming counterpart of DataFrame.describe() (quantiles need the full column)."""
+        return {col: self.columns[col].numeric.to_dict() for col in self.numeric_columns()}
+
+    def quality_report(self) -> Dict[str, Any]:
+        missing = {col: acc.nulls for col, acc in self.columns.items()}
+        report = {
+            "total_rows": self.rows,
+            "total_columns": len(self.columns),
+            "missing_values": missing,
+            "missing_percentages": {
+                col: (count / self.rows) * 100 if self.rows else 0.0 for col, count in missing.items()
+            },
+            "duplicate_rows": self.duplicate_rows,
+            "unique_values": {col: acc.distinct for col, acc in self.columns.items()},
+        }
+        if not self.exact:
+            # same shape as FrameSketch.quality_report
+            report["duplicate_rows"] = {"estimate": self.duplicate_rows,
+                                        "error": round(self._row_hashes.duplicate_error(), 1)}
+            report["unique_values_relative_error"] = round(
+                max((acc.distinct_error for acc in self.columns.values()), default=0.0), 4)
+        return report
@@ -1,10 +1,54 @@
 from printer import Printer
+from accumulators import FrameAccumulator
+from memo import ResultCache, bump_version, frame_version, memoized
+from profiling import DataProfile, ProfileStore, profile_frame
+from sketches import FrameSketch
+from groupby import (GroupIndex, GroupPartial, KeyTable, aggregate_chunks, aggregate_frame, format_keys,
+                     key_frame, order_groups, parse_keys)
+from correlation import METHODS as CORRELATION_METHODS, CorrelationEngine
+from refresh import append_rows
+from timeseries import AGGREGATIONS, FREQUENCIES, WINDOW_STATS, parse_datetimes, resample, window_stats
+import numpy as np
 import pandas as pd
+import calendar
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple
 
 class Analyzer:
-    def __init__(self, data) -> None:
+    # Bloom filter sizing when the row count is unknown up front (streaming mode)
+    STREAM_EXPECTED_ROWS = 10_000_000
+    # Beyond this many numeric columns correlation_analysis defaults to the top pairs
+    MATRIX_MAX_COLUMNS = 20
+    DEFAULT_TOP_PAIRS = 20
+    # Group-by results kept up to date across appends (least recently used dropped first)
+    MAINTAINED_GROUPINGS = 8
+    # Rows per sketch update when sketching an in-memory frame
+    SKETCH_CHUNK_ROWS = 65536
+
+    def __init__(self, data, chunks: Optional[Callable[[], Iterable[pd.DataFrame]]] = None,
+                 results: Optional[ResultCache] = None, approximate: bool = False,
+                 source: Optional[str] = None, profiles: Optional[ProfileStore] = None,
+                 exact_distinct: bool = False) -> None:
         self.printer = Printer().printer
         self.data = data
+        # Streaming mode: `chunks` returns a fresh iterator over the full dataset and
+        # `data` only holds a preview. Summary stats are then computed in one pass.
+        self.chunks = chunks
+        self._stream_summary: Optional[FrameAccumulator] = None
+        # Streamed distinct/duplicate counts are estimated (fixed memory) unless exact ones are asked for;
+        # exact ones keep 8 bytes per distinct value of each column and per distinct row
+        self.exact_distinct = exact_distinct
+        # Memoized results of the compute helpers, keyed by data_version()
+        self.results = results if results is not None else ResultCache()
+        # Approximate mode answers quality/distribution queries from mergeable sketches
+        self.approximate = approximate
+        # The file `data` was loaded from, as is; its column profile is persisted in `profiles`
+        self.source = source
+        self.profiles = profiles
+        # After append(): summary and group state folded forward from the new rows only
+        self._appended = False
+        self._summary: Optional[FrameAccumulator] = None
+        self._group_partials: "OrderedDict[tuple, Tuple[KeyTable, GroupPartial]]" = OrderedDict()
         if self.data is None or self.data.empty:
             self.printer("No data loaded.", "error")
             return
@@ -16,104 +60,378 @@ class Analyzer:
             self.printer("No data to analyze.", "error")
             return
 
+        if self.chunks is not None:
+            stats = self.stream_summary().describe()
+            self.printer("Basic Statistics (streamed):", "info")
+            self.printer(stats, "json")
+            return stats
+
         # Example analysis: print basic descriptive statistics for numeric columns
+        stats = self._describe()
         self.printer("Basic Statistics:", "info")
-        self.printer(self.data.describe().to_json(indent=2), "json")
+        self.printer(stats, "json")
+        return stats
+
+    def data_version(self) -> tuple:
+        """
+        Identify the current state of `data`: a process-wide version number per frame
+        (see memo.frame_version), so analyzers sharing a ResultCache share results for
+        the same frame and never see another frame's.
+        """
+        return (frame_version(self.data), self.data.shape, tuple(str(dtype) for dtype in self.data.dtypes))
+
+    def mark_data_changed(self) -> None:
+        """Invalidate memoized results after modifying `data` in place."""
+        bump_version(self.data)
+        self._stream_summary = None
+        self._summary = None
+        self._group_partials.clear()
+
+    def append(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add rows appended to the source file and return the extended frame. The
+        maintained summary (describe/quality) and group aggregates are updated from
+        `rows` alone; they are built with one pass over the data the first time they
+        are needed after an append, and rebuilt if an append widened a column's dtype.
+        """
+        if self.chunks is not None:
+            # `data` is only a preview; full-file results are streamed again on next use
+            self.mark_data_changed()
+            return self.data
+        previous = self.data
+        self.data = append_rows(previous, rows)
+        self._appended = True
+        widened = [col for col in previous.columns if previous[col].dtype != self.data[col].dtype
+                   and not isinstance(previous[col].dtype, pd.CategoricalDtype)]
+        if widened:
+            # hashes and partials were computed over the narrower values
+            self._summary = None
+            self._group_partials.clear()
+            return self.data
+        tail = self.data.iloc[len(previous):]
+        if self._summary is not None:
+            self._summary.update(tail)
+        for (keys, _), (table, partial) in self._group_partials.items():
+            part = GroupPartial(partial.columns)
+            part.update(table.encode(key_frame(tail, list(keys))), tail, table.size)
+            partial.merge(part)
+        return self.data
+
+    def maintained_summary(self) -> FrameAccumulator:
+        """Summary of the in-memory data that append() keeps current."""
+        if self._summary is None:
+            summary = FrameAccumulator()
+            summary.update(self.data)
+            self._summary = summary
+        return self._summary
+
+    def _maintained_groups(self, keys: tuple, columns: List[str]) -> Tuple[KeyTable, GroupPartial]:
+        state_key = (keys, tuple(columns))
+        if state_key in self._group_partials:
+            self._group_partials.move_to_end(state_key)
+            return self._group_partials[state_key]
+        table = KeyTable()
+        codes = table.encode(key_frame(self.data, list(keys)))
+        partial = GroupPartial(columns)
+        partial.update(codes, self.data, table.size)
+        self._group_partials[state_key] = (table, partial)
+        while len(self._group_partials) > self.MAINTAINED_GROUPINGS:
+            self._group_partials.popitem(last=False)
+        return table, partial
+
+    @memoized
+    def _describe(self) -> dict:
+        if not self._appended:
+            return self.data.describe().to_dict()
+        # After an append the moments come from the maintained summary; only the quartiles
+        # still need the columns (a selection, no full describe)
+        moments = self.maintained_summary().describe()
+        quartiles = self.data[list(moments)].quantile([0.25, 0.5, 0.75]) if moments else None
+        return {col: {"count": stats["count"], "mean": stats["mean"], "std": stats["std"], "min": stats["min"],
+                      "25%": quartiles.at[0.25, col], "50%": quartiles.at[0.5, col],
+                      "75%": quartiles.at[0.75, col], "max": stats["max"]}
+                for col, stats in moments.items()}
+
+    def stream_summary(self) -> FrameAccumulator:
+        """Accumulate summary state over all chunks in a single pass (computed once)."""
+        if self._stream_summary is None:
+            summary = FrameAccumulator(exact=self.exact_distinct, expected_rows=self.STREAM_EXPECTED_ROWS)
+            for chunk in self.chunks():
+                summary.update(chunk)
+            self._stream_summary = summary
+        return self._stream_summary
+
+    @memoized
+    def sketch_summary(self) -> FrameSketch:
+        """Build sketches over the full dataset (streamed when in streaming mode)."""
+        if self.chunks is not None:
+            sketch = FrameSketch(expected_rows=self.STREAM_EXPECTED_ROWS)
+            for chunk in self.chunks():
+                sketch.update(chunk)
+        else:
+            # bounded slices keep the per-update temporaries (hashes, factorized codes) small
+            sketch = FrameSketch(expected_rows=len(self.data))
+            for start in range(0, len(self.data), self.SKETCH_CHUNK_ROWS):
+                sketch.update(self.data.iloc[start:start + self.SKETCH_CHUNK_ROWS])
+        return sketch
+
+    def toggle_approximate(self):
+        """Switch between exact and sketch-based statistics."""
+        self.approximate = not self.approximate
+        state = "on" if self.approximate else "off"
+        self.printer(f"Approximate mode is now {state}.", "info")
+        return {"approximate": self.approximate}
+
+    def _warn_preview_only(self):
+        if self.chunks is not None:
+            self.printer(f"Streaming mode: this action only covers the first {len(self.data)} rows.", "warning")
 
     def check_data_quality(self):
         """Analyze data quality: missing values, duplicates, unique values per column"""
         if self.data.empty:
             self.printer("No data loaded.", "error")
             return
-        
-        # Missing values analysis
-        missing = self.data.isnull().sum()
-        missing_pct = (missing / len(self.data)) * 100
-        
-        # Duplicates analysis
-        duplicates = self.data.duplicated().sum()
-        
-        # Unique values per column
-        unique_counts = self.data.nunique()
-        
-        quality_report = {
-            "total_rows": len(self.data),
-            "total_columns": len(self.data.columns),
-            "missing_values": missing.to_dict(),
-            "missing_percentages": missing_pct.to_dict(),
-            "duplicate_rows": int(duplicates),
-            "unique_values": unique_counts.to_dict()
-        }
-        
+
+        if self.approximate:
+            quality_report = self.sketch_summary().quality_report()
+            self.printer("Data Quality Report (approximate):", "info")
+            self.printer(quality_report, self.data_output_style)
+            return quality_report
+
+        if self.chunks is not None:
+            quality_report = self.stream_summary().quality_report()
+            self.printer("Data Quality Report (streamed):", "info")
+            self.printer(quality_report, self.data_output_style)
+            return quality_report
+
+        quality_report = self._quality_report()
         self.printer("Data Quality Report:", "info")
         self.printer(quality_report, self.data_output_style)
+        return quality_report
+
+    @memoized
+    def _quality_report(self) -> dict:
+        if self._appended:
+            return self.maintained_summary().quality_report()
+        return self.data_profile().quality_report()
+
+    @memoized
+    def data_profile(self) -> DataProfile:
+        """Column profiles of `data`, from the persisted profile of the source file when there is one."""
+        persist = self.source is not None and self.profiles is not None and not self._appended
+        if persist:
+            stored = self.profiles.get(self.source, self.data)
+            if stored is not None:
+                return stored
+        profile = profile_frame(self.data)
+        if persist:
+            self.profiles.put(self.source, self.data, profile)
+        return profile
+
+    def profile_columns(self):
+        """Per-column type, nulls, distinct count, min/max and text lengths, computed in one pass per column."""
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        self._warn_preview_only()
+        profile = self.data_profile()
+        result = profile.table()
+        origin = "stored profile" if profile.stored else f"computed in {profile.seconds:.2f}s"
+        self.printer(f"Column profile ({profile.rows} rows, {profile.duplicate_rows} duplicate rows; {origin}):",
+                     "info")
+        self.printer(result, "table")
+        return result
 
-    
-    def group_analysis(self):
-        """Perform groupby analysis on selected columns"""
+    def group_analysis(self, group_col: Optional[str] = None, agg_col: Optional[str] = None,
+                       sort_by: Optional[str] = None, top_n: Optional[str] = None):
+        """
+        Perform groupby analysis on selected columns. `group_col` takes one or more
+        comma-separated keys, each optionally bucketed with ':width' (e.g. 'Team, Year:10').
+        """
         if self.data.empty:
             self.printer("No data loaded.", "error")
             return
         
         # Show numeric columns
-        numeric_cols = self.data.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        numeric_cols = self.data.select_dtypes(include='number').columns.tolist()
         self.printer("Available numeric columns:", "info")
         self.printer([{"column": col} for col in numeric_cols], self.data_output_style)
         
-        # Get group by column
-        group_col = input("Enter column name to group by: ").strip()
-        if group_col not in self.data.columns:
-            self.printer(f"Column '{group_col}' not found.", "error")
+        # Get group by column(s)
+        if group_col is None:
+            group_col = input("Enter column name(s) to group by, comma-separated, "
+                              "optionally bucketed as column:width: ").strip()
+        try:
+            keys = parse_keys(group_col)
+        except ValueError:
+            self.printer(f"Invalid bucket width in '{group_col}'.", "error")
+            return
+        missing = [name for name, _ in keys if name not in self.data.columns]
+        if not keys or missing:
+            self.printer(f"Column '{', '.join(missing) or group_col}' not found.", "error")
+            return
+        unbucketable = [name for name, width in keys if width is not None
+                        and not pd.api.types.is_numeric_dtype(self.data[name])
+                        and not pd.api.types.is_datetime64_any_dtype(self.data[name])]
+        if unbucketable:
+            self.printer(f"Column '{', '.join(unbucketable)}' must be numeric or a date to be bucketed.", "error")
             return
         
         # Get aggregation column
-        agg_col = input("Enter column to aggregate (press Enter for all numeric columns): ").strip()
+        if agg_col is None:
+            agg_col = input("Enter column to aggregate (press Enter for all numeric columns): ").strip()
         if agg_col and agg_col not in numeric_cols:
             self.printer(f"Column '{agg_col}' is not numeric.", "error")
             return
-        
-        # Perform groupby analysis
-        if agg_col:
-            result = self.data.groupby(group_col)[agg_col].agg(['mean', 'median', 'std', 'count']).round(2)
+
+        if sort_by is None:
+            sort_by = input("Sort groups by statistic, e.g. 'count' or 'HR.mean' (press Enter for key order): ").strip()
+        if top_n is None:
+            top_n = input("Number of groups to show (press Enter for all): ").strip()
+        try:
+            limit = int(top_n) if top_n else None
+        except ValueError:
+            self.printer("The number of groups must be an integer.", "error")
+            return
+
+        keys = tuple(keys)
+        if self.chunks is not None:
+            frame = self._stream_group_stats(keys, agg_col)
         else:
-            result = self.data.groupby(group_col)[numeric_cols].agg(['mean', 'median', 'std', 'count']).round(2)
-        
-        self.printer(f"\nGroup analysis by '{group_col}':", "info")
-        self.printer(result.to_dict('index'), self.data_output_style)
+            frame = self._group_stats(keys, agg_col)
+        try:
+            frame = order_groups(frame, sort_by or None, top_n=limit)
+        except KeyError as e:
+            self.printer(str(e.args[0]), "error")
+            return
+        result = frame.round(2).to_dict('index')
+        self.printer(f"\nGroup analysis by '{format_keys(list(keys))}':", "info")
+        if self.chunks is not None:
+            self.printer("Medians are approximate: merged from per-chunk summaries.", "info")
+        elif self._appended:
+            self.printer("Medians are approximate: merged with summaries of the appended rows.", "info")
+        self.printer(result, self.data_output_style)
+        return result
+
+    @memoized
+    def _group_index(self, keys: tuple) -> GroupIndex:
+        return GroupIndex(self.data, list(keys))
+
+    @memoized
+    def _group_stats(self, keys: tuple, agg_col: str) -> pd.DataFrame:
+        columns = [agg_col] if agg_col else self.data.select_dtypes(include='number').columns.tolist()
+        if self._appended:
+            table, partial = self._maintained_groups(keys, columns)
+            frame = partial.to_frame(table.labels)
+        else:
+            index = self._group_index(keys)
+            frame = aggregate_frame(self.data, index, columns).to_frame(index.table.labels)
+        return frame[agg_col] if agg_col else frame
 
-    def correlation_analysis(self):
-        """Analyze correlations between numeric columns"""
+    @memoized
+    def _stream_group_stats(self, keys: tuple, agg_col: str) -> pd.DataFrame:
+        columns = [agg_col] if agg_col else self.data.select_dtypes(include='number').columns.tolist()
+        table, partial = aggregate_chunks(self.chunks(), list(keys), columns)
+        if table.labels is None:
+            return pd.DataFrame()
+        frame = partial.to_frame(table.labels)
+        return frame[agg_col] if agg_col else frame
+
+    def correlation_analysis(self, method: Optional[str] = None, top_k: Optional[str] = None,
+                             threshold: Optional[str] = None):
+        """
+        Correlations between numeric columns (pearson or spearman, pairwise NaN handling).
+        With top_k the k strongest pairs with |r| >= threshold are reported instead of
+        the full matrix, which is the default for wide datasets.
+        """
         if self.data.empty:
             self.printer("No data loaded.", "error")
             return
-        
-        # Get numeric columns
-        numeric_cols = self.data.select_dtypes(include=['int64', 'float64'])
-        if numeric_cols.empty:
+        self._warn_preview_only()
+
+        numeric_count = len(self.data.select_dtypes(include='number').columns)
+        if numeric_count == 0:
             self.printer("No numeric columns found for correlation analysis.", "error")
             return
-        
-        # Calculate correlations
-        correlations = numeric_cols.corr().round(2)
-        
+        if method is None:
+            method = input("Correlation method, pearson or spearman (press Enter for pearson): ").strip()
+        method = (method or "pearson").lower()
+        if method not in CORRELATION_METHODS:
+            self.printer(f"Unknown correlation method '{method}'.", "error")
+            return
+        if top_k is None:
+            default = "" if numeric_count <= self.MATRIX_MAX_COLUMNS else str(self.DEFAULT_TOP_PAIRS)
+            hint = "full matrix" if not default else f"top {default} pairs"
+            top_k = input(f"Number of strongest pairs to show (press Enter for {hint}, 'all' for the matrix): ").strip()
+            top_k = top_k or default
+        if top_k and str(top_k).lower() != "all":
+            if threshold is None:
+                threshold = input("Minimum |r| (press Enter for 0): ").strip()
+            try:
+                k, min_r = int(top_k), float(threshold or 0)
+            except ValueError:
+                self.printer("The number of pairs must be an integer and the threshold a number.", "error")
+                return
+            pairs = self._top_correlations(method, k, min_r)
+            self.printer(f"Top {len(pairs)} {method} correlation(s) with |r| >= {min_r}:", "info")
+            self.printer(pairs, "table")
+            return pairs
+
+        correlations = self._correlations(method)
         self.printer("Correlation Matrix:", "info")
-        self.printer(correlations.to_dict('index'), self.data_output_style)
+        self.printer(correlations, self.data_output_style)
+        return correlations
+
+    @memoized
+    def _correlations(self, method: str = "pearson") -> dict:
+        return CorrelationEngine(self.data, method).matrix().round(2).to_dict('index')
 
-    def analyze_distribution(self):
+    @memoized
+    def _top_correlations(self, method: str, k: int, threshold: float) -> list:
+        pairs = CorrelationEngine(self.data, method).top_pairs(k, threshold)
+        return [{**pair, "r": round(pair["r"], 2)} for pair in pairs]
+
+    def analyze_distribution(self, col_name: Optional[str] = None):
         """Analyze value distributions in columns"""
         if self.data.empty:
             self.printer("No data loaded.", "error")
             return
         
         # Show available columns
-        self.printer("Available columns:", "info")
-        self.printer([{"column": col} for col in self.data.columns], "table")
+        if col_name is None:
+            self.printer("Available columns:", "info")
+            self.printer([{"column": col} for col in self.data.columns], "table")
         
         # Get column choice
-        col_name = input("Enter column name to analyze: ").strip()
+        if col_name is None:
+            col_name = input("Enter column name to analyze: ").strip()
         if col_name not in self.data.columns:
             self.printer(f"Column '{col_name}' not found.", "error")
             return
+
+        if self.approximate:
+            stats = self.sketch_summary().distribution(col_name)
+            self.printer(f"\nDistribution analysis for '{col_name}' (approximate):", "info")
+            self.printer(stats, self.data_output_style)
+            return stats
+
+        if self.chunks is not None:
+            column = self.stream_summary().columns[col_name]
+            stats = {
+                "value_counts": column.values.top(10),
+                "basic_stats": {
+                    "mean": column.numeric.mean if column.is_numeric and column.numeric.count else None,
+                    "median": None,  # exact medians need the whole column in memory
+                    "mode": column.values.modes(),
+                    "unique_values": column.distinct,
+                    "null_count": column.nulls
+                }
+            }
+            if not column.exact:
+                stats["basic_stats"]["unique_values_relative_error"] = round(column.distinct_error, 4)
+            self.printer(f"\nDistribution analysis for '{col_name}' (streamed):", "info")
+            self.printer(stats, self.data_output_style)
+            return stats
         
         # Calculate distribution statistics
         stats = {
@@ -129,54 +447,199 @@ class Analyzer:
         
         self.printer(f"\nDistribution analysis for '{col_name}':", "info")
         self.printer(stats, self.data_output_style)
+        return stats
 
-    def time_series_analysis(self):
+    def time_series_analysis(self, date_col: Optional[str] = None):
         """Analyze time-based patterns in the data"""
         if self.data.empty:
             self.printer("No data loaded.", "error")
             return
-        
-        # Show datetime columns
-        datetime_cols = self.data.select_dtypes(include=['datetime64']).columns.tolist()
-        if not datetime_cols:
-            self.printer("No datetime columns found. Would you like to convert a column to datetime?", "info")
-            col_name = input("Enter column name to convert (or press Enter to cancel): ").strip()
-            if not col_name:
-                return
-            if col_name not in self.data.columns:
-                self.printer(f"Column '{col_name}' not found.", "error")
-                return
-            try:
-                self.data[col_name] = pd.to_datetime(self.data[col_name])
-                datetime_cols = [col_name]
-            except Exception as e:
-                self.printer(f"Error converting to datetime: {str(e)}", "error")
-                return
-        
-        # Select datetime column
-        if len(datetime_cols) > 1:
-            self.printer("Available datetime columns:", "info")
-            self.printer([{"column": col} for col in datetime_cols], "table")
-            date_col = input("Enter datetime column name: ").strip()
-            if date_col not in datetime_cols:
-                self.printer(f"Column '{date_col}' is not a datetime column.", "error")
-                return
-        else:
-            date_col = datetime_cols[0]
-        
-        # Time-based analysis
-        analysis = {
+        self._warn_preview_only()
+        date_col = self._date_column(date_col)
+        if date_col is None:
+            return
+
+        analysis = self._time_summary(date_col)
+        self.printer(f"\nTime series analysis for '{date_col}':", "info")
+        self.printer(analysis, self.data_output_style)
+        return analysis
+
+    @memoized
+    def _time_summary(self, date_col: str) -> dict:
+        times = self._datetimes(date_col)
+        start, end = times.min(), times.max()
+        return {
             "temporal_distribution": {
-                "by_year": self.data[date_col].dt.year.value_counts().to_dict(),
-                "by_month": self.data[date_col].dt.month.value_counts().to_dict(),
-                "by_day_of_week": self.data[date_col].dt.day_name().value_counts().to_dict()
+                "by_year": times.dt.year.value_counts().to_dict(),
+                "by_month": times.dt.month.value_counts().to_dict(),
+                # counted as numbers and named afterwards: day_name() builds a string per row
+                "by_day_of_week": {calendar.day_name[day]: count
+                                   for day, count in times.dt.dayofweek.value_counts().items()}
             },
             "time_range": {
-                "start": self.data[date_col].min().strftime("%Y-%m-%d"),
-                "end": self.data[date_col].max().strftime("%Y-%m-%d"),
-                "total_days": (self.data[date_col].max() - self.data[date_col].min()).days
+                "start": start.strftime("%Y-%m-%d"),
+                "end": end.strftime("%Y-%m-%d"),
+                "total_days": (end - start).days
             }
         }
-        
-        self.printer(f"\nTime series analysis for '{date_col}':", "info")
-        self.printer(analysis, self.data_output_style)
+
+    def resample_time_series(self, date_col: Optional[str] = None, freq: Optional[str] = None,
+                             columns: Optional[str] = None, aggs: Optional[str] = None, by: Optional[str] = None):
+        """
+        Aggregate numeric columns per day/week/month/quarter/year, optionally one series
+        per group (e.g. by='Team'). `columns` and `aggs` are comma-separated.
+        """
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        self._warn_preview_only()
+        date_col = self._date_column(date_col)
+        if date_col is None:
+            return
+        numeric_cols = self.data.select_dtypes(include='number').columns.tolist()
+        freq = self._ask_frequency(freq)
+        if columns is None:
+            columns = input("Numeric column(s) to aggregate, comma-separated (press Enter for all): ").strip()
+        if aggs is None:
+            aggs = input(f"Aggregation(s) from {', '.join(AGGREGATIONS)}, comma-separated "
+                         "(press Enter for 'mean'): ").strip()
+        by = self._ask_split(by)
+        selected = [col.strip() for col in columns.split(",") if col.strip()] or numeric_cols
+        not_numeric = [col for col in selected if col not in numeric_cols]
+        if not_numeric:
+            self.printer(f"Column '{', '.join(not_numeric)}' is not numeric.", "error")
+            return
+        if by and by not in self.data.columns:
+            self.printer(f"Column '{by}' not found.", "error")
+            return
+        agg_list = [agg.strip() for agg in aggs.split(",") if agg.strip()] or ["mean"]
+        try:
+            frame = self._resampled(date_col, freq, tuple(selected), tuple(agg_list), by)
+        except ValueError as e:
+            self.printer(str(e), "error")
+            return
+        frame = self._flat_series(frame)
+        self.printer(f"\n'{date_col}' resampled by {FREQUENCIES[freq]}:", "info")
+        self.printer(frame.round(4), "table")
+        return frame.to_dict("records")
+
+    def rolling_statistics(self, date_col: Optional[str] = None, column: Optional[str] = None,
+                           freq: Optional[str] = None, agg: Optional[str] = None, window: Optional[str] = None,
+                           stats: Optional[str] = None, by: Optional[str] = None):
+        """
+        Rolling or expanding window statistics of a numeric column resampled to a regular
+        series, optionally per group. The window is a number of periods or 'expanding'.
+        """
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        self._warn_preview_only()
+        date_col = self._date_column(date_col)
+        if date_col is None:
+            return
+        numeric_cols = self.data.select_dtypes(include='number').columns.tolist()
+        if column is None:
+            self.printer("Available numeric columns:", "info")
+            self.printer([{"column": col} for col in numeric_cols], self.data_output_style)
+            column = input("Enter numeric column: ").strip()
+        if column not in numeric_cols:
+            self.printer(f"Column '{column}' is not numeric.", "error")
+            return
+        freq = self._ask_frequency(freq)
+        if agg is None:
+            agg = input("Aggregate each period with (press Enter for 'mean'): ").strip()
+        if window is None:
+            window = input("Window length in periods, or 'expanding' (press Enter for 3): ").strip()
+        if stats is None:
+            stats = input(f"Window statistic(s) from {', '.join(WINDOW_STATS)}, comma-separated "
+                          "(press Enter for 'mean'): ").strip()
+        by = self._ask_split(by)
+        if by and by not in self.data.columns:
+            self.printer(f"Column '{by}' not found.", "error")
+            return
+        window = window or "3"
+        try:
+            length = None if window.lower() == "expanding" else int(window)
+        except ValueError:
+            self.printer("The window must be a number of periods or 'expanding'.", "error")
+            return
+        stat_list = [stat.strip() for stat in stats.split(",") if stat.strip()] or ["mean"]
+        try:
+            frame = self._rolling(date_col, column, freq, agg or "mean", length, tuple(stat_list), by)
+        except ValueError as e:
+            self.printer(str(e), "error")
+            return
+        kind = "expanding" if length is None else f"{length}-period rolling"
+        self.printer(f"\n{kind} statistics of '{column}' by {FREQUENCIES[freq]}:", "info")
+        self.printer(frame.round(4), "table")
+        return frame.to_dict("records")
+
+    @memoized
+    def _datetimes(self, col: str) -> pd.Series:
+        """`col` parsed as datetimes; cached with the results, the column itself is left as it is."""
+        return parse_datetimes(self.data[col])
+
+    @memoized
+    def _resampled(self, date_col: str, freq: str, columns: tuple, aggs: tuple, by: str) -> pd.DataFrame:
+        return resample(self.data, self._datetimes(date_col), freq, list(columns), list(aggs), by or None)
+
+    @memoized
+    def _rolling(self, date_col: str, column: str, freq: str, agg: str, window: Optional[int],
+                 stats: tuple, by: str) -> pd.DataFrame:
+        series = self._resampled(date_col, freq, (column,), (agg,), by)[(column, agg)]
+        groups = series.index.codes[0] if by else None
+        # a window reports as soon as it holds one value, so gaps in the series do not blank it out
+        results = window_stats(series.to_numpy(dtype="float64", na_value=np.nan), list(stats), window,
+                               groups=groups, min_periods=1)
+        prefix = "expanding" if window is None else "rolling"
+        frame = series.rename(f"{column}.{agg}").to_frame()
+        for stat, values in results.items():
+            frame[f"{prefix}_{stat}"] = values
+        return self._flat_series(frame)
+
+    @staticmethod
+    def _flat_series(frame: pd.DataFrame) -> pd.DataFrame:
+        """Periods as dates and (column, agg) headers as 'column.agg', for printing."""
+        if isinstance(frame.columns, pd.MultiIndex):
+            frame = frame.set_axis([".".join(map(str, col)) for col in frame.columns], axis=1)
+        frame = frame.reset_index()
+        if "period" in frame.columns:
+            frame["period"] = frame["period"].dt.strftime("%Y-%m-%d")
+        return frame
+
+    def _ask_frequency(self, freq: Optional[str]) -> str:
+        if freq is None:
+            freq = input(f"Frequency: {', '.join(FREQUENCIES)} (press Enter for 'M'): ").strip()
+        return (freq or "M").upper()
+
+    def _ask_split(self, by: Optional[str]) -> str:
+        if by is None:
+            by = input("Column to split the series by, e.g. Team (press Enter for none): ").strip()
+        return by
+
+    def _date_column(self, date_col: Optional[str] = None) -> Optional[str]:
+        """
+        The column to use as time axis, prompting when not given. It is parsed once
+        (see _datetimes) instead of being rewritten in `data`; None after reporting an error.
+        """
+        datetime_cols = self.data.select_dtypes(include=['datetime64']).columns.tolist()
+        if date_col is None and len(datetime_cols) > 1:
+            self.printer("Available datetime columns:", "info")
+            self.printer([{"column": col} for col in datetime_cols], "table")
+            date_col = input("Enter datetime column name: ").strip()
+        elif date_col is None and datetime_cols:
+            date_col = datetime_cols[0]
+        elif date_col is None:
+            self.printer("No datetime columns found. Which column holds dates?", "info")
+            date_col = input("Enter column name to read as dates (or press Enter to cancel): ").strip()
+            if not date_col:
+                return None
+        if date_col not in self.data.columns:
+            self.printer(f"Column '{date_col}' not found.", "error")
+            return None
+        try:
+            self._datetimes(date_col)
+        except ValueError as e:
+            self.printer(f"Error converting to datetime: {e}", "error")
+            return None
+        return date_col
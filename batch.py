@@ -0,0 +1,150 @@
+"""
+Headless batch runner: apply @menu actions to many CSV files in parallel.
+
+Example:
+    python batch.py data/ --action analyze \
+        --action group_analysis group_col="Team, G:50" agg_col=HR sort_by=HR.mean top_n=10 \
+        --out batch_results --workers 4
+
+Each file is processed by one worker process and produces <out>/<file stem>.json
+holding, per action, its parameters, result, captured errors and run time.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from main import DataAnalysis
+from menu_selector import MenuSelector
+from printer import to_jsonable
+
+Action = Tuple[str, Dict[str, str]]
+
+
+def parse_action(tokens: List[str]) -> Action:
+    """['group_analysis', 'group_col=Team'] -> ('group_analysis', {'group_col': 'Team'})"""
+    name, params = tokens[0], {}
+    for token in tokens[1:]:
+        key, sep, value = token.partition("=")
+        if not sep:
+            raise ValueError(f"Parameter '{token}' for action '{name}' must be key=value")
+        params[key.strip()] = value
+    return name, params
+
+
+def collect_files(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".csv"))
+        else:
+            files.append(path)
+    return files
+
+
+def run_file(data_file: str, actions: List[Action], out_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: load one dataset, run every action and write its JSON result file."""
+    started = time.perf_counter()
+    # Interactive output is discarded; errors reported through the printers are captured per action
+    with contextlib.redirect_stdout(io.StringIO()):
+        analysis = DataAnalysis(data_file, **options)
+    load_seconds = time.perf_counter() - started
+
+    records = []
+    for name, params in actions:
+        errors: List[str] = []
+
+        def capture(message, output_type="plain", _errors=errors):
+            if output_type == "error":
+                _errors.append(str(message))
+
+        analysis.printer = analysis.viewer.printer = analysis.analyzer.printer = analysis.searcher.printer = capture
+        func = analysis.menu.find(name)
+        action_started = time.perf_counter()
+        result = None
+        if func is None:
+            errors.append(f"Unknown action '{name}'")
+        else:
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = func(**params)
+            except Exception as e:
+                errors.append(f"Error while executing action: {e}")
+        records.append({
+            "action": name,
+            "params": params,
+            "ok": not errors,
+            "seconds": round(time.perf_counter() - action_started, 6),
+            "errors": errors,
+            "result": to_jsonable(result),
+        })
+
+    report = {
+        "file": data_file,
+        "rows": len(analysis.data),
+        "load_seconds": round(load_seconds, 6),
+        "actions": records,
+    }
+    out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(data_file))[0] + ".json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return {"file": data_file, "output": out_path, "ok": all(r["ok"] for r in records)}
+
+
+def run_batch(files: List[str], actions: List[Action], out_dir: str, workers: Optional[int] = None,
+              options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    os.makedirs(out_dir, exist_ok=True)
+    options = options or {}
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_file, f, actions, out_dir, options): f for f in files}
+        for future in as_completed(futures):
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                summaries.append({"file": futures[future], "output": None, "ok": False, "error": str(e)})
+    summaries.sort(key=lambda s: s["file"])
+    return summaries
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run analysis actions over CSV files without the interactive menu")
+    parser.add_argument("paths", nargs="+", help="CSV files and/or folders containing CSV files")
+    parser.add_argument("--action", dest="actions", nargs="+", action="append", required=True,
+                        metavar="NAME [KEY=VALUE ...]", help="menu action to run, repeatable")
+    parser.add_argument("--out", default="batch_results", help="folder for the per-file JSON results")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=None, help="stream files in chunks of this many rows")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk column cache")
+    parser.add_argument("--no-optimize", action="store_true", help="skip schema inference at load time")
+    parser.add_argument("--approx", action="store_true", help="use approximate sketch-based statistics")
+    args = parser.parse_args(argv)
+
+    try:
+        actions = [parse_action(tokens) for tokens in args.actions]
+    except ValueError as e:
+        parser.error(str(e))
+    known = MenuSelector()
+    known.discover(DataAnalysis)
+    unknown = [name for name, _ in actions if known.find(name) is None]
+    if unknown:
+        parser.error(f"Unknown action(s): {', '.join(unknown)}. Available: {', '.join(known.labels())}")
+
+    files = collect_files(args.paths)
+    if not files:
+        parser.error("No CSV files found.")
+    options = {"chunksize": args.chunksize, "use_cache": not args.no_cache, "optimize": not args.no_optimize,
+               "approximate": args.approx}
+    summaries = run_batch(files, actions, args.out, args.workers, options)
+    for summary in summaries:
+        status = "ok" if summary["ok"] else "FAILED"
+        print(f"{status:6} {summary['file']} -> {summary.get('output') or summary.get('error')}")
+    return 0 if all(s["ok"] for s in summaries) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
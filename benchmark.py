@@ -0,0 +1,321 @@
+"""
+Benchmark harness for the loader, analyzer, viewer and printer.
+
+    python benchmark.py generate --rows 10000 100000 1000000
+    python benchmark.py run --out bench_results/baseline.json
+    python benchmark.py compare bench_results/baseline.json bench_results/current.json --threshold 0.1
+
+Synthetic datasets mirror the schemas of the files in data/. Each benchmark is
+timed over several repetitions (median reported) and then run once more under
+tracemalloc to record peak Python-heap allocations.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analyzer import Analyzer
+from loader import DataLoader
+from printer import Printer, TextFileSink
+from query import CsvSource
+from viewer import Viewer
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_DATA_DIR = "bench_data"
+DEFAULT_RESULTS_DIR = "bench_results"
+WRITE_CHUNK_ROWS = 500_000
+
+TEAMS = ["ARI", "ATH", "ATL", "BAL", "BOS", "CHC", "CHW", "CIN", "CLE", "COL", "DET", "HOU", "KCR", "LAA", "LAD",
+         "MIA", "MIL", "MIN", "NYM", "NYY", "PHI", "PIT", "SDP", "SEA", "SFG", "STL", "TBR", "TEX", "TOR", "WSN"]
+FIRST_NAMES = ["Aaron", "Blake", "Carlos", "Dylan", "Ernie", "Freddie", "Gunnar", "Hunter", "Isaac", "Jose",
+               "Kyle", "Luis", "Mookie", "Nico", "Oneil", "Pete", "Rafael", "Shohei", "Tarik", "Vladimir"]
+LAST_NAMES = ["Judge", "Snell", "Correa", "Cease", "Clement", "Freeman", "Henderson", "Greene", "Paredes",
+              "Ramirez", "Tucker", "Arraez", "Betts", "Hoerner", "Cruz", "Alonso", "Devers", "Ohtani", "Skubal",
+              "Guerrero Jr."]
+TITLE_WORDS = ["The", "Dark", "Knight", "Lord", "Rings", "Godfather", "Return", "King", "Good", "Bad", "Ugly",
+               "Fight", "Club", "Star", "Wars", "Empire", "Spirited", "Away", "Seven", "Samurai", "City", "God"]
+
+
+# ---------------------------------------------------------------- generation
+
+def _names(rng: np.random.Generator, n: int) -> np.ndarray:
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    return np.char.add(np.char.add(first.astype(str), " "), last.astype(str))
+
+
+def _hitting(rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+    ab = rng.integers(5, 60, n)
+    h = rng.binomial(ab, 0.25)
+    doubles, triples, hr = rng.binomial(h, 0.2), rng.binomial(h, 0.02), rng.binomial(h, 0.12)
+    names = _names(rng, n)
+    return pd.DataFrame({
+        "Name": names, "Team": rng.choice(TEAMS, n), "G": rng.integers(2, 13, n), "AB": ab,
+        "PA": ab + rng.integers(0, 8, n), "H": h, "1B": h - doubles - triples - hr, "2B": doubles, "3B": triples,
+        "HR": hr, "R": rng.integers(0, 12, n), "RBI": rng.integers(0, 13, n), "BB": rng.integers(0, 9, n),
+        "IBB": rng.integers(0, 3, n), "SO": rng.integers(0, 20, n), "HBP": rng.integers(0, 3, n),
+        "SF": rng.integers(0, 2, n), "SH": rng.integers(0, 2, n), "GDP": rng.integers(0, 3, n),
+        "SB": rng.integers(0, 4, n), "CS": rng.integers(0, 2, n), "AVG": np.round(h / ab, 9), "NameASCII": names,
+        "PlayerId": offset + np.arange(n) + 10_000, "MLBAMID": offset + np.arange(n) + 500_000,
+    })
+
+
+def _pitching(rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+    outs = rng.integers(9, 70, n)
+    er = rng.integers(0, 12, n)
+    names = _names(rng, n)
+    return pd.DataFrame({
+        "Name": names, "Team": rng.choice(TEAMS, n), "W": rng.integers(0, 4, n), "L": rng.integers(0, 4, n),
+        "ERA": er * 27 / outs, "G": rng.integers(1, 5, n), "GS": rng.integers(0, 4, n), "QS": rng.integers(0, 4, n),
+        "CG": rng.integers(0, 2, n), "ShO": rng.integers(0, 2, n), "SV": rng.integers(0, 3, n),
+        "HLD": rng.integers(0, 3, n), "BS": rng.integers(0, 2, n), "IP": outs // 3 + (outs % 3) / 10,
+        "TBF": outs + rng.integers(5, 30, n), "H": rng.integers(0, 25, n), "R": er + rng.integers(0, 3, n),
+        "ER": er, "HR": rng.integers(0, 5, n), "BB": rng.integers(0, 10, n), "IBB": rng.integers(0, 2, n),
+        "HBP": rng.integers(0, 3, n), "WP": rng.integers(0, 3, n), "BK": rng.integers(0, 2, n),
+        "SO": rng.integers(5, 40, n), "NameASCII": names,
+        "PlayerId": offset + np.arange(n) + 10_000, "MLBAMID": offset + np.arange(n) + 500_000,
+    })
+
+
+def _movies(rng: np.random.Generator, n: int, offset: int) -> pd.DataFrame:
+    words = rng.choice(TITLE_WORDS, (n, 3)).astype(str)
+    titles = np.char.add(np.char.add(np.char.add(words[:, 0], " "), np.char.add(words[:, 1], " ")), words[:, 2])
+    ranks = offset + np.arange(1, n + 1)
+    ids = np.char.zfill(ranks.astype(str), 7)
+    minutes = rng.integers(70, 230, n)
+    durations = np.char.add(np.char.add((minutes // 60).astype(str), "h "), np.char.add((minutes % 60).astype(str), "m"))
+    return pd.DataFrame({
+        "Rank": ranks, "Title": titles, "Year": rng.integers(1920, 2026, n),
+        "Rating": np.round(rng.uniform(7.5, 9.3, n), 1), "Duration": durations,
+        "IMDb URL": np.char.add(np.char.add("https://www.imdb.com/title/tt", ids), "/"),
+        "Image URL": np.char.add(np.char.add("https://m.media-amazon.com/images/M/MV5B", ids), "@._V1_.jpg"),
+    })
+
+
+# name -> (builder, file encoding); the baseball exports start with a UTF-8 BOM
+SCHEMAS: Dict[str, Tuple[Callable[[np.random.Generator, int, int], pd.DataFrame], str]] = {
+    "hitting": (_hitting, "utf-8-sig"),
+    "pitching": (_pitching, "utf-8-sig"),
+    "imdb": (_movies, "utf-8"),
+}
+
+
+def dataset_path(data_dir: str, schema: str, rows: int) -> str:
+    return os.path.join(data_dir, f"{schema}_{rows}.csv")
+
+
+def generate(data_dir: str, rows_list: List[int], schemas: List[str], seed: int = 0) -> List[str]:
+    """Write synthetic CSVs chunk by chunk so even 10M-row files need little memory."""
+    os.makedirs(data_dir, exist_ok=True)
+    written = []
+    for schema in schemas:
+        builder, encoding = SCHEMAS[schema]
+        for rows in rows_list:
+            path = dataset_path(data_dir, schema, rows)
+            rng = np.random.default_rng(seed)
+            with open(path, "w", encoding=encoding, newline="") as f:
+                for start in range(0, rows, WRITE_CHUNK_ROWS):
+                    chunk = builder(rng, min(WRITE_CHUNK_ROWS, rows - start), start)
+                    chunk.to_csv(f, index=False, header=start == 0)
+            written.append(path)
+            print(f"wrote {path}")
+    return written
+
+
+# ---------------------------------------------------------------- measurement
+
+def _quiet(*args, **kwargs) -> None:
+    pass
+
+
+def _load_optimized(path: str) -> pd.DataFrame:
+    # the schema report goes through the printer; keep it out of the benchmark output
+    loader = DataLoader(path, optimize=True)
+    loader.printer = _quiet
+    return loader.load_data()
+
+
+def _fresh_analyzer(data: pd.DataFrame) -> Analyzer:
+    # a new Analyzer per call so memoized results never hide the compute cost
+    analyzer = Analyzer(data)
+    analyzer.printer = _quiet
+    return analyzer
+
+
+def _fresh_viewer(data: pd.DataFrame) -> Viewer:
+    viewer = Viewer(data)
+    viewer.printer = _quiet
+    return viewer
+
+
+def _file_viewer(path: str) -> Viewer:
+    # reads the CSV on demand; no zone maps, so every run scans like the first one
+    viewer = Viewer(source=CsvSource(path, optimize=True, zone_dir=None))
+    viewer.printer = _quiet
+    return viewer
+
+
+def benchmarks_for(path: str, schema: str) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    """Yield (name, callable) pairs covering the loader, every analyzer/viewer action and the printer."""
+    yield "load_data", lambda: DataLoader(path, optimize=False).load_data()
+    yield "load_data_optimized", lambda: _load_optimized(path)
+    data = _load_optimized(path)
+
+    group_col = "Team" if schema in ("hitting", "pitching") else "Year"
+    agg_col = {"hitting": "HR", "pitching": "SO", "imdb": "Rating"}[schema]
+    first, second = data.columns[0], data.columns[1]
+
+    yield "analyze", lambda: _fresh_analyzer(data).analyze()
+    yield "check_data_quality", lambda: _fresh_analyzer(data).check_data_quality()
+    yield "profile_columns", lambda: _fresh_analyzer(data).profile_columns()
+    yield "group_analysis", lambda: _fresh_analyzer(data).group_analysis(
+        group_col=group_col, agg_col=agg_col, sort_by="", top_n="")
+    yield "group_analysis_all", lambda: _fresh_analyzer(data).group_analysis(
+        group_col=group_col, agg_col="", sort_by="", top_n="")
+    multi_key = "Team, G:50" if schema in ("hitting", "pitching") else "Year:10"
+    yield "group_analysis_multikey", lambda: _fresh_analyzer(data).group_analysis(
+        group_col=multi_key, agg_col=agg_col, sort_by="count", top_n="10")
+    yield "correlation_analysis", lambda: _fresh_analyzer(data).correlation_analysis(method="pearson", top_k="all")
+    yield "correlation_top_pairs", lambda: _fresh_analyzer(data).correlation_analysis(
+        method="pearson", top_k="10", threshold="0.5")
+    yield "correlation_spearman", lambda: _fresh_analyzer(data).correlation_analysis(method="spearman", top_k="all")
+    yield "analyze_distribution", lambda: _fresh_analyzer(data).analyze_distribution(col_name=group_col)
+    if schema == "imdb":
+        yield "time_series_analysis", lambda: _fresh_analyzer(data).time_series_analysis(date_col="Year")
+        yield "resample_time_series", lambda: _fresh_analyzer(data).resample_time_series(
+            date_col="Year", freq="Y", columns="Rating", aggs="mean,count", by="")
+        yield "rolling_statistics", lambda: _fresh_analyzer(data).rolling_statistics(
+            date_col="Year", column="Rating", freq="Y", agg="mean", window="5", stats="mean,max", by="")
+    yield "preview_rows", lambda: _fresh_viewer(data).preview_rows()
+    yield "preview_column", lambda: _fresh_viewer(data).preview_column(column_name=second)
+    yield "preview_multiple_columns", lambda: _fresh_viewer(data).preview_multiple_columns(
+        column_names=[first, second])
+    yield "list_columns", lambda: _fresh_viewer(data).list_columns()
+    yield "preview_multiple_columns_from_file", lambda: _file_viewer(path).preview_multiple_columns(
+        column_names=[first, second])
+    threshold = data[agg_col].quantile(0.99)
+    yield "query_rows_from_file", lambda: _file_viewer(path).query_rows(
+        where=f"{agg_col} >= {threshold}", columns=f"{first},{agg_col}", order_by=f"{agg_col} desc", limit=10)
+
+    group_result = _fresh_analyzer(data).group_analysis(group_col=group_col, agg_col="", sort_by="", top_n="")
+    correlations = _fresh_analyzer(data).correlation_analysis(method="pearson", top_k="all")
+    records = data.head(100_000).to_dict("records")
+    devnull = TextFileSink(os.devnull)
+    printer = Printer(sinks=[devnull]).printer
+    yield "print_group_json", lambda: printer(group_result, "json")
+    yield "print_correlation_json", lambda: printer(correlations, "json")
+    yield "print_records_table", lambda: printer(records, "table")
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(times), "min_seconds": min(times), "peak_bytes": int(peak)}
+
+
+def run(data_dir: str, out_path: str, repeat: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    files = sorted(f for f in os.listdir(data_dir) if f.endswith(".csv"))
+    for file_name in files:
+        schema, _, rows = os.path.splitext(file_name)[0].rpartition("_")
+        if schema not in SCHEMAS:
+            continue
+        path = os.path.join(data_dir, file_name)
+        for name, func in benchmarks_for(path, schema):
+            if only and name not in only:
+                continue
+            key = f"{schema}_{rows}/{name}"
+            results[key] = measure(func, repeat)
+            print(f"{key:45} {results[key]['seconds'] * 1000:10.2f} ms {results[key]['peak_bytes'] / 2**20:9.1f} MiB")
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {out_path}")
+    return report
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Print per-benchmark ratios; return 1 if any time or peak memory regressed past threshold."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+    regressions = 0
+    for key in sorted(set(baseline) & set(current)):
+        old, new = baseline[key], current[key]
+        time_ratio = new["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        mem_ratio = new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append("TIME")
+        if mem_ratio > 1 + threshold:
+            flags.append("MEMORY")
+        regressions += bool(flags)
+        print(f"{key:45} time x{time_ratio:6.2f}  mem x{mem_ratio:6.2f}  {' '.join(flags) or 'ok'}")
+    for key in sorted(set(baseline) - set(current)):
+        print(f"{key:45} missing from current run")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loader/analyzer/viewer/printer on synthetic data")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="write synthetic datasets")
+    gen.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    gen.add_argument("--schemas", nargs="+", choices=sorted(SCHEMAS), default=sorted(SCHEMAS))
+    gen.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    gen.add_argument("--seed", type=int, default=0)
+
+    bench = commands.add_parser("run", help="time every benchmark on the generated datasets")
+    bench.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    bench.add_argument("--out", default=os.path.join(DEFAULT_RESULTS_DIR, "latest.json"))
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--only", nargs="+", help="run only these benchmark names")
+
+    cmp = commands.add_parser("compare", help="flag regressions between two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.1 for 10%%")
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        generate(args.data_dir, args.rows, args.schemas, args.seed)
+        return 0
+    if args.command == "run":
+        run(args.data_dir, args.out, args.repeat, args.only)
+        return 0
+    return compare(args.baseline, args.current, args.threshold)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "columns")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+META_FILE = "meta.json"
+
+# numpy kinds that are stored as raw column files and memory-mapped back in
+_RAW_KINDS = "biufmM"
+
+
+class HashingFile:
+    """
+    A binary file that hashes every byte read through it as file_fingerprint does, so a
+    parser reading it to the end yields the content hash without a second pass.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        stat = os.stat(path)
+        self.mtime_ns = stat.st_mtime_ns
+        self.file = open(path, "rb")
+        self.digest = hashlib.blake2b(digest_size=16)
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(size)
+        self.digest.update(data)
+        self.size += len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "HashingFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """The file_fingerprint of what was read (the whole file once the parser reached its end)."""
+        return {"path": os.path.abspath(self.path), "size": self.size, "mtime_ns": self.mtime_ns,
+                "content_hash": self.digest.hexdigest()}
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """Identify a file by absolute path, size, mtime and a blake2b hash of its content."""
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": digest.hexdigest(),
+    }
+
+
+class ColumnCache:
+    """
+    Persistent column-per-file cache of parsed DataFrames.
+
+    Each entry is a directory holding one .npy file per column plus a meta.json
+    with the schema and the source file fingerprint. Numeric, boolean and
+    datetime columns are memory-mapped straight back in; other columns are
+    stored as integer codes plus a small table of unique values. Entries whose
+    source changed are dropped on access (the source is hashed only when its
+    size and mtime no longer tell), and the least recently used entries
+    are evicted once the cache grows past `max_bytes`.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # (path, size, mtime_ns) -> fingerprint, so a miss followed by put hashes the file once
+        self._fingerprints: Dict[tuple, Dict[str, Any]] = {}
+
+    def _entry_dir(self, path: str, variant: str) -> str:
+        key = hashlib.blake2b(f"{os.path.abspath(path)}|{variant}".encode(), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _fingerprint(self, path: str, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """The file's fingerprint; `known` (e.g. from a HashingFile) is used when it still matches the file."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._fingerprints:
+            if known is not None and (known["size"], known["mtime_ns"]) == key[1:]:
+                self._fingerprints[key] = known
+            else:
+                self._fingerprints[key] = file_fingerprint(path)
+        return self._fingerprints[key]
+
+    def info(self, path: str, variant: str = "") -> Dict[str, Any]:
+        """What put() was given as `info` for the entry of `path` (empty when there is none)."""
+        meta = self._read_meta(self._entry_dir(path, variant))
+        return meta.get("info", {}) if meta is not None else {}
+
+    def source_fingerprint(self, path: str, variant: str = "") -> Optional[Dict[str, Any]]:
+        """The fingerprint stored with the cached entry for `path`, if it still matches the file's size and mtime."""
+        meta = self._read_meta(self._entry_dir(path, variant))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if meta is None or (meta["size"], meta["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+        return {field: meta[field] for field in ("path", "size", "mtime_ns", "content_hash")}
+
+    @staticmethod
+    def _read_meta(entry: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(entry, META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_meta(entry: str, meta: Dict[str, Any]) -> None:
+        tmp = os.path.join(entry, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(entry, META_FILE))
+
+    def get(self, path: str, variant: str = "") -> Optional[pd.DataFrame]:
+        """Return the cached frame for `path`, or None on a miss or stale entry."""
+        entry = self._entry_dir(path, variant)
+        meta = self._read_meta(entry)
+        if meta is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        # an unchanged size and mtime is a hit without reading the file; only a changed
+        # mtime (touched, copied, or rewritten at the same size) is settled by the content hash
+        if meta["size"] != stat.st_size or (meta["mtime_ns"] != stat.st_mtime_ns
+                                            and meta["content_hash"] != self._fingerprint(path)["content_hash"]):
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            data = self._load_columns(entry, meta)
+        except (OSError, ValueError, KeyError):
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        meta["last_access"] = time.time()
+        self._write_meta(entry, meta)
+        return data
+
+    @staticmethod
+    def _load_columns(entry: str, meta: Dict[str, Any]) -> pd.DataFrame:
+        columns: Dict[str, Any] = {}
+        for i, spec in enumerate(meta["columns"]):
+            base = os.path.join(entry, f"col_{i}")
+            if spec["kind"] == "raw":
+                # copy-on-write mapping: pages are shared until a value is modified
+                columns[spec["name"]] = np.load(base + ".npy", mmap_mode="c").view(np.ndarray)
+                continue
+            codes = np.load(base + ".npy", mmap_mode="c").view(np.ndarray)
+            uniques = np.load(base + ".uniques.npy", allow_pickle=True)
+            if spec["kind"] == "category":
+                columns[spec["name"]] = pd.Categorical.from_codes(codes, uniques, ordered=spec["ordered"])
+                continue
+            # code -1 marks a missing value and picks the trailing NaN
+            values = pd.Series(np.append(uniques, np.nan).take(codes), dtype=object)
+            if spec["dtype"] != "object":
+                values = values.astype(spec["dtype"])
+            columns[spec["name"]] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def put(self, path: str, data: pd.DataFrame, variant: str = "",
+            fingerprint: Optional[Dict[str, Any]] = None, info: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store `data` as the parsed form of `path` (whose fingerprint may be known), then
+        enforce the size cap. `info` is kept with the entry and read back with info().
+        """
+        entry = self._entry_dir(path, variant)
+        tmp = entry + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        specs: List[Dict[str, Any]] = []
+        total = 0
+        for i, name in enumerate(data.columns):
+            series = data.iloc[:, i]
+            base = os.path.join(tmp, f"col_{i}")
+            spec: Dict[str, Any] = {"name": name, "dtype": str(series.dtype)}
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in _RAW_KINDS:
+                spec["kind"] = "raw"
+                np.save(base + ".npy", series.to_numpy())
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                spec["kind"] = "category"
+                spec["ordered"] = bool(series.cat.ordered)
+                np.save(base + ".npy", series.cat.codes.to_numpy())
+                np.save(base + ".uniques.npy", np.asarray(series.cat.categories, dtype=object), allow_pickle=True)
+            else:
+                spec["kind"] = "codes"
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                np.save(base + ".npy", codes)
+                np.save(base + ".uniques.npy", np.asarray(uniques, dtype=object), allow_pickle=True)
+            specs.append(spec)
+        for name in os.listdir(tmp):
+            total += os.path.getsize(os.path.join(tmp, name))
+        if total > self.max_bytes:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        fingerprint = self._fingerprint(path, fingerprint)
+        meta = dict(fingerprint, variant=variant, rows=len(data), columns=specs,
+                    bytes=total, last_access=time.time(), info=info or {})
+        self._write_meta(tmp, meta)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            meta = self._read_meta(entry)
+            if meta is not None:
+                entries.append((meta.get("last_access", 0.0), meta.get("bytes", 0), entry))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
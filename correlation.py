@@ -0,0 +1,105 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("pearson", "spearman")
+# Columns per block; one task computes the correlations between two blocks
+DEFAULT_BLOCK_SIZE = 64
+
+
+class CorrelationEngine:
+    """
+    Correlation matrix computed in column blocks on a thread pool (the work is BLAS
+    matrix products, which release the GIL). Missing values are handled pairwise:
+    each coefficient only uses the rows where both columns are present, like
+    DataFrame.corr(). Spearman ranks each column once over its non-null values and
+    then correlates the ranks; pandas re-ranks per pair, so the two differ slightly
+    when both columns of a pair have missing values in different rows.
+    """
+    def __init__(self, data: pd.DataFrame, method: str = "pearson", block_size: int = DEFAULT_BLOCK_SIZE,
+                 workers: Optional[int] = None, min_periods: int = 2) -> None:
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method '{method}'. Choose from: {', '.join(METHODS)}")
+        numeric = data.select_dtypes(include="number")
+        self.columns: List[str] = list(numeric.columns)
+        self.method = method
+        self.block_size = max(1, block_size)
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.min_periods = max(2, min_periods)
+
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        if method == "spearman":
+            values = numeric.rank(method="average").to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        # The coefficients are shift invariant; centering keeps the sums small and precise
+        counts = present.sum(axis=0)
+        means = np.divide(np.nansum(values, axis=0), counts, out=np.zeros(len(self.columns)), where=counts > 0)
+        centered = np.where(present, values - means, 0.0)
+        self._present = present.astype(np.float64)
+        self._values = centered
+        self._squares = centered * centered
+
+    def _blocks(self) -> List[Tuple[int, int]]:
+        return [(start, min(start + self.block_size, len(self.columns)))
+                for start in range(0, len(self.columns), self.block_size)]
+
+    def _block(self, rows: Tuple[int, int], cols: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Correlations and pairwise observation counts between two column blocks."""
+        a, b = slice(*rows), slice(*cols)
+        x, y = self._values[:, a], self._values[:, b]
+        mx, my = self._present[:, a], self._present[:, b]
+        n = mx.T @ my
+        sx, sy = x.T @ my, mx.T @ y
+        sxx, syy = self._squares[:, a].T @ my, mx.T @ self._squares[:, b]
+        sxy = x.T @ y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * sxy - sx * sy
+            var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+            r = cov / np.sqrt(var)
+        r[(n < self.min_periods) | ~(var > 0)] = np.nan
+        return np.clip(r, -1.0, 1.0), n
+
+    def _block_results(self) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int], np.ndarray, np.ndarray]]:
+        """Upper-triangular block pairs, computed in parallel and yielded as they are requested."""
+        blocks = self._blocks()
+        pairs = [(rows, cols) for i, rows in enumerate(blocks) for cols in blocks[i:]]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for (rows, cols), (r, n) in zip(pairs, pool.map(lambda p: self._block(*p), pairs)):
+                yield rows, cols, r, n
+
+    def matrix(self) -> pd.DataFrame:
+        """Full correlation matrix."""
+        k = len(self.columns)
+        result = np.full((k, k), np.nan)
+        for rows, cols, r, _ in self._block_results():
+            result[slice(*rows), slice(*cols)] = r
+            result[slice(*cols), slice(*rows)] = r.T
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
+
+    def top_pairs(self, k: int = 20, threshold: float = 0.0) -> List[Dict[str, object]]:
+        """
+        The k strongest column pairs with |r| >= threshold, strongest first. Blocks are
+        reduced as they complete, so the full matrix is never held in memory.
+        """
+        heap: List[Tuple[float, int, int, float, int]] = []
+        for rows, cols, r, n in self._block_results():
+            strength = np.abs(r)
+            keep = strength >= threshold
+            if rows == cols:
+                keep &= np.triu(np.ones_like(keep), k=1)
+            idx = np.flatnonzero(keep & ~np.isnan(r))
+            if idx.size > k:
+                idx = idx[np.argpartition(strength.ravel()[idx], -k)[-k:]]
+            for flat in idx:
+                i, j = divmod(int(flat), r.shape[1])
+                item = (float(strength.flat[flat]), rows[0] + i, cols[0] + j, float(r.flat[flat]), int(n.flat[flat]))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+        return [{"column_a": self.columns[i], "column_b": self.columns[j], "r": value, "n": count}
+                for _, i, j, value, count in sorted(heap, reverse=True)]
@@ -0,0 +1,163 @@
+import cProfile
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import phases as phase_tracking
+from phases import PHASES, STREAMED_ROWS
+from printer import Printer
+
+
+class Diagnostics:
+    """
+    Instrumentation for menu actions: wall/CPU time, rows processed and a
+    load/compute/print split for every invocation, kept in a rolling history.
+    Peak traced memory (tracemalloc) and cProfile data for the most recent
+    invocations slow every action down, so both are off unless asked for.
+    """
+    def __init__(self, rows: Optional[Callable[[], int]] = None, history: int = 500, profiles: int = 20,
+                 trace_memory: bool = False, profile: bool = False,
+                 exclude_sections: Optional[Set[str]] = None) -> None:
+        self.printer = Printer().printer
+        self.rows = rows
+        self.records: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.profiles: Deque[Tuple[str, cProfile.Profile]] = deque(maxlen=profiles)
+        self.trace_memory = trace_memory
+        self.profile = profile
+        # actions in these sections (e.g. the diagnostics views themselves) are not recorded
+        self.exclude_sections = exclude_sections if exclude_sections is not None else {"Diagnostics"}
+        self.data_output_style = "table"
+
+    def wrap(self, label: str, func: Callable, section: Optional[str] = None) -> Callable:
+        if section in self.exclude_sections:
+            return func
+
+        def instrumented(*args, **kwargs):
+            return self.invoke(label, func, *args, **kwargs)
+        return instrumented
+
+    def invoke(self, label: str, func: Callable, *args, **kwargs) -> Any:
+        phases: Dict[str, float] = {}
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        profiler = cProfile.Profile() if self.profile else None
+        previous = phase_tracking.activate(phases)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        ok = False
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            ok = True
+            return result
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            phase_tracking.activate(previous)
+            peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            phases["compute"] = max(0.0, wall - phases.get("load", 0.0) - phases.get("print", 0.0))
+            self.records.append({
+                "action": label,
+                "started": time.time(),
+                "ok": ok,
+                "wall": wall,
+                "cpu": cpu,
+                "peak_bytes": peak,
+                # rows streamed from disk when the action made a chunked pass, else the in-memory frame
+                "rows": phases.get(STREAMED_ROWS) or (self.rows() if self.rows else None),
+                "phases": {name: phases.get(name, 0.0) for name in PHASES},
+            })
+            if profiler is not None:
+                self.profiles.append((label, profiler))
+
+    def action_stats(self):
+        """Per-action wall-time percentiles, CPU time, peak memory and phase split."""
+        import numpy as np  # deferred: diagnostics is built at startup, before anything needs numpy
+        if not self.records:
+            self.printer("No actions recorded yet.", "info")
+            return []
+        by_action: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self.records:
+            by_action.setdefault(record["action"], []).append(record)
+        rows = []
+        for action, records in sorted(by_action.items()):
+            walls = np.array([r["wall"] for r in records]) * 1000
+            peaks = [r["peak_bytes"] for r in records if r["peak_bytes"] is not None]
+            p50, p90, p99 = np.percentile(walls, [50, 90, 99])
+            rows.append({
+                "action": action,
+                "calls": len(records),
+                "p50_ms": round(float(p50), 2),
+                "p90_ms": round(float(p90), 2),
+                "p99_ms": round(float(p99), 2),
+                "cpu_ms": round(float(np.mean([r["cpu"] for r in records])) * 1000, 2),
+                "peak_mib": round(max(peaks) / 2 ** 20, 2) if peaks else None,
+                "load_ms": round(float(np.mean([r["phases"]["load"] for r in records])) * 1000, 2),
+                "compute_ms": round(float(np.mean([r["phases"]["compute"] for r in records])) * 1000, 2),
+                "print_ms": round(float(np.mean([r["phases"]["print"] for r in records])) * 1000, 2),
+            })
+        self.printer(f"Action statistics over the last {len(self.records)} invocation(s):", "info")
+        self.printer(rows, self.data_output_style)
+        return rows
+
+    def recent_actions(self, count: Optional[str] = None):
+        """The most recent invocations with their individual measurements."""
+        try:
+            n = int(count) if count else 10
+        except ValueError:
+            self.printer("The number of invocations must be an integer.", "error")
+            return
+        rows = [{
+            "action": r["action"],
+            "ok": r["ok"],
+            "wall_ms": round(r["wall"] * 1000, 2),
+            "cpu_ms": round(r["cpu"] * 1000, 2),
+            "peak_mib": round(r["peak_bytes"] / 2 ** 20, 2) if r["peak_bytes"] is not None else None,
+            "rows": r["rows"],
+            "load_ms": round(r["phases"]["load"] * 1000, 2),
+            "compute_ms": round(r["phases"]["compute"] * 1000, 2),
+            "print_ms": round(r["phases"]["print"] * 1000, 2),
+        } for r in list(self.records)[-n:]]
+        self.printer(f"Last {len(rows)} invocation(s):", "info")
+        self.printer(rows, self.data_output_style)
+        return rows
+
+    def dump_profile(self, count: Optional[str] = None, path: Optional[str] = None):
+        """
+        Merge the cProfile data of the last N invocations into a .prof file, which
+        pstats, snakeviz and flame graph tools such as flameprof can read.
+        """
+        if not self.profiles:
+            message = "No profiles recorded yet." if self.profile else "Profiling is off (start with --profile)."
+            self.printer(message, "info")
+            return None
+        if count is None:
+            count = input(f"Number of recent invocations to include (max {len(self.profiles)}): ").strip()
+        if path is None:
+            path = input("Output file (press Enter for 'actions.prof'): ").strip()
+        try:
+            n = int(count) if count else len(self.profiles)
+        except ValueError:
+            self.printer("The number of invocations must be an integer.", "error")
+            return None
+        path = path or "actions.prof"
+        import pstats
+        selected = list(self.profiles)[-n:]
+        stats = pstats.Stats(selected[0][1])
+        for _, profiler in selected[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        self.printer(f"Wrote profile of {len(selected)} invocation(s) to {path}", "info")
+        return {"path": path, "invocations": [label for label, _ in selected]}
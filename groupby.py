@@ -0,0 +1,339 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+STATS = ["mean", "median", "std", "count", "sum"]
+# Points kept per group and column to merge medians across partials (rank error ~ 1 / MEDIAN_POINTS)
+MEDIAN_POINTS = 128
+# In-memory frames with fewer rows are aggregated in one partial, which keeps medians exact
+PARALLEL_MIN_ROWS = 1_000_000
+
+# Up to this many groups, exact medians sort each group's rows once for all columns
+BLOCK_MEDIAN_MAX_GROUPS = 5_000
+
+Key = Tuple[str, Optional[float]]
+
+
+def parse_keys(spec: str) -> List[Key]:
+    """'Team, Year:10' -> [('Team', None), ('Year', 10.0)]; ':width' buckets a numeric or date key."""
+    keys: List[Key] = []
+    for part in spec.split(","):
+        name, sep, width = part.strip().rpartition(":")
+        if not sep:
+            name, width = width, ""
+        if not name:
+            continue
+        keys.append((name.strip(), float(width) if width.strip() else None))
+    return keys
+
+
+def format_keys(keys: List[Key]) -> str:
+    return ", ".join(name if width is None else f"{name}:{width:g}" for name, width in keys)
+
+
+def key_frame(data: pd.DataFrame, keys: List[Key]) -> pd.DataFrame:
+    """The grouping columns of `data`, with bucketed keys floored to a multiple of their width."""
+    columns = {}
+    for name, width in keys:
+        col = data[name]
+        if width is not None:
+            if not pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_datetime64_any_dtype(col):
+                col = pd.to_datetime(col, errors="coerce", format="mixed")  # unparsed dates in raw chunks
+            if pd.api.types.is_datetime64_any_dtype(col):
+                col = col.dt.year  # dates are bucketed by year
+            col = np.floor(col.astype("float64") / width) * width
+            if float(width).is_integer():
+                col = col.astype("Int64")
+        columns[f"{name}:{width:g}" if width is not None else name] = col
+    return pd.DataFrame(columns, index=data.index)
+
+
+def _block_medians(codes: np.ndarray, columns: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+    """Exact per-group medians of several columns: rows are ordered by group once, then each
+    group's block is reduced with one nanmedian call instead of sorting every column."""
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind="stable")
+    # one row per column, so each group's block is a contiguous slice of every row
+    block = np.empty((len(columns), len(order)))
+    for i, values in enumerate(columns.values()):
+        block[i] = values[valid][order]
+    median = np.nanmedian if np.isnan(block).any() else np.median
+    bounds = np.searchsorted(codes[valid][order], np.arange(size + 1))
+    medians = np.full((size, len(columns)), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns within a group
+        for group in np.flatnonzero(np.diff(bounds)):
+            medians[group] = median(block[:, bounds[group]:bounds[group + 1]], axis=1)
+    return {col: medians[:, i] for i, col in enumerate(columns)}
+
+
+class KeyTable:
+    """Assigns stable group ids to key values, so chunks grouped separately line up."""
+    def __init__(self) -> None:
+        self.labels: Optional[pd.Index] = None
+
+    @property
+    def size(self) -> int:
+        return 0 if self.labels is None else len(self.labels)
+
+    def encode(self, keys: pd.DataFrame) -> np.ndarray:
+        """Group id per row; rows with a missing key get -1 (pandas' dropna=True)."""
+        codes = np.full(len(keys), -1, dtype=np.int64)
+        valid = keys.notna().all(axis=1).to_numpy()
+        if not valid.any():
+            return codes
+        present = keys[valid]
+        # Factorize each key and fold the codes together, re-densifying so they never overflow
+        local = np.zeros(len(present), dtype=np.int64)
+        for name in present.columns:
+            key_codes, key_uniques = pd.factorize(present[name])
+            local = pd.factorize(local * len(key_uniques) + key_codes)[0]
+        first = np.empty(int(local.max()) + 1, dtype=np.int64)
+        first[local[::-1]] = np.arange(len(local) - 1, -1, -1)
+        rows = present.iloc[first]
+        if present.shape[1] == 1:
+            uniques = pd.Index(rows.iloc[:, 0], name=present.columns[0])
+        else:
+            uniques = pd.MultiIndex.from_frame(rows)
+        if self.labels is None:
+            self.labels = uniques
+            ids = np.arange(len(uniques))
+        else:
+            ids = self.labels.get_indexer(uniques)
+            new = ids < 0
+            ids[new] = self.size + np.arange(int(new.sum()))
+            self.labels = self.labels.append(uniques[new])
+        codes[valid] = ids[local]
+        return codes
+
+
+class GroupIndex:
+    """Group id of every row for one key set; built once and reused by every aggregation."""
+    def __init__(self, data: pd.DataFrame, keys: List[Key]) -> None:
+        self.keys = keys
+        self.table = KeyTable()
+        self.codes = self.table.encode(key_frame(data, keys))
+
+    @property
+    def size(self) -> int:
+        return self.table.size
+
+    def __sizeof__(self) -> int:
+        labels = self.table.labels.memory_usage(deep=True) if self.table.labels is not None else 0
+        return object.__sizeof__(self) + self.codes.nbytes + labels
+
+
+class GroupPartial:
+    """
+    Per-group count/sum/M2 and median summary of several columns over a slice of rows.
+    Partials merge exactly for count, sum, mean and std (Chan et al.); medians merge
+    through up to MEDIAN_POINTS weighted quantile points per group, so they are exact
+    while a group has at most that many values and approximate beyond.
+    """
+    def __init__(self, columns: List[str], points: int = MEDIAN_POINTS) -> None:
+        self.columns = columns
+        self.points = points
+        self.size = 0
+        self.count = {col: np.zeros(0) for col in columns}
+        self.sum = {col: np.zeros(0) for col in columns}
+        self.m2 = {col: np.zeros(0) for col in columns}
+        # (group ids, values, weights) sorted by group then value
+        self.summary = {col: (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)) for col in columns}
+        # Exact medians are kept until the first merge
+        self.exact_median: Optional[Dict[str, np.ndarray]] = {col: np.zeros(0) for col in columns}
+
+    def _grow(self, size: int) -> None:
+        if size <= self.size:
+            return
+        pad = size - self.size
+        for stats in (self.count, self.sum, self.m2):
+            for col in self.columns:
+                stats[col] = np.concatenate([stats[col], np.zeros(pad)])
+        if self.exact_median is not None:
+            for col in self.columns:
+                self.exact_median[col] = np.concatenate([self.exact_median[col], np.full(pad, np.nan)])
+        self.size = size
+
+    def update(self, codes: np.ndarray, data: pd.DataFrame, size: int, summarize: bool = True) -> None:
+        """
+        Aggregate rows into this (empty) partial; `size` is the number of known groups.
+        Without `summarize` the partial keeps exact medians only and cannot be merged into.
+        """
+        self._grow(size)
+        columns = {}
+        for col in self.columns:
+            columns[col] = data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        if not summarize and 0 < size <= BLOCK_MEDIAN_MAX_GROUPS:
+            self.exact_median = _block_medians(codes, columns, size)
+
+        for col, values in columns.items():
+            valid = (codes >= 0) & ~np.isnan(values)
+            c, x = codes[valid], values[valid]
+            count = np.bincount(c, minlength=size).astype(np.float64)
+            total = np.bincount(c, weights=x, minlength=size)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = total / count
+            self.count[col], self.sum[col] = count, total
+            self.m2[col] = np.bincount(c, weights=(x - mean[c]) ** 2, minlength=size) if c.size else np.zeros(size)
+            if not summarize and 0 < size <= BLOCK_MEDIAN_MAX_GROUPS:
+                continue
+
+            order = np.lexsort((x, c))
+            c, x = c[order], x[order]
+            counts = count.astype(np.int64)
+            starts = np.cumsum(counts) - counts
+            if self.exact_median is not None:
+                median = np.full(size, np.nan)
+                has = counts > 0
+                lo, hi = starts[has] + (counts[has] - 1) // 2, starts[has] + counts[has] // 2
+                median[has] = (x[lo] + x[hi]) / 2
+                self.exact_median[col] = median
+            if summarize:
+                self.summary[col] = self._summarize(c, x, np.ones(c.size), counts.astype(np.float64), starts)
+
+    def _summarize(self, c: np.ndarray, x: np.ndarray, w: np.ndarray, weight: np.ndarray,
+                   starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reduce sorted weighted points to at most `points` evenly spaced quantiles per group."""
+        per_group = np.bincount(c, minlength=len(weight))
+        large = per_group > self.points
+        if not large.any():
+            return c, x, w
+        keep = ~large[c]
+        groups = np.flatnonzero(large)
+        cumulative = np.cumsum(w)
+        base = np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0.0)[groups]
+        steps = (np.arange(self.points) + 0.5) / self.points
+        targets = (base[:, None] + steps[None, :] * weight[groups][:, None]).ravel()
+        picked = np.minimum(np.searchsorted(cumulative, targets), len(x) - 1)
+        new_c = np.repeat(groups, self.points)
+        new_w = np.repeat(weight[groups] / self.points, self.points)
+        c = np.concatenate([c[keep], new_c])
+        x = np.concatenate([x[keep], x[picked]])
+        w = np.concatenate([w[keep], new_w])
+        order = np.lexsort((x, c))
+        return c[order], x[order], w[order]
+
+    def merge(self, other: "GroupPartial") -> None:
+        size = max(self.size, other.size)
+        self._grow(size)
+        other._grow(size)
+        for col in self.columns:
+            na, nb = self.count[col], other.count[col]
+            n = na + nb
+            with np.errstate(invalid="ignore", divide="ignore"):
+                delta = other.sum[col] / nb - self.sum[col] / na
+                cross = np.where((na > 0) & (nb > 0), delta * delta * na * nb / n, 0.0)
+            self.m2[col] = self.m2[col] + other.m2[col] + cross
+            self.count[col], self.sum[col] = n, self.sum[col] + other.sum[col]
+
+            c = np.concatenate([self.summary[col][0], other.summary[col][0]])
+            x = np.concatenate([self.summary[col][1], other.summary[col][1]])
+            w = np.concatenate([self.summary[col][2], other.summary[col][2]])
+            order = np.lexsort((x, c))
+            c, x, w = c[order], x[order], w[order]
+            points = np.bincount(c, minlength=size)
+            starts = np.cumsum(points) - points
+            self.summary[col] = self._summarize(c, x, w, n, starts)
+        self.exact_median = None
+
+    def median(self, col: str) -> np.ndarray:
+        if self.exact_median is not None:
+            return self.exact_median[col]
+        c, x, w = self.summary[col]
+        result = np.full(self.size, np.nan)
+        if c.size == 0:
+            return result
+        cumulative = np.cumsum(w)
+        points = np.bincount(c, minlength=self.size)
+        starts = np.cumsum(points) - points
+        has = np.flatnonzero(points > 0)
+        base = np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0.0)[has]
+        picked = np.searchsorted(cumulative, base + self.count[col][has] / 2)
+        result[has] = x[np.minimum(picked, len(x) - 1)]
+        return result
+
+    def to_frame(self, labels: pd.Index) -> pd.DataFrame:
+        """Groups as rows, (column, statistic) as columns, ordered by key like DataFrame.groupby."""
+        stats = {}
+        for col in self.columns:
+            count = self.count[col]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, self.sum[col] / count, np.nan)
+                std = np.where(count > 1, np.sqrt(self.m2[col] / (count - 1)), np.nan)
+            stats[(col, "mean")] = mean
+            stats[(col, "median")] = self.median(col)
+            stats[(col, "std")] = std
+            stats[(col, "count")] = count.astype(np.int64)
+            stats[(col, "sum")] = self.sum[col]
+        frame = pd.DataFrame(stats, index=labels[:self.size])
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns)
+        return frame.sort_index()
+
+
+def aggregate_frame(data: pd.DataFrame, index: GroupIndex, columns: List[str],
+                    workers: Optional[int] = None) -> GroupPartial:
+    """Aggregate an in-memory frame; large frames are split into row blocks merged in parallel."""
+    workers = workers or min(8, os.cpu_count() or 1)
+    if len(data) < PARALLEL_MIN_ROWS or workers == 1:
+        partial = GroupPartial(columns)
+        partial.update(index.codes, data, index.size, summarize=False)
+        return partial
+
+    bounds = np.linspace(0, len(data), workers + 1).astype(int)
+
+    def block(i: int) -> GroupPartial:
+        part = GroupPartial(columns)
+        rows = slice(bounds[i], bounds[i + 1])
+        part.update(index.codes[rows], data.iloc[rows], index.size)
+        return part
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(block, range(workers)))
+    result = parts[0]
+    for part in parts[1:]:
+        result.merge(part)
+    return result
+
+
+def aggregate_chunks(chunks: Iterable[pd.DataFrame], keys: List[Key],
+                     columns: List[str]) -> Tuple[KeyTable, GroupPartial]:
+    """One streaming pass: every chunk becomes a partial merged into the running total."""
+    table = KeyTable()
+    total = GroupPartial(columns)
+    first = True
+    for chunk in chunks:
+        codes = table.encode(key_frame(chunk, keys))
+        part = GroupPartial(columns)
+        part.update(codes, chunk, table.size)
+        if first:
+            total, first = part, False
+        else:
+            total.merge(part)
+    return table, total
+
+
+def order_groups(frame: pd.DataFrame, sort_by: Optional[str] = None, ascending: bool = False,
+                 top_n: Optional[int] = None) -> pd.DataFrame:
+    """
+    Sort by a statistic and keep the first top_n groups. 'HR.mean' names one column's
+    statistic; a bare 'mean' sorts by the first aggregated column's.
+    """
+    if sort_by:
+        # exact labels: flat stat names for one column, (column, stat) tuples for several
+        labels = frame.columns.tolist()
+        column, stat = sort_by.rpartition(".")[::2]
+        candidates = [sort_by, (column, stat), stat] if column else [sort_by]
+        label = next((c for c in candidates if c in labels), None)
+        if label is None and not column:
+            label = next((c for c in labels if isinstance(c, tuple) and c[1] == sort_by), None)
+        if label is None:
+            choices = [".".join(map(str, c)) if isinstance(c, tuple) else str(c) for c in labels]
+            raise KeyError(f"Cannot sort by '{sort_by}'; choose one of: {', '.join(choices)}")
+        frame = frame.sort_values(label, ascending=ascending, kind="stable")
+    if top_n is not None:
+        frame = frame.head(top_n)
+    return frame
@@ -1,14 +1,60 @@
 import pandas as pd
+from typing import Any, Dict, Iterator, Optional
+from cache import ColumnCache, HashingFile
+from schema import SchemaOptimizer
+from printer import Printer
+from phases import count_rows, phase
+
+DEFAULT_CHUNKSIZE = 100_000
 
 class DataLoader:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, chunksize: Optional[int] = None, cache: Optional[ColumnCache] = None,
+                 optimize: bool = False):
         self.file_path = file_path
+        self.chunksize = chunksize
+        self.cache = cache
+        # Run schema inference (downcasting, categoricals, duration/date parsing) after parsing
+        self.optimizer = SchemaOptimizer() if optimize else None
+        # optimized and raw frames are cached as separate entries
+        self.variant = "optimized" if optimize else ""
+        # The optimized columns (no rows) that streamed chunks are conformed to, set by the first load
+        self.schema: Optional[pd.DataFrame] = None
+        # size, mtime and content hash of the file behind the last full load (see cache.file_fingerprint)
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        self.printer = Printer().printer
 
-    def load_data(self) -> pd.DataFrame:
-        """Load data from a CSV file into a pandas DataFrame."""
+    def load_data(self, nrows: Optional[int] = None) -> pd.DataFrame:
+        """Load data from a CSV file into a pandas DataFrame, using the column cache when set."""
+        use_cache = self.cache is not None and nrows is None
+        variant = self.variant
         try:
-            data = pd.read_csv(self.file_path)
-            return data
+            with phase("load"):
+                if use_cache:
+                    data = self.cache.get(self.file_path, variant)
+                    if data is not None:
+                        self.fingerprint = self.cache.source_fingerprint(self.file_path, variant)
+                        if self.optimizer and not data.empty:
+                            self.schema = data.iloc[:0]
+                            state = self.cache.info(self.file_path, variant).get("schema")
+                            if state:  # the report of the load that filled the cache
+                                self.optimizer.restore(state)
+                                self._report()
+                        return data
+                if nrows is None:
+                    # hashed while pandas reads it: refresh and the cache get the fingerprint for free
+                    with HashingFile(self.file_path) as f:
+                        data = pd.read_csv(f)
+                    self.fingerprint = f.fingerprint()
+                else:
+                    data = pd.read_csv(self.file_path, nrows=nrows)
+                if self.optimizer and not data.empty:
+                    data = self.optimizer.optimize(data)
+                    self.schema = data.iloc[:0]
+                    self._report()
+                if use_cache and not data.empty:
+                    info = {"schema": self.optimizer.state()} if self.optimizer else None
+                    self.cache.put(self.file_path, data, variant, self.fingerprint, info)
+                return data
         except FileNotFoundError:
             print(f"Error: The file at {self.file_path} was not found.")
             return pd.DataFrame()
@@ -18,3 +64,33 @@ class DataLoader:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             return pd.DataFrame()
+
+    def _report(self) -> None:
+        self.printer("Memory usage after schema inference:", "info")
+        self.printer(self.optimizer.report(), "table")
+
+    def iter_chunks(self, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield the CSV as consecutive DataFrames of at most `chunksize` rows. With schema
+        optimization every chunk gets the dtypes of the loaded preview (or of the first
+        chunk), so streamed statistics see the same columns as the in-memory frame.
+        """
+        size = chunksize or self.chunksize or DEFAULT_CHUNKSIZE
+        try:
+            with pd.read_csv(self.file_path, chunksize=size) as reader:
+                while True:
+                    # only the parsing is attributed to "load", not the consumer's work between chunks
+                    with phase("load"):
+                        chunk = next(reader, None)
+                        if chunk is not None and self.optimizer is not None:
+                            if self.schema is None:
+                                self.schema = self.optimizer.optimize(chunk).iloc[:0]
+                            chunk = SchemaOptimizer.conform(chunk, self.schema)
+                    if chunk is None:
+                        break
+                    count_rows(len(chunk))
+                    yield chunk
+        except FileNotFoundError:
+            print(f"Error: The file at {self.file_path} was not found.")
+        except pd.errors.EmptyDataError:
+            print("Error: The file is empty.")
@@ -1,10 +1,24 @@
-import pandas as pd
-from printer import Printer
-from loader import DataLoader
-from viewer import Viewer
+from startup import StartupTimer
+from printer import Printer, open_sink
 from menu_selector import MenuSelector, menu
-from analyzer import Analyzer
+from diagnostics import Diagnostics
+from phases import phase
+from prefetch import Prefetcher, RecentFiles, quiet_loader
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Optional
+import argparse
 import os
+import threading
+import time
+
+if TYPE_CHECKING:  # pandas and the subsystems below are imported on first use, not at startup
+    import pandas as pd
+    from analyzer import Analyzer
+    from cache import ColumnCache
+    from refresh import TailReader
+    from search import Searcher
+    from viewer import Viewer
+    from workspace import Workspace
 
 class DataAnalysis:
     """
@@ -12,61 +26,425 @@ class DataAnalysis:
     (analyze, list_columns) which can be selected interactively.
     """
 
-    def __init__(self, data_file: str):
-        # initialize the data loader and load the data immediately
-        self.data_loader = DataLoader(data_file)
-        self.data = self.data_loader.load_data()
+    def __init__(self, data_file: str, chunksize: Optional[int] = None, use_cache: bool = True,
+                 optimize: bool = True, approximate: bool = False, profile: bool = False,
+                 trace_memory: bool = False, exact_distinct: bool = False,
+                 prefetcher: Optional[Prefetcher] = None, recent: Optional[RecentFiles] = None,
+                 background: bool = False):
+        self.use_cache = use_cache
+        self.chunksize = chunksize
+        self.optimize = optimize
+        # Background loads of the data/ folder (in-memory mode only) and the MRU list they are ordered by
+        self.prefetcher = prefetcher
+        self.recent = recent
+        # Every action picked from the menu is timed (and optionally profiled); see the "Diagnostics" section
+        self.diagnostics = Diagnostics(rows=self._row_count, profile=profile, trace_memory=trace_memory)
         self.printer = Printer().printer
-        self.viewer = Viewer(self.data)
-        self.analyzer = Analyzer(self.data)
-        
+        # The subsystems below are built on first access (see the properties)
+        self._cache: Optional["ColumnCache"] = None
+        self._workspace: Optional["Workspace"] = None
+        self._analyzer: Optional["Analyzer"] = None
+        self._viewer: Optional["Viewer"] = None
+        self._searcher: Optional["Searcher"] = None
+        self._results = None
+        self._approximate = approximate
+        self._exact_distinct = exact_distinct
+        self._loading: Optional[tuple] = None
+        # Follows appends to the active file (in-memory mode); see refresh_data
+        self._tail: Optional["TailReader"] = None
+        # with background=True the file is read on a thread and the menu renders right away;
+        # the first action that needs the data waits for it
+        self._open(data_file, background=background)
+
         # Build menu automatically from decorated methods
-        self.menu = MenuSelector()
+        self.menu = MenuSelector(instrumentation=self.diagnostics)
         self.menu.discover(self)
 
-    
+    @property
+    def cache(self) -> Optional["ColumnCache"]:
+        if self._cache is None and self.use_cache:
+            from cache import ColumnCache
+            self._cache = ColumnCache()
+        return self._cache
+
+    @property
+    def workspace(self) -> "Workspace":
+        """Other datasets can be loaded next to the active one and joined."""
+        if self._workspace is None:
+            from workspace import Workspace
+            self._workspace = Workspace(self._load_file)
+        return self._workspace
+
+    @property
+    def data(self) -> "pd.DataFrame":
+        self._wait_for_data()
+        return self._data
+
+    @property
+    def analyzer(self) -> "Analyzer":
+        if self._analyzer is None:
+            from analyzer import Analyzer
+            from profiling import ProfileStore
+            data = self.data
+            # only the file as loaded has a persisted profile, not a joined or filtered view
+            source = self._file if self._chunks is None and data is self._primary[0] else None
+            self._analyzer = Analyzer(data, chunks=self._chunks, results=self._results,
+                                      approximate=self._approximate, exact_distinct=self._exact_distinct,
+                                      source=source,
+                                      profiles=ProfileStore() if self.use_cache else None)
+        return self._analyzer
+
+    @property
+    def viewer(self) -> "Viewer":
+        loading = self._loading is not None and not self._loading[1].done()
+        # a viewer built during a background load reads the file; swap it for the frame once loaded
+        if self._viewer is None or (self._viewer.data is None and not loading):
+            from query import CsvSource
+            from viewer import Viewer
+            if loading:
+                # still loading in the background: previews and pages read just what they show from the file
+                self._viewer = Viewer(source=CsvSource(self._loading[0], optimize=self.optimize))
+                return self._viewer
+            previous = self._viewer
+            data = self.data
+            # streaming mode holds only the first chunk; queries and pages on the primary view read the file
+            streamed = self._chunks is not None and data is self._primary[0]
+            source = CsvSource(self._file, optimize=self.optimize) if streamed else None
+            self._viewer = Viewer(data, source=source)
+            if previous is not None:
+                self._viewer.position = previous.position
+        return self._viewer
+
+    @property
+    def searcher(self) -> "Searcher":
+        if self._searcher is None:
+            from search import Searcher
+            self._searcher = Searcher(self.data)
+        return self._searcher
+
+    def _row_count(self) -> Optional[int]:
+        """Rows of the active view, without waiting for a load still running."""
+        return None if self._loading is not None else len(self._data)
+
+    def _load_file(self, path: str) -> "pd.DataFrame":
+        """Load a whole file, from the prefetcher when it already holds (or is loading) it."""
+        if self.prefetcher is not None:
+            return self.prefetcher.get(path)
+        from loader import DataLoader
+        return DataLoader(path, cache=self.cache, optimize=self.optimize).load_data()
+
+    def _read(self, data_file: str, quiet: bool = False) -> tuple:
+        from loader import DataLoader
+        from refresh import TailReader
+        self.data_loader = DataLoader(data_file, chunksize=self.chunksize, cache=self.cache, optimize=self.optimize)
+        if quiet:
+            # a background load must not print its schema report over the menu
+            self.data_loader.printer = lambda message, output_type="plain": None
+        if self.chunksize:
+            # Streaming mode: keep only the first chunk in memory for previews and
+            # let the analyzer stream the full file for its summary statistics
+            return self.data_loader.load_data(nrows=self.chunksize), self.data_loader.iter_chunks, None
+        # taken before reading, so a rewrite during or after the load is noticed by refresh_data
+        tail = TailReader(data_file)
+        if self.prefetcher is not None:
+            data = self.prefetcher.get(data_file)
+            # loaded on another thread: the fingerprint is the one stored with its cached copy
+            fingerprint = self.cache.source_fingerprint(data_file, self.data_loader.variant) \
+                if self.cache is not None else None
+        else:
+            data = self.data_loader.load_data()
+            fingerprint = self.data_loader.fingerprint
+        # the bytes just loaded are the baseline: refresh_data reloads if any of them change later
+        tail.baseline(len(data), list(data.columns), fingerprint)
+        return data, None, tail
+
+    def _open(self, data_file: str, background: bool = False) -> None:
+        """Make `data_file` the active dataset; the primary view is kept for reset_view."""
+        self.dataset = os.path.splitext(os.path.basename(data_file))[0]
+        self._file = data_file
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def load() -> None:
+            try:
+                future.set_result(self._read(data_file, quiet=background))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._loading = (data_file, future)
+        if background:
+            threading.Thread(target=load, name="load", daemon=True).start()
+        else:
+            load()
+            self._wait_for_data()
+        if self.recent is not None:
+            self.recent.touch(data_file)
+
+    def _wait_for_data(self) -> None:
+        """Finish opening the active dataset once its (possibly background) load is done."""
+        if self._loading is None:
+            return
+        data_file, future = self._loading
+        with phase("load"):
+            data, chunks, self._tail = future.result()
+        self._loading = None
+        self.dataset = self.workspace.add(data_file, data, self.dataset)
+        self._primary = (data, chunks)
+        self._use_data(data, chunks)
+
     # Viewer wrappers so they can be auto-discovered into the "View" submenu
     @menu("preview_rows", order=2, section="View")
-    def preview_rows(self):
-        self.viewer.preview_rows()
+    def preview_rows(self, **params):
+        return self.viewer.preview_rows(**params)
 
     @menu("preview_column", order=3, section="View")
-    def preview_column(self):
-        self.viewer.preview_column()
+    def preview_column(self, **params):
+        return self.viewer.preview_column(**params)
 
     @menu("preview_multiple_columns", order=4, section="View")
-    def preview_multiple_columns(self):
-        self.viewer.preview_multiple_columns()
+    def preview_multiple_columns(self, **params):
+        return self.viewer.preview_multiple_columns(**params)
     
+    @menu("query_rows", order=5, section="View")
+    def query_rows(self, **params):
+        return self.viewer.query_rows(**params)
+
+    @menu("next_page", order=6, section="View")
+    def next_page(self, **params):
+        return self.viewer.next_page(**params)
+
+    @menu("prev_page", order=7, section="View")
+    def prev_page(self, **params):
+        return self.viewer.prev_page(**params)
+
+    @menu("jump_to_row", order=8, section="View")
+    def jump_to_row(self, **params):
+        return self.viewer.jump_to_row(**params)
+
+    @menu("tail_rows", order=9, section="View")
+    def tail_rows(self, **params):
+        return self.viewer.tail_rows(**params)
+
+    @menu("sample_rows", order=10, section="View")
+    def sample_rows(self, **params):
+        return self.viewer.sample_rows(**params)
+
     @menu("list_columns", order=1, section="View")
-    def list_columns(self):
-        self.viewer.list_columns()
+    def list_columns(self, **params):
+        return self.viewer.list_columns(**params)
     
     @menu("analyze", order=1, section="Analyze")
-    def analyze(self):
-        self.analyzer.analyze()
+    def analyze(self, **params):
+        return self.analyzer.analyze(**params)
     
     @menu("check_data_quality", order=2, section="Analyze")
-    def check_data_quality(self):
-        self.analyzer.check_data_quality()
+    def check_data_quality(self, **params):
+        return self.analyzer.check_data_quality(**params)
     
     @menu("group_analysis", order=3, section="Analyze")
-    def group_analysis(self):
-        self.analyzer.group_analysis()
+    def group_analysis(self, **params):
+        return self.analyzer.group_analysis(**params)
     
     @menu("correlation_analysis", order=4, section="Analyze")
-    def correlation_analysis(self):
-        self.analyzer.correlation_analysis()
+    def correlation_analysis(self, **params):
+        return self.analyzer.correlation_analysis(**params)
     
     @menu("analyze_distribution", order=5, section="Analyze")
-    def analyze_distribution(self):
-        self.analyzer.analyze_distribution()
+    def analyze_distribution(self, **params):
+        return self.analyzer.analyze_distribution(**params)
     
     @menu("time_series_analysis", order=6, section="Analyze")
-    def time_series_analysis(self):
-        self.analyzer.time_series_analysis()
+    def time_series_analysis(self, **params):
+        return self.analyzer.time_series_analysis(**params)
 
-    def run(self):
+    @menu("resample_time_series", order=8, section="Analyze")
+    def resample_time_series(self, **params):
+        return self.analyzer.resample_time_series(**params)
+
+    @menu("rolling_statistics", order=9, section="Analyze")
+    def rolling_statistics(self, **params):
+        return self.analyzer.rolling_statistics(**params)
+
+    @menu("profile_columns", order=10, section="Analyze")
+    def profile_columns(self, **params):
+        return self.analyzer.profile_columns(**params)
+
+    @menu("toggle_approximate", order=7, section="Analyze")
+    def toggle_approximate(self, **params):
+        return self.analyzer.toggle_approximate(**params)
+
+    @menu("find_exact", order=1, section="Search")
+    def find_exact(self, **params):
+        return self.searcher.find_exact(**params)
+
+    @menu("find_prefix", order=2, section="Search")
+    def find_prefix(self, **params):
+        return self.searcher.find_prefix(**params)
+
+    @menu("find_range", order=3, section="Search")
+    def find_range(self, **params):
+        return self.searcher.find_range(**params)
+
+    @menu("text_search", order=4, section="Search")
+    def text_search(self, **params):
+        return self.searcher.text_search(**params)
+
+    @menu("action_stats", order=1, section="Diagnostics")
+    def action_stats(self, **params):
+        return self.diagnostics.action_stats(**params)
+
+    @menu("recent_actions", order=2, section="Diagnostics")
+    def recent_actions(self, **params):
+        return self.diagnostics.recent_actions(**params)
+
+    @menu("dump_profile", order=3, section="Diagnostics")
+    def dump_profile(self, **params):
+        return self.diagnostics.dump_profile(**params)
+
+    def _use_data(self, data: "pd.DataFrame", chunks=None) -> None:
+        """Point the viewer, analyzer and searcher at another frame (e.g. a joined view)."""
+        if self._analyzer is not None:
+            self._results = self._analyzer.results
+            self._approximate = self._analyzer.approximate
+        self._data, self._chunks = data, chunks
+        self._analyzer = self._viewer = self._searcher = None
+
+    @menu("switch_dataset", order=5, section="Workspace")
+    def switch_dataset(self, path: Optional[str] = None, folder: str = "data/"):
+        """Replace the active dataset without restarting; prefetched files are available at once."""
+        if path is None:
+            files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".csv")]
+            if self.recent is not None:
+                files = self.recent.order(files)
+            self.printer([{"id": str(i), "file": os.path.basename(f), "state": self._file_state(f)}
+                          for i, f in enumerate(files, 1)], "table")
+            choice = input("Enter the number of the CSV file to switch to: ").strip()
+            try:
+                path = files[int(choice) - 1]
+            except (ValueError, IndexError):
+                self.printer("Invalid selection.", "error")
+                return None
+        if not os.path.exists(path):
+            self.printer(f"File '{path}' not found.", "error")
+            return None
+        started = time.perf_counter()
+        self._open(path)
+        seconds = time.perf_counter() - started
+        self.printer(f"Switched to '{self.dataset}' ({len(self.data)} rows, ready in {seconds:.2f}s).", "info")
+        return {"dataset": self.dataset, "rows": len(self.data), "seconds": round(seconds, 3)}
+
+    def _file_state(self, path: str) -> str:
+        if self.chunksize:
+            return "streamed"
+        return self.prefetcher.state(path) if self.prefetcher is not None else "not prefetched"
+
+    @menu("refresh_data", order=6, section="Workspace")
+    def refresh_data(self):
+        """
+        Pick up rows appended to the active dataset's file: only the new bytes are parsed
+        and folded into the data and the maintained summaries. Any other change to the
+        file (rewritten, truncated, replaced) falls back to a full reload.
+        """
+        from refresh import APPENDED, RELOAD, UNCHANGED
+        self._wait_for_data()
+        path = self.workspace.paths[self.dataset]
+        data, chunks = self._primary
+        if chunks is not None:
+            self.analyzer.mark_data_changed()
+            self.printer("Streaming mode: the next summary streams the whole file again.", "info")
+            return {"dataset": self.dataset, "status": "streamed"}
+        if self._data is not data:
+            self._use_data(data)
+            self.printer(f"Back to '{self.dataset}' to refresh it.", "info")
+
+        started = time.perf_counter()
+        status, rows = RELOAD, None
+        if self._tail is not None:
+            try:
+                status, rows = self._tail.refresh()
+            except (OSError, ValueError):
+                status = RELOAD
+        if self.prefetcher is not None and status != UNCHANGED:
+            self.prefetcher.discard(path)
+        if status == RELOAD:
+            self.printer("The file changed other than by appending rows; reloading it in full.", "warning")
+            self._open(path)
+            new_rows = None
+        elif status == APPENDED:
+            data = self.analyzer.append(rows)
+            self._data = data
+            self._primary = (data, None)
+            self.workspace.add(path, data, self.dataset)
+            self._viewer = self._searcher = None
+            new_rows = len(rows)
+        else:
+            new_rows = 0
+        seconds = time.perf_counter() - started
+        if status == RELOAD:
+            self.printer(f"Reloaded '{self.dataset}': {len(self.data)} rows in {seconds:.2f}s.", "info")
+        else:
+            self.printer(f"{new_rows} new row(s) in '{self.dataset}' ({len(self.data)} total, {seconds:.3f}s).", "info")
+        return {"dataset": self.dataset, "status": status, "new_rows": new_rows, "rows": len(self.data),
+                "seconds": round(seconds, 4)}
+
+    @menu("list_datasets", order=1, section="Workspace")
+    def list_datasets(self, **params):
+        return self.workspace.list_datasets(**params)
+
+    @menu("load_dataset", order=2, section="Workspace")
+    def load_dataset(self, **params):
+        return self.workspace.load_dataset(**params)
+
+    @menu("join_datasets", order=3, section="Workspace")
+    def join_datasets(self, **params):
+        self._wait_for_data()
+        if self._primary[1] is not None:
+            self.printer("Streaming mode: the join uses the in-memory preview of the primary dataset.", "warning")
+        params.setdefault("left", self.dataset)
+        data = self.workspace.join_datasets(**params)
+        if data is None:
+            return None
+        self._use_data(data)
+        self.printer("View, Analyze and Search actions now run on the joined view (reset_view to go back).", "info")
+        return {"rows": len(data), "columns": list(data.columns)}
+
+    @menu("reset_view", order=4, section="Workspace")
+    def reset_view(self, **params):
+        self._wait_for_data()
+        data, chunks = self._primary
+        self._use_data(data, chunks)
+        self.printer(f"Back to '{self.dataset}'.", "info")
+        return {"rows": len(data), "columns": list(data.columns)}
+
+    @menu("filter_view", order=7, section="Workspace")
+    def filter_view(self, where: Optional[str] = None, columns: Optional[str] = None):
+        """
+        Make the rows matching a filter the active view, so Analyze and Search run on them.
+        In streaming mode the whole file is scanned, reading only the columns kept.
+        """
+        from query import CsvSource, FrameSource, Query
+        if where is None:
+            where = input("Filter, e.g. 'HR >= 10 and Team == NYY': ").strip()
+        if columns is None:
+            columns = input("Columns to keep, comma-separated (press Enter for all): ").strip()
+        data = self.data
+        streamed = self._chunks is not None and data is self._primary[0]
+        plan = Query(CsvSource(self._file, optimize=self.optimize) if streamed else FrameSource(data))
+        names = [name.strip() for name in columns.split(",") if name.strip()]
+        try:
+            plan = plan.where(where)
+            if names:
+                plan = plan.select(*names)
+            data = plan.collect()
+        except (KeyError, ValueError) as e:
+            self.printer(str(e).strip("'\""), "error")
+            return None
+        self._use_data(data)
+        self.printer(f"{len(data)} matching row(s); View, Analyze and Search actions now run on them "
+                     "(reset_view to go back).", "info")
+        return {"rows": len(data), "columns": list(data.columns)}
+
+    def run(self, startup: Optional[StartupTimer] = None):
         if self.menu.is_empty():
             self.printer("No actions available.", "error")
             return
@@ -82,6 +460,14 @@ class DataAnalysis:
                 prompt += " ('0' to go back)"
             prompt += ": "
 
+            if startup is not None:
+                # --startup-timing: report once the first menu is on screen, then wait for the data
+                startup.mark("first menu rendered")
+                self._wait_for_data()
+                startup.mark("data ready (background)")
+                startup.report(self.printer)
+                startup = None
+
             choice = input(prompt).strip().lower()
             if choice in ("q", "quit", "exit"):
                 self.printer("Exiting.", "info")
@@ -109,18 +495,57 @@ class DataAnalysis:
                     self.printer(f"Error while executing action: {e}", "error")
 
 if __name__ == "__main__":
+    timer = StartupTimer()
+    timer.mark("imports")
+    parser = argparse.ArgumentParser(description="Interactive CSV data analysis")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the file in chunks of this many rows instead of loading it whole")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always parse the CSV instead of using the on-disk column cache")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="keep pandas' default dtypes instead of running schema inference")
+    parser.add_argument("--approx", action="store_true",
+                        help="answer quality/distribution queries from approximate sketches")
+    parser.add_argument("--exact-distinct", action="store_true",
+                        help="with --chunksize, count distinct values and duplicate rows exactly "
+                             "(8 bytes per distinct value and row) instead of estimating them")
+    parser.add_argument("--output", action="append", default=[], metavar="PATH",
+                        help="also write output to PATH (.ndjson/.jsonl, .csv or plain text), repeatable")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help="pause after this many table rows when running in a terminal")
+    parser.add_argument("--profile", action="store_true",
+                        help="collect cProfile data for each action (see dump_profile)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record each action's peak memory with tracemalloc")
+    parser.add_argument("--no-prefetch", action="store_true",
+                        help="do not load the other CSV files in the background")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="report how long each start-up phase took once the menu is shown")
+    args = parser.parse_args()
+    Printer.page_size = args.page_size
+    Printer.extra_sinks.extend(open_sink(path) for path in args.output)
+    timer.mark("arguments")
+
     data_folder = "data/"
-    #list all csv files in the data folder
-    import os
-    csv_files = [f for f in os.listdir(data_folder) if f.endswith('.csv')]
+    #list all csv files in the data folder, most recently used first
+    recent = RecentFiles()
+    csv_files = recent.order([os.path.join(data_folder, f) for f in os.listdir(data_folder) if f.endswith('.csv')])
+    prefetcher = None
+    if not args.chunksize and not args.no_prefetch:
+        # start loading (or cache-mapping) every file while the user is still choosing
+        prefetcher = Prefetcher(quiet_loader(not args.no_cache, not args.no_optimize))
+        prefetcher.start(csv_files)
+    timer.mark("file list")
     print("Available CSV files:")
     for i, file in enumerate(csv_files, 1):
-        print(f"{i}. {file}")
-    file_choice = input("Enter the number of the CSV file to load: ").strip()
+        print(f"{i}. {os.path.basename(file)}")
+    timer.mark("first prompt shown")
+    with timer.excluded("waiting for file choice"):
+        file_choice = input("Enter the number of the CSV file to load: ").strip()
     try:
         file_index = int(file_choice) - 1
         if 0 <= file_index < len(csv_files):
-            data_file = os.path.join(data_folder, csv_files[file_index])
+            data_file = csv_files[file_index]
         else:
             print("Invalid selection. Exiting.")
             exit(1)
@@ -128,6 +553,10 @@ if __name__ == "__main__":
         print("Invalid input. Exiting.")
         exit(1)
 
-    # Create the analysis object and start interactive mode
-    analysis = DataAnalysis(data_file)
-    analysis.run()
\ No newline at end of file
+    # Create the analysis object and start interactive mode; the data loads while the menu is shown
+    analysis = DataAnalysis(data_file, chunksize=args.chunksize, use_cache=not args.no_cache,
+                            optimize=not args.no_optimize, approximate=args.approx,
+                            exact_distinct=args.exact_distinct, profile=args.profile, trace_memory=args.trace_memory, prefetcher=prefetcher,
+                            recent=recent, background=True)
+    timer.mark("analysis setup")
+    analysis.run(startup=timer if args.startup_timing else None)
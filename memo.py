@@ -0,0 +1,122 @@
+import functools
+import itertools
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 256
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate the memory held by a result (containers are walked recursively)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    return size
+
+
+class ResultCache:
+    """LRU cache of computed results, bounded by entry count and estimated bytes; safe to share between threads."""
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value); a hit marks the entry as most recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return  # never worth evicting everything for one oversized result
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide: a version number is never handed out twice, so a result cached for one
+# frame can never be served for another, even one that reuses a freed object's id()
+_VERSIONS = itertools.count(1)
+# id(frame) -> (weak reference to the frame, its version)
+_FRAME_VERSIONS: Dict[int, Tuple[weakref.ref, int]] = {}
+_FRAME_LOCK = threading.Lock()
+
+
+def frame_version(data: Any) -> int:
+    """The version of a frame: taken from the counter the first time the frame is seen, then fixed."""
+    with _FRAME_LOCK:
+        entry = _FRAME_VERSIONS.get(id(data))
+        if entry is not None and entry[0]() is data:
+            return entry[1]
+    return bump_version(data)
+
+
+def bump_version(data: Any) -> int:
+    """Give `data` a fresh version, e.g. after it was modified in place."""
+    key = id(data)
+    version = next(_VERSIONS)
+    with _FRAME_LOCK:
+        _FRAME_VERSIONS[key] = (weakref.ref(data, lambda ref: _forget(key, ref)), version)
+    return version
+
+
+def _forget(key: int, ref: weakref.ref) -> None:
+    with _FRAME_LOCK:
+        if key in _FRAME_VERSIONS and _FRAME_VERSIONS[key][0] is ref:
+            del _FRAME_VERSIONS[key]
+
+
+def memoized(method: Callable) -> Callable:
+    """
+    Cache a method's result per (method name, arguments, owner's data version).
+
+    The owner must provide `results` (a ResultCache) and `data_version()`, whose
+    value changes whenever the underlying data is replaced or mutated.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), self.data_version())
+        hit, value = self.results.get(key)
+        if hit:
+            return value
+        value = method(self, *args, **kwargs)
+        self.results.put(key, value)
+        return value
+    return wrapper
@@ -1,3 +1,4 @@
+import inspect
 from typing import Callable, Any, Dict, List, Tuple, Optional
 
 def menu(label: Optional[str] = None, order: Optional[int] = None, section: Optional[str] = None):
@@ -14,9 +15,11 @@ def menu(label: Optional[str] = None, order: Optional[int] = None, section: Opti
 
 class MenuSelector:
     """Auto-discovers decorated methods and supports one-level submenus via 'section'."""
-    def __init__(self):
+    def __init__(self, instrumentation: Optional[Any] = None):
         # Each item: (order, section, label, func)
         self._items: List[Tuple[int, Optional[str], str, Callable]] = []
+        # Optional diagnostics.Diagnostics; actions returned by select() are wrapped with it
+        self.instrumentation = instrumentation
 
     def discover(self, obj: Any):
         """Scan obj for callables decorated with @menu and store metadata."""
@@ -24,6 +27,9 @@ class MenuSelector:
         for attr_name in dir(obj):
             if attr_name.startswith("_"):
                 continue
+            # properties are never menu items; reading them could build a lazy subsystem
+            if isinstance(inspect.getattr_static(obj, attr_name, None), property):
+                continue
             candidate = getattr(obj, attr_name)
             if callable(candidate) and hasattr(candidate, "_menu_meta"):
                 meta = getattr(candidate, "_menu_meta", {})
@@ -39,6 +45,16 @@ class MenuSelector:
     def is_empty(self) -> bool:
         return not self._items
 
+    def labels(self) -> List[str]:
+        return [label for _, _, label, _ in self._items]
+
+    def find(self, label: str) -> Optional[Callable]:
+        """Look up an action by its label (used by non-interactive callers)."""
+        for _, _, item_label, func in self._items:
+            if item_label == label:
+                return func
+        return None
+
     def sections(self) -> List[str]:
         """Return sorted list of sections (submenus)."""
         section_map: Dict[str, int] = {}
@@ -55,6 +71,11 @@ class MenuSelector:
         actions.sort(key=lambda t: t[0].lower())
         return actions
 
+    def _dispatch(self, label: str, func: Callable, section: Optional[str]) -> Callable:
+        if self.instrumentation is None:
+            return func
+        return self.instrumentation.wrap(label, func, section)
+
     def actions_in_section(self, section: str) -> List[Tuple[str, Callable]]:
         """Items within a given section."""
         actions = [(label, func) for _, sec, label, func in self._items if sec == section]
@@ -101,14 +122,14 @@ class MenuSelector:
             except ValueError:
                 return None
             if 0 <= idx < len(actions):
-                _, func = actions[idx]
-                return ("action", func)
+                label, func = actions[idx]
+                return ("action", self._dispatch(label, func, section))
             return None
 
         # Root view
         combined: List[Tuple[str, Any]] = []
         for label, func in self.actions_in_root():
-            combined.append(("action", func))
+            combined.append(("action", self._dispatch(label, func, None)))
         for sec in self.sections():
             combined.append(("section", sec))
         try:
@@ -0,0 +1,49 @@
+"""
+Attribution of an instrumented menu action's time to phases. Loader and printer code
+wrap their work in phase("load") / phase("print"); whatever remains is "compute".
+Streaming readers report the rows they hand out with count_rows().
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+PHASES = ("load", "compute", "print")
+STREAMED_ROWS = "streamed_rows"
+
+# Phase stack of the action currently being instrumented: [name, start, time spent in nested phases]
+_phase_stack: List[list] = []
+_active_phases: Optional[Dict[str, float]] = None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Attribute the enclosed time to `name` ('load' or 'print') for the running action.
+    Time is exclusive: a print inside a load only counts as print. No-op outside actions.
+    """
+    if _active_phases is None:
+        yield
+        return
+    frame = [name, time.perf_counter(), 0.0]
+    _phase_stack.append(frame)
+    try:
+        yield
+    finally:
+        _phase_stack.pop()
+        total = time.perf_counter() - frame[1]
+        _active_phases[name] = _active_phases.get(name, 0.0) + total - frame[2]
+        if _phase_stack:
+            _phase_stack[-1][2] += total
+
+
+def activate(phases: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+    """Collect phase timings into `phases` (None disables); returns the previous target."""
+    global _active_phases
+    previous, _active_phases = _active_phases, phases
+    return previous
+
+
+def count_rows(n: int) -> None:
+    """Record rows read by a streaming pass of the running action."""
+    if _active_phases is not None:
+        _active_phases[STREAMED_ROWS] = _active_phases.get(STREAMED_ROWS, 0) + n
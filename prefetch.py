@@ -0,0 +1,124 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pandas is only imported by the worker threads, off the startup path
+    import pandas as pd
+
+DEFAULT_RECENT_FILE = os.path.join(".cache", "recent.json")
+# Files are prefetched in MRU order until their combined size reaches this budget
+PREFETCH_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_WORKERS = 2
+
+
+def quiet_loader(use_cache: bool, optimize: bool) -> Callable[[str], "pd.DataFrame"]:
+    """A load function for background use: the schema report is not printed over the prompt."""
+    def load(path: str) -> "pd.DataFrame":
+        from cache import ColumnCache
+        from loader import DataLoader
+        loader = DataLoader(path, cache=ColumnCache() if use_cache else None, optimize=optimize)
+        loader.printer = lambda message, output_type="plain": None
+        return loader.load_data()
+    return load
+
+
+class RecentFiles:
+    """Most-recently-used dataset list persisted between sessions."""
+    def __init__(self, path: str = DEFAULT_RECENT_FILE) -> None:
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.last_used: Dict[str, float] = json.load(f)
+        except (OSError, ValueError):
+            self.last_used = {}
+
+    def touch(self, path: str) -> None:
+        self.last_used[os.path.abspath(path)] = time.time()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.last_used, f)
+        os.replace(tmp, self.path)
+
+    def order(self, paths: List[str]) -> List[str]:
+        """Most recently used first, never-used files after them by name."""
+        return sorted(paths, key=lambda p: (-self.last_used.get(os.path.abspath(p), 0.0), os.path.basename(p)))
+
+
+class Prefetcher:
+    """
+    Loads datasets on background threads so that choosing one later is instant.
+    Worker threads are daemons: quitting never waits for a half-read file.
+    """
+    def __init__(self, load: Callable[[str], "pd.DataFrame"], workers: int = DEFAULT_WORKERS,
+                 max_bytes: int = PREFETCH_MAX_BYTES) -> None:
+        self.load = load
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.futures: Dict[str, Future] = {}
+        self.seconds: Dict[str, float] = {}
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+
+    def start(self, paths: List[str]) -> None:
+        """Queue `paths` in the given order, skipping files once the byte budget is used up."""
+        budget = self.max_bytes
+        for path in paths:
+            key = os.path.abspath(path)
+            if key in self.futures:
+                continue
+            size = os.path.getsize(path)
+            if size > budget:
+                continue
+            budget -= size
+            self.futures[key] = Future()
+            self._queue.put((path, self.futures[key]))
+        while len(self._threads) < min(self.workers, len(self.futures)):
+            thread = threading.Thread(target=self._work, name="prefetch", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            path, future = self._queue.get()
+            # a future cancelled by get() was taken over by the caller's thread
+            if future.set_running_or_notify_cancel():
+                self._run(path, future)
+
+    def _run(self, path: str, future: Future) -> None:
+        started = time.perf_counter()
+        try:
+            future.set_result(self.load(path))
+        except Exception as e:
+            future.set_exception(e)
+        self.seconds[os.path.abspath(path)] = time.perf_counter() - started
+
+    def state(self, path: str) -> str:
+        future = self.futures.get(os.path.abspath(path))
+        if future is None:
+            return "not prefetched"
+        if future.cancelled():
+            return "cancelled"
+        if future.done():
+            return "failed" if future.exception() is not None else "ready"
+        return "loading" if future.running() else "queued"
+
+    def discard(self, path: str) -> None:
+        """Forget a prefetched copy that no longer matches the file (the next get loads it again)."""
+        self.futures.pop(os.path.abspath(path), None)
+
+    def get(self, path: str) -> "pd.DataFrame":
+        """The dataset at `path`: immediate when warm; a file still queued is loaded right away
+        instead of waiting behind the others."""
+        key = os.path.abspath(path)
+        future = self.futures.get(key)
+        if future is None or future.cancel():
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self.futures[key] = future
+            self._run(path, future)
+        return future.result()
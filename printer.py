@@ -1,26 +1,326 @@
-import pandas as pd
-from typing import Union
+import csv
+import json
+import math
+import sys
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from phases import phase
+
+try:  # optional faster JSON encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rows buffered to size the columns of a streamed table
+WIDTH_SAMPLE_ROWS = 50
+MAX_CELL_WIDTH = 40
+
+
+# numpy and pandas are looked up rather than imported: printing must not pay for
+# loading them, and until the data is loaded no message can contain their types.
+# getattr: a background load may still be half way through importing them.
+def _is_frame(obj: Any) -> bool:
+    frame = getattr(sys.modules.get("pandas"), "DataFrame", None)
+    return frame is not None and isinstance(obj, frame)
+
+
+def _is_table(obj: Any) -> bool:
+    return isinstance(obj, (list, dict)) or _is_frame(obj)
+
+
+def _numpy_kind(obj: Any) -> Optional[str]:
+    """'array' or 'scalar' for numpy values, None otherwise."""
+    np = sys.modules.get("numpy")
+    array, generic = getattr(np, "ndarray", None), getattr(np, "generic", None)
+    if array is None or generic is None:
+        return None
+    if isinstance(obj, array):
+        return "array"
+    return "scalar" if isinstance(obj, generic) else None
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Convert analysis results (numpy scalars, NaN, timestamps, tuple keys) into strict JSON types."""
+    if isinstance(obj, dict):
+        return {_json_key(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return [to_jsonable(v) for v in obj]
+    kind = _numpy_kind(obj)
+    if kind == "array":
+        return [to_jsonable(v) for v in obj.tolist()]
+    if kind == "scalar":
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    try:
+        if obj != obj:  # pd.NA / NaT
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(obj)
+
+
+def _json_key(key: Any) -> str:
+    if isinstance(key, tuple):
+        return ".".join(str(part) for part in key)
+    return str(to_jsonable(key))
+
+
+def _json_default(obj: Any) -> Any:
+    kind = _numpy_kind(obj)
+    if kind == "scalar":
+        return obj.item()
+    if kind == "array":
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = True) -> str:
+    """
+    Serialize a result straight to JSON text. Plain containers take the fast path
+    (orjson when installed); anything the encoder rejects, such as tuple keys from
+    multi-column group-bys or NaN values, is normalized with to_jsonable first.
+    """
+    try:
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_json_default, option=option).decode()
+        return json.dumps(obj, indent=2 if indent else None, default=_json_default, allow_nan=False)
+    except (TypeError, ValueError):
+        obj = to_jsonable(obj)
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        return json.dumps(obj, indent=2 if indent else None)
+
+
+def iter_rows(message: Any) -> Iterator[Dict[str, Any]]:
+    """Yield a table message as row dicts without building an intermediate DataFrame."""
+    if _is_frame(message):
+        keep_index = not isinstance(message.index, sys.modules["pandas"].RangeIndex)
+        columns = [str(col) for col in message.columns]
+        for index, values in zip(message.index, message.itertuples(index=False, name=None)):
+            row = dict(zip(columns, values))
+            yield {"": index, **row} if keep_index else row
+    elif isinstance(message, dict):
+        values = list(message.values())
+        if values and all(isinstance(v, dict) for v in values):
+            # {row label: {column: value}}, e.g. to_dict('index') results
+            for key, row in message.items():
+                yield {"": key, **{_json_key(k) if isinstance(k, tuple) else k: v for k, v in row.items()}}
+        elif values and all(isinstance(v, (list, tuple)) for v in values):
+            # {column: [values]}
+            columns = list(message.keys())
+            for cells in zip(*values):
+                yield dict(zip(columns, cells))
+        else:
+            for key, value in message.items():
+                yield {"key": key, "value": value}
+    else:
+        for item in message:
+            yield item if isinstance(item, dict) else {"value": item}
+
+
+def _cell(value: Any, width: Optional[int] = None) -> str:
+    text = "" if value is None else str(value)
+    if width is not None and len(text) > width:
+        return text[:max(width - 1, 0)] + "…"
+    return text
+
+
+class Sink:
+    """Destination for printer output; the base class renders human-readable text."""
+    colors = False
+
+    def __init__(self, stream: Optional[TextIO] = None, page_size: Optional[int] = None):
+        self.stream = stream
+        self.page_size = page_size
+
+    def write_line(self, text: str) -> None:
+        self.stream.write(text + "\n")
+
+    def text(self, message: Any, output_type: str) -> None:
+        text = str(message)
+        if self.colors and output_type == "warning":
+            text = f"\033[93m[WARNING] {text}\033[0m"
+        elif self.colors and output_type == "error":
+            text = f"\033[91m[ERROR] {text}\033[0m"
+        elif output_type in ("warning", "error"):
+            text = f"[{output_type.upper()}] {text}"
+        self.write_line(text)
+
+    def json(self, message: Any) -> None:
+        if isinstance(message, (list, dict)):
+            self.write_line(dumps(message))
+        elif _is_frame(message):
+            self.write_line(message.to_json(indent=2))
+        else:
+            self.write_line(str(message))
+
+    def table(self, message: Any) -> None:
+        if not _is_table(message):
+            self.write_line(str(message))
+            return
+        rows = iter_rows(message)
+        head = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        if not head:
+            self.write_line("(no rows)")
+            return
+        columns: List[Any] = []
+        for row in head:
+            columns.extend(key for key in row if key not in columns)
+        widths = [min(MAX_CELL_WIDTH, max([len(str(col))] + [len(_cell(row.get(col))) for row in head]))
+                  for col in columns]
+        header = "  ".join(_cell(col, w).ljust(w) for col, w in zip(columns, widths)).rstrip()
+        self.write_line(header)
+        self.write_line("  ".join("-" * w for w in widths))
+        for count, row in enumerate(self._chain(head, rows), 1):
+            self.write_line("  ".join(_cell(row.get(col), w).ljust(w) for col, w in zip(columns, widths)).rstrip())
+            if self.page_size and count % self.page_size == 0 and not self._next_page():
+                break
+
+    @staticmethod
+    def _chain(head: List[Dict[str, Any]], rest: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        yield from head
+        yield from rest
+
+    def _next_page(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+
+
+class ConsoleSink(Sink):
+    """Standard output with ANSI colors; pauses between table pages on a terminal."""
+    colors = True
+
+    def __init__(self, page_size: Optional[int] = None):
+        super().__init__(None, page_size)
+
+    def write_line(self, text: str) -> None:
+        # looked up per call so redirect_stdout() is honoured
+        sys.stdout.write(text + "\n")
+
+    def close(self) -> None:
+        pass
+
+    def _next_page(self) -> bool:
+        if not sys.stdin.isatty():
+            return True
+        return input("-- more (Enter to continue, q to stop) -- ").strip().lower() != "q"
+
+
+class TextFileSink(Sink):
+    """Plain-text copy of the output (no colors, no paging)."""
+    def __init__(self, path: str):
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+
+class NDJSONSink(Sink):
+    """One JSON object per line: table rows become records, other output is wrapped with its type."""
+    def __init__(self, path: str):
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+    def _record(self, obj: Any) -> None:
+        self.write_line(dumps(obj, indent=False))
+
+    def text(self, message: Any, output_type: str) -> None:
+        self._record({"type": output_type, "message": str(message)})
+
+    def json(self, message: Any) -> None:
+        if isinstance(message, str):
+            try:
+                message = json.loads(message)
+            except ValueError:
+                pass
+        self._record({"type": "json", "data": message})
+
+    def table(self, message: Any) -> None:
+        if not _is_table(message):
+            self.text(message, "plain")
+            return
+        for row in iter_rows(message):
+            self._record({"type": "row", "data": row})
+
+
+class CSVSink(Sink):
+    """Tabular output only; a new header row is written whenever the columns change."""
+    def __init__(self, path: str):
+        super().__init__(open(path, "a", encoding="utf-8", newline=""))
+        self._writer = csv.writer(self.stream)
+        self._columns: Optional[List[Any]] = None
+
+    def text(self, message: Any, output_type: str) -> None:
+        pass
+
+    def json(self, message: Any) -> None:
+        if _is_table(message):
+            self.table(message)
+
+    def table(self, message: Any) -> None:
+        if not _is_table(message):
+            return
+        for row in iter_rows(message):
+            columns = list(row.keys())
+            if columns != self._columns:
+                self._writer.writerow(columns)
+                self._columns = columns
+            self._writer.writerow([dumps(v, indent=False) if isinstance(v, (dict, list)) else _cell(v)
+                                   for v in row.values()])
+
+
+def open_sink(path: str) -> Sink:
+    """Pick a file sink from the extension: .ndjson/.jsonl, .csv, anything else is plain text."""
+    lower = path.lower()
+    if lower.endswith((".ndjson", ".jsonl")):
+        return NDJSONSink(path)
+    if lower.endswith(".csv"):
+        return CSVSink(path)
+    return TextFileSink(path)
+
 
 class Printer:
+    # Shared by every Printer: extra destinations (e.g. --output) and the console page size
+    extra_sinks: List[Sink] = []
+    page_size: Optional[int] = None
+
+    def __init__(self, sinks: Optional[Iterable[Sink]] = None) -> None:
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink(self.page_size)]
+        # Dispatch table built once per printer rather than on every call
+        self._types = {
+            "plain": lambda sink, msg: sink.text(msg, "plain"),
+            "table": lambda sink, msg: sink.table(msg),
+            "json": lambda sink, msg: sink.json(msg),
+            "info": lambda sink, msg: sink.text(msg, "info"),
+            "warning": lambda sink, msg: sink.text(msg, "warning"),
+            "error": lambda sink, msg: sink.text(msg, "error"),
+        }
+
     def printer(self, message: Union[str, list, dict], output_type: str = "plain") -> None:
             """
             Print messages in different formats.
-            
+
             Args:
                 message: The message/data to print
                 output_type: Format type ("plain", "table", "json", "info", "warning", "error")
             """
-            types = {
-                "plain": lambda msg: print(msg),
-                "table": lambda msg: print(pd.DataFrame(msg) if isinstance(msg, (list, dict)) else msg),
-                "json": lambda msg: print(pd.DataFrame(msg).to_json(indent=2) if isinstance(msg, (list, dict)) else msg),
-                "info": lambda msg: print(f"{msg}"),
-                "warning": lambda msg: print(f"\033[93m[WARNING] {msg}\033[0m"),
-                "error": lambda msg: print(f"\033[91m[ERROR] {msg}\033[0m")
-            }
-            
-            if output_type in types:
-                types[output_type](message)
-            else:
-                print(f"Unknown format '{output_type}'. Using plain format.")
-                print(message)
\ No newline at end of file
+            handler = self._types.get(output_type)
+            sinks = self.sinks + Printer.extra_sinks
+            with phase("print"):
+                if handler is None:
+                    for sink in sinks:
+                        sink.text(f"Unknown format '{output_type}'. Using plain format.", "plain")
+                    handler = self._types["plain"]
+                for sink in sinks:
+                    handler(sink, message)
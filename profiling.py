@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sketches import mix64
+
+DEFAULT_PROFILE_DIR = os.path.join(".cache", "profiles")
+# Uniques inspected to infer what a text column holds
+TYPE_SAMPLE = 1000
+
+
+def _scalar(value: Any) -> Any:
+    """A JSON-friendly form of a min/max value."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, (pd.Timestamp, np.datetime64, pd.Timedelta)):
+        return str(value)
+    return value
+
+
+def _inferred_type(series: pd.Series, uniques: np.ndarray) -> str:
+    """What the column holds, e.g. 'integer', 'string', or 'integer (as text)' for digits stored as strings."""
+    kind = pd.api.types.infer_dtype(uniques[:TYPE_SAMPLE], skipna=True)
+    if kind == "string" and len(uniques):
+        sample = pd.Series(uniques[:TYPE_SAMPLE])
+        numbers = pd.to_numeric(sample, errors="coerce")
+        if numbers.notna().all():
+            return ("integer" if (numbers == numbers.round()).all() else "floating") + " (as text)"
+    return kind
+
+
+def profile_column(series: pd.Series) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Profile one column from a single factorize: every later statistic is read off the
+    codes and the (usually far smaller) table of distinct values. Returns the profile
+    and the codes (-1 for missing), which identify the value of each row.
+    """
+    codes, table = pd.factorize(series, use_na_sentinel=True)
+    uniques = np.asarray(table)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques)) if len(uniques) else np.zeros(0, dtype=np.int64)
+    nulls = len(series) - int(counts.sum())
+    profile: Dict[str, Any] = {
+        "dtype": str(series.dtype),
+        "inferred_type": _inferred_type(series, uniques),
+        "nulls": nulls,
+        "distinct": len(uniques),
+        "min": None,
+        "max": None,
+    }
+    if len(uniques):
+        try:
+            if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.ordered:
+                profile["min"], profile["max"] = _scalar(table.min()), _scalar(table.max())
+            else:
+                profile["min"], profile["max"] = _scalar(np.min(uniques)), _scalar(np.max(uniques))
+        except TypeError:  # mixed types without an order
+            pass
+    is_text = not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+                   or pd.api.types.is_timedelta64_dtype(series))
+    if is_text and len(uniques):
+        # lengths of the distinct values, weighted by how often each occurs
+        lengths = pd.Series(uniques).astype(str).str.len().to_numpy(dtype=np.int64)
+        profile["min_length"] = int(lengths.min())
+        profile["max_length"] = int(lengths.max())
+        profile["mean_length"] = round(float((lengths * counts).sum() / counts.sum()), 2)
+    return profile, codes
+
+
+class DataProfile:
+    """Per-column profiles plus frame-level counts; serves check_data_quality."""
+    def __init__(self, rows: int, columns: Dict[str, Dict[str, Any]], duplicate_rows: int,
+                 seconds: float = 0.0) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.duplicate_rows = duplicate_rows
+        self.seconds = seconds
+        # read back from a ProfileStore rather than computed now
+        self.stored = False
+
+    def quality_report(self) -> Dict[str, Any]:
+        missing = {col: profile["nulls"] for col, profile in self.columns.items()}
+        return {
+            "total_rows": self.rows,
+            "total_columns": len(self.columns),
+            "missing_values": missing,
+            "missing_percentages": {
+                col: (count / self.rows) * 100 if self.rows else 0.0 for col, count in missing.items()
+            },
+            "duplicate_rows": self.duplicate_rows,
+            "unique_values": {col: profile["distinct"] for col, profile in self.columns.items()},
+        }
+
+    def table(self) -> List[Dict[str, Any]]:
+        fields = ("dtype", "inferred_type", "nulls", "distinct", "min", "max", "min_length", "mean_length",
+                  "max_length")
+        return [{"column": col, **{field: profile.get(field, "") for field in fields}}
+                for col, profile in self.columns.items()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"rows": self.rows, "columns": self.columns, "duplicate_rows": self.duplicate_rows,
+                "seconds": self.seconds}
+
+    @classmethod
+    def from_dict(cls, stored: Dict[str, Any]) -> "DataProfile":
+        return cls(stored["rows"], stored["columns"], stored["duplicate_rows"], stored.get("seconds", 0.0))
+
+
+def profile_frame(data: pd.DataFrame, workers: Optional[int] = None) -> DataProfile:
+    """
+    Profile every column in one pass each, columns in parallel on a thread pool.
+    Duplicate rows are counted from 64-bit row fingerprints folded from the column
+    codes as each column finishes, so no row is hashed as a whole and a long string
+    is hashed once per distinct value. Two different rows share a fingerprint with
+    probability about rows^2 / 2^65.
+    """
+    started = time.perf_counter()
+    workers = workers or min(os.cpu_count() or 1, max(len(data.columns), 1))
+    fingerprints = np.zeros(len(data), dtype=np.uint64)
+    profiles: Dict[int, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(profile_column, data.iloc[:, i]): i for i in range(len(data.columns))}
+        for future in as_completed(futures):
+            profile, codes = future.result()
+            profiles[futures[future]] = profile
+            # the fold is a bijection per column, so equal fingerprints mean equal codes
+            # up to hash collisions; columns may arrive in any order, rows all see the same one
+            fingerprints = mix64(fingerprints ^ (codes.astype(np.int64) + 1).astype(np.uint64))
+            del codes
+    duplicates = len(data) - len(pd.unique(fingerprints)) if len(data) else 0
+    columns = {str(data.columns[i]): profiles[i] for i in range(len(data.columns))}
+    return DataProfile(len(data), columns, int(duplicates), round(time.perf_counter() - started, 3))
+
+
+class ProfileStore:
+    """
+    Profiles persisted per source file and schema (the same file loaded with and without
+    schema optimization has two), dropped when the file's size or mtime changes.
+    """
+    def __init__(self, profile_dir: str = DEFAULT_PROFILE_DIR) -> None:
+        self.profile_dir = profile_dir
+
+    def _file(self, path: str, data: pd.DataFrame) -> str:
+        schema = "|".join(f"{name}:{dtype}" for name, dtype in data.dtypes.items())
+        key = hashlib.blake2b(f"{os.path.abspath(path)}|{schema}".encode(), digest_size=12).hexdigest()
+        return os.path.join(self.profile_dir, key + ".json")
+
+    @staticmethod
+    def _signature(path: str) -> List[int]:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, path: str, data: pd.DataFrame) -> Optional[DataProfile]:
+        try:
+            with open(self._file(path, data), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored["signature"] != self._signature(path) or stored["profile"]["rows"] != len(data):
+                return None
+            profile = DataProfile.from_dict(stored["profile"])
+            profile.stored = True
+            return profile
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, path: str, data: pd.DataFrame, profile: DataProfile) -> None:
+        target = self._file(path, data)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        tmp = target + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": os.path.abspath(path), "signature": self._signature(path),
+                       "profile": profile.to_dict()}, f, default=str)
+        os.replace(tmp, target)
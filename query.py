@@ -0,0 +1,438 @@
+import hashlib
+import io
+import json
+import operator
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from refresh import RecordScanner
+from rowindex import DEFAULT_INDEX_DIR, RowIndex, parse_rows
+from schema import SchemaOptimizer
+
+DEFAULT_ZONE_DIR = os.path.join(".cache", "zonemaps")
+# A scan starts with a small block (a preview needs a few rows) and doubles up to the maximum
+FIRST_BLOCK_BYTES = 64 * 1024
+MAX_BLOCK_BYTES = 8 * 1024 * 1024
+# Rows parsed once to infer the schema every block is conformed to (with optimize)
+SCHEMA_ROWS = 1000
+
+# "~" is a case-insensitive substring match
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq, "!=": operator.ne, ">=": operator.ge, "<=": operator.le,
+    ">": operator.gt, "<": operator.lt, "~": None,
+}
+_PREDICATE = re.compile(r"^\s*(.+?)\s*(==|!=|>=|<=|>|<|~)\s*(.*?)\s*$")
+
+Predicate = Tuple[str, str, str]
+
+
+def parse_filters(text: str) -> List[Predicate]:
+    """'HR >= 10 and Team == NYY' -> [('HR', '>=', '10'), ('Team', '==', 'NYY')]; quotes around values are optional."""
+    predicates = []
+    for part in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        if not part:
+            continue
+        match = _PREDICATE.match(part)
+        if match is None:
+            raise ValueError(f"Cannot read filter '{part}'; expected 'column op value' with op one of "
+                             f"{', '.join(OPERATORS)}")
+        column, op, value = match.groups()
+        predicates.append((column, op, value.strip("'\"")))
+    return predicates
+
+
+def parse_order(text: str) -> Optional[Tuple[str, bool]]:
+    """'HR desc' or '-HR' -> ('HR', False); 'HR' or 'HR asc' -> ('HR', True); '' -> None."""
+    text = text.strip()
+    if not text:
+        return None
+    if text.startswith("-"):
+        return text[1:].strip(), False
+    column, _, direction = text.rpartition(" ")
+    if direction.lower() in ("asc", "desc") and column:
+        return column.strip(), direction.lower() == "asc"
+    return text, True
+
+
+def _compare(series: pd.Series, op: str, value: str) -> np.ndarray:
+    """Boolean mask of `series op value`; the value is read as a number/date when the column is one."""
+    if op == "~":
+        return series.astype(str).str.contains(value, case=False, regex=False).to_numpy(dtype=bool)
+    func = OPERATORS[op]
+    if pd.api.types.is_bool_dtype(series):
+        target: Any = value.lower() in ("true", "1", "yes")
+    elif pd.api.types.is_numeric_dtype(series):
+        try:
+            target = float(value)
+        except ValueError:
+            raise ValueError(f"Column '{series.name}' is numeric; cannot compare it with '{value}'") from None
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        target = pd.Timestamp(value)
+    else:
+        if op in ("==", "!="):
+            result = func(series, value)
+        else:
+            result = func(series.astype(str), value)
+        return np.asarray(result.fillna(op == "!="), dtype=bool)
+    return np.asarray(func(series, target), dtype=bool)
+
+
+def apply_filters(frame: pd.DataFrame, predicates: List[Predicate]) -> pd.DataFrame:
+    if not predicates:
+        return frame
+    mask = np.ones(len(frame), dtype=bool)
+    for column, op, value in predicates:
+        mask &= _compare(frame[column], op, value)
+    return frame[mask]
+
+
+class Query:
+    """
+    A lazy plan over a source: select/filter/sort/limit only record what is wanted and
+    nothing is read until collect(). The source receives the whole plan, so it can read
+    just the columns involved, test the filters while scanning, and stop at the limit.
+    """
+    def __init__(self, source: "Source", columns: Optional[List[str]] = None,
+                 predicates: Tuple[Predicate, ...] = (), order: Optional[Tuple[str, bool]] = None,
+                 limit: Optional[int] = None) -> None:
+        self.source = source
+        self.columns = columns
+        self.predicates = predicates
+        self.order = order
+        self.limit_rows = limit
+        # Filled in by collect(): blocks read/skipped, rows scanned, early stop
+        self.stats: Dict[str, Any] = {}
+
+    def _with(self, **changes) -> "Query":
+        fields = dict(columns=self.columns, predicates=self.predicates, order=self.order, limit=self.limit_rows)
+        fields.update(changes)
+        return Query(self.source, **fields)
+
+    def select(self, *columns: str) -> "Query":
+        return self._with(columns=list(columns))
+
+    def filter(self, column: str, op: str, value: Any) -> "Query":
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'. Choose from: {', '.join(OPERATORS)}")
+        return self._with(predicates=self.predicates + ((column, op, str(value)),))
+
+    def where(self, text: str) -> "Query":
+        return self._with(predicates=self.predicates + tuple(parse_filters(text)))
+
+    def sort(self, column: str, ascending: bool = True) -> "Query":
+        return self._with(order=(column, ascending))
+
+    def limit(self, rows: int) -> "Query":
+        return self._with(limit=rows)
+
+    def referenced_columns(self) -> List[str]:
+        names = list(self.columns or [])
+        names += [column for column, _, _ in self.predicates]
+        if self.order:
+            names.append(self.order[0])
+        return list(dict.fromkeys(names))
+
+    def needed_columns(self) -> Optional[List[str]]:
+        """Columns a scan must read (None for all), in file order."""
+        if self.columns is None:
+            return None
+        wanted = set(self.referenced_columns())
+        return [column for column in self.source.columns() if column in wanted]
+
+    def validate(self) -> None:
+        missing = [column for column in self.referenced_columns() if column not in self.source.columns()]
+        if missing:
+            raise KeyError(f"Column '{', '.join(missing)}' not found in the dataset.")
+
+    def explain(self) -> List[str]:
+        steps = [self.source.describe(self.needed_columns())]
+        for column, op, value in self.predicates:
+            steps.append(f"filter {column} {op} {value} (tested while scanning)")
+        if self.order:
+            direction = "asc" if self.order[1] else "desc"
+            kept = f", keeping the top {self.limit_rows} per block" if self.limit_rows is not None else ""
+            steps.append(f"sort {self.order[0]} {direction}{kept}")
+        if self.limit_rows is not None and not self.order:
+            steps.append(f"limit {self.limit_rows} (the scan stops once it has them)")
+        if self.columns is not None:
+            steps.append(f"project {', '.join(self.columns)}")
+        return steps
+
+    def collect(self) -> pd.DataFrame:
+        self.validate()
+        frame, self.stats = self.source.scan(self)
+        if self.columns is not None:
+            frame = frame[self.columns]
+        return frame.reset_index(drop=True)
+
+
+class Source:
+    """Where a Query reads from."""
+    def columns(self) -> List[str]:
+        raise NotImplementedError
+
+    def describe(self, columns: Optional[List[str]]) -> str:
+        raise NotImplementedError
+
+    def scan(self, plan: Query) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        raise NotImplementedError
+
+    # Positional access for paging; frames are labelled with their row numbers
+    def row_count(self) -> int:
+        raise NotImplementedError
+
+    def slice(self, start: int, stop: int) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def sample(self, count: int, seed: Optional[int] = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+def _sample_rows(total: int, count: int, seed: Optional[int]) -> np.ndarray:
+    """`count` distinct row numbers drawn uniformly, ascending."""
+    return np.sort(np.random.default_rng(seed).choice(total, size=min(count, total), replace=False))
+
+
+def _ordered(frame: pd.DataFrame, order: Optional[Tuple[str, bool]], limit: Optional[int]) -> pd.DataFrame:
+    if order:
+        # stable, so ties keep file order and top-k per block equals sorting everything
+        frame = frame.sort_values(order[0], ascending=order[1], kind="stable", na_position="last")
+    return frame.head(limit) if limit is not None else frame
+
+
+class FrameSource(Source):
+    """An already loaded DataFrame: plans run as column selection plus boolean masks, no I/O."""
+    def __init__(self, data: pd.DataFrame) -> None:
+        self.data = data
+
+    def columns(self) -> List[str]:
+        return list(self.data.columns)
+
+    def row_count(self) -> int:
+        return len(self.data)
+
+    def slice(self, start: int, stop: int) -> pd.DataFrame:
+        part = self.data.iloc[start:stop]
+        return part.set_axis(pd.RangeIndex(start, start + len(part)))
+
+    def sample(self, count: int, seed: Optional[int] = None) -> pd.DataFrame:
+        rows = _sample_rows(len(self.data), count, seed)
+        return self.data.iloc[rows].set_axis(rows)
+
+    def describe(self, columns: Optional[List[str]]) -> str:
+        selected = "all columns" if columns is None else f"columns {', '.join(columns)}"
+        return f"in-memory frame ({len(self.data)} rows): {selected}"
+
+    def scan(self, plan: Query) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        needed = plan.needed_columns()
+        frame = self.data if needed is None else self.data[needed]
+        if plan.limit_rows is not None and not plan.predicates and not plan.order:
+            frame = frame.head(plan.limit_rows)
+        frame = _ordered(apply_filters(frame, list(plan.predicates)), plan.order, plan.limit_rows)
+        return frame, {"rows_scanned": len(self.data)}
+
+
+class ZoneMap:
+    """
+    Per-block row counts and min/max/null counts of numeric columns for one CSV file,
+    gathered by earlier scans and persisted next to the column cache. A block whose
+    ranges cannot satisfy a filter is skipped without being read. Entries are dropped
+    when the file's size or mtime changes.
+    """
+    def __init__(self, path: str, zone_dir: str = DEFAULT_ZONE_DIR, variant: str = "") -> None:
+        # optimized and raw scans see different column types (durations as minutes or text)
+        key = hashlib.blake2b(f"{os.path.abspath(path)}|{variant}".encode(), digest_size=12).hexdigest()
+        self.file = os.path.join(zone_dir, key + ".json")
+        self.path = path
+        stat = os.stat(path)
+        self.signature = [stat.st_size, stat.st_mtime_ns]
+        self.blocks: List[Dict[str, Any]] = []
+        self.changed = False
+        try:
+            with open(self.file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("signature") == self.signature:
+                self.blocks = stored["blocks"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def record(self, index: int, start: int, end: int, chunk: pd.DataFrame) -> None:
+        if index == len(self.blocks):
+            self.blocks.append({"start": start, "end": end, "rows": len(chunk), "stats": {}})
+        block = self.blocks[index]
+        for column in chunk.columns:
+            series = chunk[column]
+            if column in block["stats"] or pd.api.types.is_bool_dtype(series) \
+                    or not pd.api.types.is_numeric_dtype(series):
+                continue
+            values = series.to_numpy(dtype="float64", na_value=np.nan)
+            present = values[~np.isnan(values)]
+            low, high = (float(present.min()), float(present.max())) if present.size else (None, None)
+            block["stats"][column] = [low, high, int(values.size - present.size)]
+            self.changed = True
+
+    @staticmethod
+    def may_match(block: Dict[str, Any], predicates: List[Predicate]) -> bool:
+        """False only when the block's ranges rule out every row for some filter."""
+        for column, op, value in predicates:
+            stats = block["stats"].get(column)
+            if stats is None or op == "~":
+                continue
+            low, high, nulls = stats
+            try:
+                target = float(value)
+            except ValueError:
+                continue
+            if low is None:  # only missing values: numeric comparisons never hold, != always does
+                if op != "!=":
+                    return False
+                continue
+            if (op == ">" and high <= target) or (op == ">=" and high < target) \
+                    or (op == "<" and low >= target) or (op == "<=" and low > target) \
+                    or (op == "==" and not low <= target <= high) \
+                    or (op == "!=" and low == high == target and not nulls):
+                return False
+        return True
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        tmp = self.file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": os.path.abspath(self.path), "signature": self.signature, "blocks": self.blocks}, f)
+        os.replace(tmp, self.file)
+        self.changed = False
+
+
+class CsvSource(Source):
+    """
+    A CSV file read on demand, in record-aligned byte blocks: only the plan's columns are
+    parsed (usecols), filters run per block, blocks ruled out by the zone map are never
+    read, and without a sort the scan ends as soon as the limit is met. With a sort and
+    a limit only the running top rows are kept between blocks. Paging and sampling read
+    single rows through the file's RowIndex. With `optimize` every block is conformed to
+    one schema inferred from the first rows, before it is filtered, sorted or summarized
+    in the zone map, so plans see the same types as on the loaded frame.
+    """
+    def __init__(self, path: str, optimize: bool = False, zone_dir: Optional[str] = DEFAULT_ZONE_DIR,
+                 index_dir: Optional[str] = DEFAULT_INDEX_DIR) -> None:
+        self.path = path
+        self.optimize = optimize
+        self.zone_dir = zone_dir
+        self.index_dir = index_dir
+        self._header: Optional[bytes] = None
+        self._columns: Optional[List[str]] = None
+        self._index: Optional[RowIndex] = None
+        self._schema: Optional[pd.DataFrame] = None
+
+    @property
+    def index(self) -> RowIndex:
+        """Built (or read back from disk) the first time a page is requested."""
+        if self._index is None or self._index.signature != RowIndex.current_signature(self.path):
+            self._index = RowIndex(self.path, self.index_dir)
+        return self._index
+
+    def schema(self) -> pd.DataFrame:
+        """The optimized columns (no rows) inferred once from the first SCHEMA_ROWS rows."""
+        if self._schema is None:
+            sample = pd.read_csv(self.path, nrows=SCHEMA_ROWS)
+            self._schema = (SchemaOptimizer().optimize(sample) if not sample.empty else sample).iloc[:0]
+        return self._schema
+
+    def _conform(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if self.optimize and not frame.empty:
+            # same types as the loaded frame (durations in minutes, dates parsed...)
+            frame = SchemaOptimizer.conform(frame, self.schema())
+        return frame
+
+    def row_count(self) -> int:
+        return self.index.rows
+
+    def slice(self, start: int, stop: int) -> pd.DataFrame:
+        return self._conform(parse_rows(self.index.read(start, stop), first_row=start))
+
+    def sample(self, count: int, seed: Optional[int] = None) -> pd.DataFrame:
+        rows = _sample_rows(self.index.rows, count, seed)
+        return self._conform(parse_rows(self.index.take(rows), rows=rows))
+
+    def header(self) -> bytes:
+        if self._header is None:
+            with open(self.path, "rb") as f:
+                self._header = f.readline()
+        return self._header
+
+    def columns(self) -> List[str]:
+        if self._columns is None:
+            header = self.header()
+            self._columns = list(pd.read_csv(io.BytesIO(header), nrows=0).columns) if header.strip() else []
+        return self._columns
+
+    def describe(self, columns: Optional[List[str]]) -> str:
+        selected = "all columns" if columns is None else \
+            f"columns {', '.join(columns)} ({len(columns)} of {len(self.columns())})"
+        return f"scan {os.path.basename(self.path)}: {selected}"
+
+    def _blocks(self, zones: Optional[ZoneMap]) -> Iterator[Tuple[int, int, int]]:
+        """(index, start, end) byte ranges of whole records, the same ones on every scan of the file."""
+        known = zones.blocks if zones is not None else []
+        index, position, size = 0, len(self.header()), FIRST_BLOCK_BYTES
+        for block in known:
+            yield index, block["start"], block["end"]
+            index, position = index + 1, block["end"]
+            size = min(size * 2, MAX_BLOCK_BYTES)
+        with open(self.path, "rb") as f:
+            while True:
+                f.seek(position)
+                data = f.read(size)
+                if not data:
+                    return
+                end = len(data) if len(data) < size else RecordScanner().last_end(data)
+                if end == 0:  # one record longer than the block
+                    size *= 2
+                    continue
+                yield index, position, position + end
+                index, position = index + 1, position + end
+                size = min(size * 2, MAX_BLOCK_BYTES)
+
+    def _parse(self, start: int, end: int, columns: Optional[List[str]]) -> pd.DataFrame:
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return self._conform(pd.read_csv(io.BytesIO(self.header() + data), usecols=columns))
+
+    def scan(self, plan: Query) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        needed = plan.needed_columns()
+        predicates = list(plan.predicates)
+        zones = ZoneMap(self.path, self.zone_dir, "optimized" if self.optimize else "") if self.zone_dir else None
+        stats = {"blocks_read": 0, "blocks_skipped": 0, "rows_scanned": 0, "bytes_read": 0, "stopped_early": False}
+        parts: List[pd.DataFrame] = []
+        kept = 0
+        for index, start, end in self._blocks(zones):
+            if zones is not None and index < len(zones.blocks) and not ZoneMap.may_match(zones.blocks[index], predicates):
+                stats["blocks_skipped"] += 1
+                continue
+            chunk = self._parse(start, end, needed)
+            stats["blocks_read"] += 1
+            stats["rows_scanned"] += len(chunk)
+            stats["bytes_read"] += end - start
+            if zones is not None:
+                zones.record(index, start, end, chunk)
+            chunk = apply_filters(chunk, predicates)
+            if plan.order and plan.limit_rows is not None:
+                parts = [_ordered(pd.concat(parts + [chunk]), plan.order, plan.limit_rows)]
+                continue
+            parts.append(chunk)
+            kept += len(chunk)
+            if plan.limit_rows is not None and not plan.order and kept >= plan.limit_rows:
+                stats["stopped_early"] = True
+                break
+        if zones is not None:
+            zones.save()
+        columns = needed if needed is not None else self.columns()
+        frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        return _ordered(frame, plan.order, plan.limit_rows), stats
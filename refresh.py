@@ -0,0 +1,194 @@
+import hashlib
+import io
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from schema import SchemaOptimizer
+
+# refresh() outcomes
+UNCHANGED, APPENDED, RELOAD = "unchanged", "appended", "reload"
+READ_BLOCK = 1 << 20
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+
+
+class RecordScanner:
+    """Finds where CSV records end in a byte stream; a newline inside a quoted field does not end one."""
+    def __init__(self) -> None:
+        self.in_quotes = False
+
+    def ends(self, block: bytes) -> List[int]:
+        """Offsets just past every record-ending newline in `block`, continuing the quote state."""
+        if not self.in_quotes and b'"' not in block:
+            ends, position = [], block.find(b"\n")
+            while position >= 0:
+                ends.append(position + 1)
+                position = block.find(b"\n", position + 1)
+            return ends
+        ends = []
+        for match in _QUOTE_OR_NEWLINE.finditer(block):
+            if match.group() == b'"':
+                self.in_quotes = not self.in_quotes  # an escaped "" toggles twice
+            elif not self.in_quotes:
+                ends.append(match.end())
+        return ends
+
+    def end_offsets(self, block) -> np.ndarray:
+        """ends() for large buffers (bytes or a memory map slice), vectorized with numpy."""
+        arr = np.frombuffer(block, dtype=np.uint8)
+        newlines = np.flatnonzero(arr == ord("\n"))
+        quotes = np.flatnonzero(arr == ord('"'))
+        if quotes.size == 0:
+            return newlines + 1 if not self.in_quotes else newlines[:0]
+        # a newline ends a record when an even number of quotes (plus the carried state) precede it
+        inside = (np.searchsorted(quotes, newlines) + self.in_quotes) & 1
+        self.in_quotes = bool((quotes.size + self.in_quotes) & 1)
+        return newlines[inside == 0] + 1
+
+    def count(self, block: bytes) -> int:
+        if not self.in_quotes and b'"' not in block:
+            return block.count(b"\n")
+        return len(self.ends(block))
+
+    def last_end(self, block: bytes) -> int:
+        """Offset just past the last complete record in `block` (0 when there is none)."""
+        if not self.in_quotes and b'"' not in block:
+            return block.rfind(b"\n") + 1
+        ends = self.ends(block)
+        return ends[-1] if ends else 0
+
+
+def append_rows(data: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """`data` followed by `rows` (conformed to its dtypes); categorical columns get the union of categories."""
+    rows = SchemaOptimizer.conform(rows, data)
+    base = data.copy(deep=False)
+    for name in data.columns:
+        if not isinstance(data[name].dtype, pd.CategoricalDtype) or name not in rows.columns:
+            continue
+        categories = data[name].cat.categories
+        new = pd.Index(rows[name].dropna().unique()).difference(categories)
+        if len(new):
+            base[name] = base[name].cat.add_categories(new)
+            categories = base[name].cat.categories
+        rows[name] = pd.Categorical(rows[name], categories=categories)
+    combined = pd.concat([base, rows], ignore_index=True)
+    for name in data.columns:
+        # an integer column widened by values that did not fit: as narrow as a fresh load makes it
+        dtype = combined[name].dtype
+        if dtype != data[name].dtype and isinstance(dtype, np.dtype) and dtype.kind == "i" \
+                and isinstance(data[name].dtype, np.dtype) and data[name].dtype.kind == "i":
+            combined[name] = pd.to_numeric(combined[name], downcast="integer")
+    return combined
+
+
+class TailReader:
+    """
+    Follows an append-only CSV file: remembers how far it has been ingested (byte
+    offset, row count and a digest of every ingested byte) and parses only what was
+    appended since. If the file was replaced or truncated, or any ingested byte changed,
+    refresh() reports RELOAD instead and the caller reloads the whole file.
+
+    Construct it before the file is read and hand the loaded frame to baseline(). The
+    digest of the loaded bytes comes from the load itself (the loader hashes the file
+    as pandas reads it, and a column-cache hit stores the hash), so loading reads
+    nothing extra. Without one, the first refresh takes the file as the baseline only
+    if its size and mtime are still those seen before the load, and reloads otherwise.
+    Each refresh re-reads the ingested bytes once to check the digest.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        stat = os.stat(path)
+        self._identity = (stat.st_dev, stat.st_ino)
+        # size and mtime before the load read the file
+        self._loaded = (stat.st_size, stat.st_mtime_ns)
+        self.columns: List[str] = []
+        self.offset = 0
+        self.rows = 0
+        self._header = b""
+        self._digest: Optional[str] = None
+        # the last ingested row had no line terminator yet
+        self._needs_newline = False
+
+    def baseline(self, rows: int, columns: List[str], fingerprint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        The frame loaded from the file: its row count and columns, plus the loaded bytes'
+        fingerprint (see cache.file_fingerprint) when the load knows it.
+        """
+        self.rows, self.columns = rows, list(columns)
+        if fingerprint is not None and (fingerprint["size"], fingerprint["mtime_ns"]) == self._loaded:
+            self.offset, self._digest = fingerprint["size"], fingerprint["content_hash"]
+
+    def _prefix_digest(self, f) -> Any:
+        """blake2b of the first `offset` bytes, computed as cache.file_fingerprint does."""
+        digest = hashlib.blake2b(digest_size=16)
+        f.seek(0)
+        remaining = self.offset
+        while remaining > 0:
+            block = f.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+        return digest
+
+    def _verified(self, stat: os.stat_result, f) -> Optional[Any]:
+        """The digest of the ingested bytes if they are unchanged, else None."""
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            return None
+        if self._digest is None:
+            # no fingerprint from the load: only a file untouched since then can be the baseline
+            if (stat.st_size, stat.st_mtime_ns) != self._loaded:
+                return None
+            self.offset = stat.st_size
+        elif stat.st_size < self.offset:
+            return None
+        digest = self._prefix_digest(f)
+        if self._digest is None:
+            self._digest = digest.hexdigest()
+        elif digest.hexdigest() != self._digest:
+            return None
+        if not self._header:
+            f.seek(0)
+            self._header = f.readline()
+            f.seek(max(self.offset - 1, 0))
+            # pandas also parsed a final row that has no newline yet
+            self._needs_newline = self.offset > 0 and f.read(1) != b"\n"
+        return digest
+
+    def refresh(self) -> Tuple[str, Optional[pd.DataFrame]]:
+        """(UNCHANGED, None), (APPENDED, new rows) or (RELOAD, None). A row still being written is left for later."""
+        try:
+            stat = os.stat(self.path)
+            with open(self.path, "rb") as f:
+                digest = self._verified(stat, f)
+                if digest is None:
+                    return RELOAD, None
+                if stat.st_size == self.offset:
+                    return UNCHANGED, None
+                f.seek(self.offset)
+                tail = f.read(stat.st_size - self.offset)
+        except OSError:
+            return RELOAD, None
+        skip = 0
+        if self._needs_newline:
+            if not tail.startswith((b"\n", b"\r\n")):
+                return RELOAD, None  # text was added to the last row itself
+            skip = tail.index(b"\n") + 1
+        end = skip + RecordScanner().last_end(tail[skip:])
+        if end == skip:
+            return UNCHANGED, None
+        try:
+            rows = pd.read_csv(io.BytesIO(self._header + tail[skip:end]))
+        except (pd.errors.ParserError, ValueError):
+            return RELOAD, None
+        if list(rows.columns) != self.columns:
+            return RELOAD, None
+        digest.update(tail[:end])
+        self._digest = digest.hexdigest()
+        self.offset += end
+        self.rows += len(rows)
+        self._needs_newline = False
+        return APPENDED, rows
@@ -0,0 +1,139 @@
+import hashlib
+import io
+import mmap
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from refresh import RecordScanner
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "rowindex")
+# Every STRIDE-th row start is indexed: 8 bytes per STRIDE rows, and at most STRIDE rows to skip per lookup
+STRIDE = 1024
+SCAN_BLOCK = 16 * 1024 * 1024
+# First window scanned forward from an indexed offset; doubled until it holds the rows wanted
+SEEK_WINDOW = 64 * 1024
+
+
+class RowIndex:
+    """
+    Byte offsets into a CSV file, built once by a vectorized, quote-aware newline scan
+    of a memory map and stored under .cache/rowindex. The index is rebuilt when the
+    file's size or mtime changes. It records where every STRIDE-th row starts, so any
+    row is reached by a seek plus a scan of at most STRIDE rows, and reading a page
+    costs the same at the start or the end of a multi-GB file.
+    """
+    def __init__(self, path: str, index_dir: Optional[str] = DEFAULT_INDEX_DIR, stride: int = STRIDE) -> None:
+        self.path = path
+        self.stride = stride
+        self.signature = self.current_signature(path)
+        self.size = self.signature[0]
+        key = hashlib.blake2b(f"{os.path.abspath(path)}|{stride}".encode(), digest_size=12).hexdigest()
+        self.file = os.path.join(index_dir, key + ".npz") if index_dir else None
+        if not self._load():
+            self._build()
+            self._save()
+
+    @staticmethod
+    def current_signature(path: str) -> List[int]:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load(self) -> bool:
+        if self.file is None:
+            return False
+        try:
+            with np.load(self.file) as stored:
+                if stored["signature"].tolist() != self.signature:
+                    return False
+                self.offsets = stored["offsets"]
+                self.rows = int(stored["rows"])
+                self.header_end = int(stored["header_end"])
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def _save(self) -> None:
+        if self.file is None:
+            return
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        tmp = self.file + ".tmp.npz"
+        np.savez(tmp, signature=np.array(self.signature, dtype=np.int64), offsets=self.offsets,
+                 rows=self.rows, header_end=self.header_end)
+        os.replace(tmp, self.file)
+
+    def _build(self) -> None:
+        scanner = RecordScanner()
+        starts: List[np.ndarray] = []
+        ends_seen = 0  # record ends found so far, the header's included
+        last_end = 0
+        with open(self.path, "rb") as f, self._map(f) as mm:
+            for position in range(0, self.size, SCAN_BLOCK):
+                ends = scanner.end_offsets(memoryview(mm)[position:position + SCAN_BLOCK]) + position
+                if ends.size:
+                    # record end number j (1-based) is where data row j - 1 starts
+                    numbers = np.arange(ends_seen + 1, ends_seen + ends.size + 1) - 1
+                    starts.append(ends[numbers % self.stride == 0])
+                    ends_seen += ends.size
+                    last_end = int(ends[-1])
+        self.header_end = int(starts[0][0]) if ends_seen else self.size
+        # the last row may lack a newline; a start at the very end of the file is no row
+        self.rows = max(ends_seen - 1, 0) + (1 if ends_seen and last_end < self.size else 0)
+        offsets = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        self.offsets = offsets[offsets < self.size].astype(np.int64)
+
+    def _map(self, f) -> mmap.mmap:
+        if self.size == 0:
+            raise ValueError(f"'{self.path}' is empty")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _span(self, mm: mmap.mmap, row: int, count: int) -> Tuple[int, int]:
+        """Byte range of rows [row, row + count), found from the nearest indexed offset."""
+        if row >= self.rows:
+            return self.size, self.size
+        base = int(self.offsets[row // self.stride])
+        skip = row % self.stride
+        needed = skip + count
+        window = SEEK_WINDOW
+        while True:
+            # a row start is never inside quotes, so every scan starts fresh
+            ends = RecordScanner().end_offsets(memoryview(mm)[base:base + window]) + base
+            if ends.size >= needed or base + window >= self.size:
+                break
+            window *= 2
+        start = base if skip == 0 else int(ends[skip - 1]) if skip <= ends.size else self.size
+        end = int(ends[needed - 1]) if needed <= ends.size else self.size
+        return start, end
+
+    def header(self, mm: mmap.mmap) -> bytes:
+        return mm[:self.header_end]
+
+    def read(self, start: int, stop: int) -> bytes:
+        """The header plus rows [start, stop) as CSV bytes."""
+        stop = min(stop, self.rows)
+        with open(self.path, "rb") as f, self._map(f) as mm:
+            if start >= stop:
+                return self.header(mm)
+            low, high = self._span(mm, start, stop - start)
+            return self.header(mm) + mm[low:high]
+
+    def take(self, rows: np.ndarray) -> bytes:
+        """The header plus the given rows (ascending), each read on its own."""
+        with open(self.path, "rb") as f, self._map(f) as mm:
+            parts = [self.header(mm)]
+            for row in rows:
+                low, high = self._span(mm, int(row), 1)
+                line = mm[low:high]
+                parts.append(line if line.endswith(b"\n") else line + b"\n")
+        return b"".join(parts)
+
+
+def parse_rows(raw: bytes, first_row: int = 0, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Parse CSV bytes from RowIndex.read/take, labelled with their row numbers in the file."""
+    frame = pd.read_csv(io.BytesIO(raw))
+    labels = rows if rows is not None else np.arange(first_row, first_row + len(frame))
+    if len(labels) == len(frame):  # blank lines, which pandas skips, would shift the numbering
+        frame.index = labels
+    return frame
@@ -0,0 +1,164 @@
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# "2h 22m", "1h", "45m"
+DURATION_PATTERN = r"^\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?\s*$"
+# ISO dates ("2025-04-01", optionally with a time) and US-style "4/1/2025"
+DATE_PATTERN = re.compile(r"^\s*(\d{4}-\d{1,2}-\d{1,2}([ T]\d{1,2}:\d{2}(:\d{2})?)?|\d{1,2}/\d{1,2}/\d{2,4})\s*$")
+
+
+class SchemaOptimizer:
+    """
+    Infer compact dtypes for a freshly parsed DataFrame.
+
+    - integer columns are downcast to the smallest signed width holding their range
+    - float columns become float32 only when that round-trips every value exactly
+    - duration strings ("2h 22m") become integer minutes, date strings datetime64
+    - strings with few distinct values (<= categorical_ratio of the rows) become categoricals
+    """
+    def __init__(self, categorical_ratio: float = 0.5, sample_size: int = 100):
+        self.categorical_ratio = categorical_ratio
+        self.sample_size = sample_size
+        self.changes: List[Dict[str, Any]] = []
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def optimize(self, data: pd.DataFrame) -> pd.DataFrame:
+        self.changes = []
+        before = data.memory_usage(deep=True)
+        self.bytes_before = int(before.sum())
+        columns = {}
+        for name in data.columns:
+            series = data[name]
+            converted, kind = self._convert(series)
+            if kind:
+                self.changes.append({
+                    "column": name,
+                    "from": str(series.dtype),
+                    "to": str(converted.dtype),
+                    "conversion": kind,
+                    "bytes_before": int(before[name]),
+                    "bytes_after": int(converted.memory_usage(index=False, deep=True)),
+                })
+            columns[name] = converted
+        optimized = pd.DataFrame(columns, index=data.index)
+        self.bytes_after = int(optimized.memory_usage(deep=True).sum())
+        return optimized
+
+    def _convert(self, series: pd.Series):
+        """Return (converted series, conversion name) or (series, None) when nothing applies."""
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return series, None
+        if isinstance(dtype, np.dtype) and dtype.kind == "i":
+            converted = pd.to_numeric(series, downcast="integer")
+            return (converted, "downcast") if converted.dtype != dtype else (series, None)
+        if isinstance(dtype, np.dtype) and dtype.kind == "f":
+            if dtype.itemsize > 4:
+                narrow = series.astype("float32")
+                if np.array_equal(narrow.to_numpy(dtype="float64"), series.to_numpy(), equal_nan=True):
+                    return narrow, "downcast"
+            return series, None
+        if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+            return series, None
+
+        non_null = series.dropna()
+        if non_null.empty:
+            return series, None
+        sample = non_null.head(self.sample_size).astype(str)
+        if sample.str.match(DURATION_PATTERN).all() and sample.str.contains(r"\d").all():
+            converted = self._parse_duration(series)
+            if converted is not None:
+                return converted, "duration->minutes"
+        if sample.map(lambda value: bool(DATE_PATTERN.match(value))).all():
+            parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+            if parsed.isnull().sum() == series.isnull().sum():
+                return parsed, "date"
+        distinct = non_null.nunique()
+        if distinct <= self.categorical_ratio * len(series):
+            return series.astype("category"), "categorical"
+        return series, None
+
+    @staticmethod
+    def _parse_duration(series: pd.Series):
+        parts = series.astype("object").where(series.notnull()).str.extract(DURATION_PATTERN)
+        matched = parts.notnull().any(axis=1)
+        if (matched != series.notnull()).any():
+            return None  # some values outside the sample are not durations
+        hours = pd.to_numeric(parts[0]).fillna(0)
+        minutes = pd.to_numeric(parts[1]).fillna(0)
+        total = (hours * 60 + minutes).where(matched)
+        if total.isnull().any():
+            return total.astype("Int32")
+        return pd.to_numeric(total.astype("int64"), downcast="integer")
+
+    @staticmethod
+    def conform(rows: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give freshly parsed `rows` the dtypes of an already optimized frame, so appending
+        them keeps its compact schema. A value that does not fit a narrowed dtype leaves
+        its column as parsed; the append then widens the column instead.
+        """
+        columns = {}
+        for name in rows.columns:
+            series = rows[name]
+            if name in like.columns and series.dtype != like[name].dtype:
+                series = SchemaOptimizer._conform_series(series, like[name].dtype)
+            columns[name] = series
+        return pd.DataFrame(columns, index=rows.index)
+
+    @staticmethod
+    def _conform_series(series: pd.Series, dtype) -> pd.Series:
+        if isinstance(dtype, pd.CategoricalDtype):
+            return series  # categories are unioned when the rows are appended
+        textual = pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+        if textual and pd.api.types.is_datetime64_any_dtype(dtype):
+            parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+            if parsed.isnull().sum() != series.isnull().sum():
+                return series
+            series = parsed
+        elif textual and pd.api.types.is_integer_dtype(dtype):
+            parsed = SchemaOptimizer._parse_duration(series)
+            if parsed is None:
+                return series
+            series = parsed
+        elif not pd.api.types.is_numeric_dtype(series.dtype):
+            return series
+        try:
+            narrow = series.astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            return series
+        if pd.api.types.is_numeric_dtype(dtype):
+            # int8/float32 etc. only when every value survives the round trip
+            before = series.to_numpy(dtype="float64", na_value=np.nan)
+            if not np.array_equal(narrow.to_numpy(dtype="float64", na_value=np.nan), before, equal_nan=True):
+                return series
+        return narrow
+
+    def state(self) -> Dict[str, Any]:
+        """What report() is built from, JSON-serializable (stored with cached frames)."""
+        return {"changes": self.changes, "bytes_before": self.bytes_before, "bytes_after": self.bytes_after}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.changes = state.get("changes", [])
+        self.bytes_before = state.get("bytes_before", 0)
+        self.bytes_after = state.get("bytes_after", 0)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-column conversions plus a total row, sizes in KiB."""
+        rows = [{
+            "column": change["column"],
+            "conversion": f"{change['from']} -> {change['to']} ({change['conversion']})",
+            "before_kib": round(change["bytes_before"] / 1024, 1),
+            "after_kib": round(change["bytes_after"] / 1024, 1),
+        } for change in self.changes]
+        rows.append({
+            "column": "TOTAL",
+            "conversion": f"{len(self.changes)} column(s) converted",
+            "before_kib": round(self.bytes_before / 1024, 1),
+            "after_kib": round(self.bytes_after / 1024, 1),
+        })
+        return rows
@@ -0,0 +1,235 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from printer import Printer
+
+TOKEN_PATTERN = r"\w+"
+# Sorts after every real character, so [prefix, prefix + _MAX_CHAR) covers all strings with that prefix
+_MAX_CHAR = "\U0010ffff"
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    """Plain numpy values of a column; categoricals and string dtypes become object arrays."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+        return series.astype(object).to_numpy()
+    return series.to_numpy()
+
+
+class HashIndex:
+    """Value -> row positions, for O(1) exact lookups."""
+    def __init__(self, series: pd.Series):
+        self.positions: Dict[Any, np.ndarray] = series.groupby(series, observed=True, sort=False).indices
+
+    def exact(self, value: Any) -> np.ndarray:
+        return self.positions.get(value, np.empty(0, dtype="int64"))
+
+
+class SortedIndex:
+    """Non-null values sorted once, so exact, prefix and range lookups are binary searches."""
+    def __init__(self, series: pd.Series):
+        values = _values(series)
+        positions = np.flatnonzero(series.notnull().to_numpy())
+        values = values[positions]
+        if values.dtype == object:
+            # mixed types cannot be ordered; compare their text form instead
+            if not all(isinstance(v, str) for v in values[:1000]):
+                values = values.astype(str)
+        order = np.argsort(values, kind="stable")
+        self.sorted_values = values[order]
+        self.positions = positions[order]
+
+    def range(self, low: Any = None, high: Any = None) -> np.ndarray:
+        """Positions with low <= value <= high (either bound may be None)."""
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, side="left")
+        stop = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, side="right")
+        return self.positions[start:stop]
+
+    def exact(self, value: Any) -> np.ndarray:
+        return self.range(value, value)
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        start = np.searchsorted(self.sorted_values, prefix, side="left")
+        stop = np.searchsorted(self.sorted_values, prefix + _MAX_CHAR, side="left")
+        return self.positions[start:stop]
+
+
+class TokenIndex:
+    """
+    Inverted index from lower-cased word tokens to sorted row positions.
+
+    Full-text queries intersect the posting lists of their tokens. Substring
+    queries scan the token vocabulary (far smaller than the rows) and union
+    the postings of every token containing the fragment; a fragment spanning
+    several tokens ("dark kn") is checked against the text of the candidate rows.
+    """
+    def __init__(self, series: pd.Series):
+        # lower-cased cell text by row position, None when missing
+        present = series.notnull().to_numpy()
+        self.texts = np.full(len(series), None, dtype=object)
+        self.texts[present] = series[present].astype(str).str.lower().to_numpy(dtype=object)
+        tokens = series.dropna().astype(str).str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        positions = series.index.get_indexer(tokens.index)
+        postings = pd.Series(positions, index=tokens.to_numpy()).groupby(level=0, sort=True)
+        self.postings: Dict[str, np.ndarray] = {token: np.unique(group.to_numpy()) for token, group in postings}
+        self.vocabulary = np.array(sorted(self.postings), dtype=object)
+
+    def search_all(self, query: str) -> np.ndarray:
+        """Rows containing every token of the query."""
+        terms = re.findall(TOKEN_PATTERN, query.lower())
+        if not terms:
+            return np.empty(0, dtype="int64")
+        # intersect the shortest posting lists first
+        lists = sorted((self.postings.get(term, np.empty(0, dtype="int64")) for term in terms), key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def _token_substring(self, fragment: str) -> np.ndarray:
+        matches = [self.postings[token] for token in self.vocabulary if fragment in token]
+        if not matches:
+            return np.empty(0, dtype="int64")
+        return np.unique(np.concatenate(matches))
+
+    def search_substring(self, fragment: str) -> np.ndarray:
+        """Rows whose text contains `fragment` (case-insensitive)."""
+        fragment = fragment.lower().strip()
+        if re.fullmatch(TOKEN_PATTERN, fragment):
+            return self._token_substring(fragment)
+        # spans token boundaries: every word piece is inside some token of a matching row
+        pieces = re.findall(TOKEN_PATTERN, fragment)
+        candidates = np.arange(len(self.texts))
+        for piece in sorted(pieces, key=len, reverse=True):
+            candidates = np.intersect1d(candidates, self._token_substring(piece), assume_unique=True)
+        texts = self.texts[candidates]
+        found = np.fromiter((text is not None and fragment in text for text in texts), dtype=bool, count=len(texts))
+        return candidates[found]
+
+
+class Searcher:
+    """Search actions over the loaded dataset; indexes are built on first use and cached."""
+    def __init__(self, data, indexes: Optional[Dict[Tuple, Any]] = None) -> None:
+        self.printer = Printer().printer
+        self.data = data
+        self.max_results = 20
+        self.data_output_style = "table"
+        # may be shared by several searchers over the same frame (see server.py)
+        self._indexes: Dict[Tuple, Any] = indexes if indexes is not None else {}
+
+    def index(self, column: str, kind: str):
+        """Return the cached index of `kind` ('hash', 'sorted' or 'token') for `column`."""
+        series = self.data[column]
+        # the dtype and length are part of the key so rewritten columns get a fresh index
+        key = (column, kind, str(series.dtype), len(series))
+        if key not in self._indexes:
+            builder = {"hash": HashIndex, "sorted": SortedIndex, "token": TokenIndex}[kind]
+            self._indexes[key] = builder(series)
+        return self._indexes[key]
+
+    def _coerce(self, column: str, raw: str) -> Any:
+        """Convert user input to the column's value type."""
+        series = self.data[column]
+        if pd.api.types.is_bool_dtype(series):
+            return raw.strip().lower() in ("true", "1", "yes")
+        if pd.api.types.is_integer_dtype(series):
+            number = float(raw)
+            return int(number) if number.is_integer() else number
+        if pd.api.types.is_numeric_dtype(series):
+            return float(raw)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return pd.Timestamp(raw).to_datetime64()
+        return raw
+
+    def _column(self, column: Optional[str], prompt: str) -> Optional[str]:
+        if column is None:
+            column = input(prompt).strip()
+        if column not in self.data.columns:
+            self.printer(f"Column '{column}' not found.", "error")
+            return None
+        return column
+
+    def _show(self, positions: np.ndarray, description: str) -> List[Dict[str, Any]]:
+        positions = np.sort(positions)
+        result = self.data.iloc[positions[:self.max_results]].to_dict('records')
+        shown = min(len(positions), self.max_results)
+        self.printer(f"{len(positions)} row(s) {description} (showing {shown}):", "info")
+        if result:
+            self.printer(result, self.data_output_style)
+        return result
+
+    def find_exact(self, column: Optional[str] = None, value: Optional[str] = None):
+        """Rows where column == value (e.g. Name or PlayerId)."""
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        column = self._column(column, "Enter column name to search: ")
+        if column is None:
+            return
+        if value is None:
+            value = input("Enter value to look up: ").strip()
+        try:
+            key = self._coerce(column, value)
+        except ValueError:
+            self.printer(f"'{value}' is not a valid value for column '{column}'.", "error")
+            return
+        positions = self.index(column, "hash").exact(key)
+        return self._show(positions, f"where {column} == {value}")
+
+    def find_prefix(self, column: Optional[str] = None, prefix: Optional[str] = None):
+        """Rows whose text value in column starts with prefix."""
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        column = self._column(column, "Enter text column name to search: ")
+        if column is None:
+            return
+        if pd.api.types.is_numeric_dtype(self.data[column]) or pd.api.types.is_datetime64_any_dtype(self.data[column]):
+            self.printer(f"Column '{column}' is not a text column.", "error")
+            return
+        if prefix is None:
+            prefix = input("Enter prefix: ").strip()
+        positions = self.index(column, "sorted").prefix(prefix)
+        return self._show(positions, f"where {column} starts with '{prefix}'")
+
+    def find_range(self, column: Optional[str] = None, low: Optional[str] = None, high: Optional[str] = None):
+        """Rows with low <= column <= high; a blank bound is open (e.g. Rating >= 8.8)."""
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        column = self._column(column, "Enter column name for the range query: ")
+        if column is None:
+            return
+        if low is None:
+            low = input("Enter lower bound (press Enter for none): ").strip()
+        if high is None:
+            high = input("Enter upper bound (press Enter for none): ").strip()
+        try:
+            low_key = self._coerce(column, low) if low else None
+            high_key = self._coerce(column, high) if high else None
+        except ValueError:
+            self.printer(f"Bounds must be valid values for column '{column}'.", "error")
+            return
+        positions = self.index(column, "sorted").range(low_key, high_key)
+        return self._show(positions, f"with {low or '-inf'} <= {column} <= {high or 'inf'}")
+
+    def text_search(self, column: Optional[str] = None, query: Optional[str] = None, mode: Optional[str] = None):
+        """Full-text (all words) or substring search over a text column such as Title."""
+        if self.data.empty:
+            self.printer("No data loaded.", "error")
+            return
+        column = self._column(column, "Enter text column name to search: ")
+        if column is None:
+            return
+        if query is None:
+            query = input("Enter search text: ").strip()
+        if mode is None:
+            mode = input("Match all words or substring? [words/substring] (default words): ").strip() or "words"
+        token_index = self.index(column, "token")
+        if mode.startswith("s"):
+            positions = token_index.search_substring(query)
+        else:
+            positions = token_index.search_all(query)
+        return self._show(positions, f"matching '{query}' in {column}")
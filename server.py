@@ -0,0 +1,354 @@
+"""
+Local analysis server: each dataset is loaded once and kept in memory, and the View,
+Analyze and Search menu actions are served to any number of clients over HTTP/JSON.
+
+Example:
+    python server.py --port 8765 --preload data/
+    curl -s localhost:8765/actions
+    curl -s localhost:8765/run -d '{"dataset": "2025_hitting_leaders", "action": "group_analysis",
+        "params": {"group_col": "Team", "agg_col": "HR", "sort_by": "HR.mean", "top_n": "5"}}'
+
+Endpoints:
+    GET  /health      uptime, requests served, result cache counters
+    GET  /actions     every action with its parameters
+    GET  /datasets    loaded datasets
+    POST /datasets    {"path": "data/x.csv"} loads a dataset (a no-op when it is loaded already)
+    POST /run         {"dataset": name or path, "action": name, "params": {...}, "approximate": false}
+
+Actions take their parameters from "params" instead of prompting; a missing one is an
+error naming the prompt. The asyncio loop only parses requests: loading and actions run
+on a thread pool, so the loaded frames and the result cache are shared without copies.
+Frames are never modified in place (pandas copy-on-write keeps derived views separate).
+
+The workers are threads, so they run in parallel only while pandas and numpy release
+the GIL (parsing, sorting, vectorized arithmetic). Actions spending their time in
+Python loops, such as group-by over many keys or column profiling, are serialized,
+and one slow request of that kind delays the others.
+"""
+import argparse
+import asyncio
+import builtins
+import contextlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from analyzer import Analyzer
+from batch import collect_files
+from main import DataAnalysis
+from memo import ResultCache
+from menu_selector import MenuSelector
+from prefetch import quiet_loader
+from printer import to_jsonable
+from profiling import ProfileStore
+from search import Searcher
+from viewer import Viewer
+
+# Menu sections served, and the class each section's actions run on
+SECTIONS: Dict[str, type] = {"View": Viewer, "Analyze": Analyzer, "Search": Searcher}
+# Would change state every client shares (approximate mode is a per-request flag instead), or
+# depend on state a fresh per-request Viewer does not have: page with jump_to_row's "row" instead
+EXCLUDED_ACTIONS = {"toggle_approximate", "next_page", "prev_page"}
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+RESULT_CACHE_BYTES = 512 * 1024 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class MissingParameter(Exception):
+    """Raised in place of an input() prompt: server actions get every parameter up front."""
+
+
+# input() raises MissingParameter in threads running a server action and prompts as usual elsewhere
+_prompts = threading.local()
+_input_lock = threading.Lock()
+_input_users = 0
+_real_input = builtins.input
+
+
+def _input(prompt: str = "") -> str:
+    if getattr(_prompts, "disabled", False):
+        raise MissingParameter(f"Missing parameter: the action asked '{prompt.strip()}'")
+    return _real_input(prompt)
+
+
+@contextlib.contextmanager
+def no_prompts():
+    """input() raises MissingParameter in this thread for the duration; builtins.input is restored after the last user."""
+    global _input_users, _real_input
+    with _input_lock:
+        if _input_users == 0:
+            _real_input = builtins.input
+            builtins.input = _input
+        _input_users += 1
+    _prompts.disabled = True
+    try:
+        yield
+    finally:
+        _prompts.disabled = False
+        with _input_lock:
+            _input_users -= 1
+            if _input_users == 0:
+                builtins.input = _real_input
+
+
+def discover_actions() -> Dict[str, Dict[str, Any]]:
+    """name -> {"section", "method", "params"} for every served @menu action of DataAnalysis."""
+    menu = MenuSelector()
+    menu.discover(DataAnalysis)
+    actions: Dict[str, Dict[str, Any]] = {}
+    for section, owner in SECTIONS.items():
+        for label, func in menu.actions_in_section(section):
+            if label in EXCLUDED_ACTIONS or not hasattr(owner, func.__name__):
+                continue
+            method = getattr(owner, func.__name__)
+            params = [{"name": p.name, "default": None if p.default is inspect.Parameter.empty else p.default}
+                      for p in list(inspect.signature(method).parameters.values())[1:]]
+            actions[label] = {"section": section, "method": func.__name__, "params": params}
+    return actions
+
+
+class Dataset:
+    """A loaded frame shared by all requests, with the search indexes built over it so far."""
+    def __init__(self, name: str, path: str, data, seconds: float) -> None:
+        self.name = name
+        self.path = path
+        self.data = data
+        self.seconds = seconds
+        self.indexes: Dict[Tuple, Any] = {}
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "path": self.path, "rows": len(self.data), "columns": len(self.data.columns),
+                "load_seconds": round(self.seconds, 3)}
+
+
+class AnalysisServer:
+    """Datasets loaded once per server, actions run on `pool`, results memoized in one shared cache."""
+    def __init__(self, workers: Optional[int] = None, use_cache: bool = True, optimize: bool = True,
+                 cache_bytes: int = RESULT_CACHE_BYTES) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="action")
+        self.load = quiet_loader(use_cache, optimize)
+        self.use_cache = use_cache
+        self.results = ResultCache(max_bytes=cache_bytes)
+        self.actions = discover_actions()
+        self.datasets: Dict[str, Future] = {}  # absolute path -> Future[Dataset]
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+
+    def dataset_future(self, path: str) -> Future:
+        """The (possibly still loading) dataset at `path`; concurrent requests share one load."""
+        key = os.path.abspath(path)
+        with self._lock:
+            future = self.datasets.get(key)
+            if future is None:
+                if not os.path.isfile(path):
+                    raise RequestError(404, f"File '{path}' not found.")
+                future = self.pool.submit(self._load, path)
+                self.datasets[key] = future
+        return future
+
+    def _load(self, path: str) -> Dataset:
+        started = time.perf_counter()
+        data = self.load(path)
+        names = {future.result().name for future in list(self.datasets.values())
+                 if future.done() and future.exception() is None}
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in names:
+            name = f"{name}_{len(names)}"
+        return Dataset(name, os.path.abspath(path), data, time.perf_counter() - started)
+
+    def loaded(self) -> List[Dataset]:
+        return [future.result() for future in list(self.datasets.values())
+                if future.done() and future.exception() is None]
+
+    def find_dataset(self, name: str) -> Future:
+        for dataset in self.loaded():
+            if dataset.name == name:
+                return self.datasets[dataset.path]
+        if os.path.isfile(name):
+            return self.dataset_future(name)
+        raise RequestError(404, f"Dataset '{name}' is not loaded; POST /datasets with its path first.")
+
+    def run_action(self, dataset: Dataset, name: str, params: Dict[str, Any], approximate: bool) -> Dict[str, Any]:
+        """Worker-thread body of POST /run: a fresh, quiet action object over the shared frame."""
+        spec = self.actions[name]
+        errors: List[str] = []
+        warnings: List[str] = []
+
+        def capture(message, output_type="plain"):
+            if output_type == "error":
+                errors.append(str(message))
+            elif output_type == "warning":
+                warnings.append(str(message))
+
+        if spec["section"] == "Analyze":
+            target = Analyzer(dataset.data, results=self.results, approximate=approximate, source=dataset.path,
+                              profiles=ProfileStore() if self.use_cache else None)
+        elif spec["section"] == "Search":
+            target = Searcher(dataset.data, indexes=dataset.indexes)
+        else:
+            target = Viewer(dataset.data)
+        target.printer = capture
+        action = getattr(target, spec["method"])
+        try:
+            inspect.signature(action).bind(**params)
+        except TypeError as e:
+            raise RequestError(400, f"Bad parameters for '{name}': {e}") from None
+        started = time.perf_counter()
+        try:
+            with no_prompts():
+                result = action(**params)
+        except MissingParameter as e:
+            raise RequestError(400, str(e)) from None
+        return {"dataset": dataset.name, "action": name, "ok": not errors,
+                "seconds": round(time.perf_counter() - started, 6), "errors": errors, "warnings": warnings,
+                "result": to_jsonable(result)}
+
+    async def handle(self, method: str, path: str, body: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        if path == "/health":
+            return {"uptime_seconds": round(time.time() - self.started, 1), "requests": self.requests,
+                    "datasets": len(self.loaded()), "workers": self.workers,
+                    "result_cache": {"entries": len(self.results), "bytes": self.results.bytes,
+                                     "hits": self.results.hits, "misses": self.results.misses}}
+        if path == "/actions":
+            return self.actions
+        if path == "/datasets" and method == "GET":
+            return [dataset.describe() for dataset in self.loaded()]
+        if path == "/datasets" and method == "POST":
+            if not isinstance(body.get("path"), str):
+                raise RequestError(400, "Expected {\"path\": \"<csv file>\"}.")
+            dataset = await asyncio.wrap_future(self.dataset_future(body["path"]), loop=loop)
+            return dataset.describe()
+        if path == "/run" and method == "POST":
+            name = body.get("action")
+            if name not in self.actions:
+                raise RequestError(404, f"Unknown action '{name}'. Available: {', '.join(self.actions)}")
+            params = body.get("params") or {}
+            if not isinstance(params, dict) or not isinstance(body.get("dataset"), str):
+                raise RequestError(400, "Expected {\"dataset\": ..., \"action\": ..., \"params\": {...}}.")
+            dataset = await asyncio.wrap_future(self.find_dataset(body["dataset"]), loop=loop)
+            return await loop.run_in_executor(self.pool, self.run_action, dataset, name, params,
+                                              bool(body.get("approximate", False)))
+        if path in ("/datasets", "/run"):
+            raise RequestError(405, f"{method} is not supported on {path}.")
+        raise RequestError(404, f"No endpoint {path}.")
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """HTTP/1.1 with keep-alive: requests on one connection are answered in order."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, raw = request
+                self.requests += 1
+                try:
+                    body = json.loads(raw) if raw.strip() else {}
+                    if not isinstance(body, dict):
+                        raise RequestError(400, "The request body must be a JSON object.")
+                    status, payload = 200, await self.handle(method, path.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError as e:
+                    status, payload = 400, {"error": f"Invalid JSON: {e}"}
+                except Exception as e:
+                    status, payload = 500, {"error": f"Error while executing action: {e}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except RequestError as e:
+            _write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise RequestError(400, "Malformed request line.") from None
+    headers: Dict[str, str] = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = header.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0") or 0)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Request bodies are limited to {MAX_BODY_BYTES} bytes.")
+    raw = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, raw
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+    body = json.dumps(to_jsonable(payload)).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+
+
+async def serve(server: AnalysisServer, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                socket_path: Optional[str] = None, ready: Optional[Callable[[str], None]] = None) -> None:
+    if socket_path:
+        listener = await asyncio.start_unix_server(server.serve_connection, path=socket_path)
+        address = socket_path
+    else:
+        listener = await asyncio.start_server(server.serve_connection, host, port)
+        address = "http://%s:%d" % listener.sockets[0].getsockname()[:2]
+    if ready is not None:
+        ready(address)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve analysis actions over HTTP/JSON with datasets kept in memory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--preload", nargs="*", default=[], help="CSV files and/or folders to load at start-up")
+    parser.add_argument("--workers", type=int, default=None, help="worker threads (default: CPU count)")
+    parser.add_argument("--cache-mb", type=int, default=RESULT_CACHE_BYTES // (1024 * 1024),
+                        help="size of the shared result cache")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk column cache")
+    parser.add_argument("--no-optimize", action="store_true", help="skip schema inference at load time")
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer(workers=args.workers, use_cache=not args.no_cache, optimize=not args.no_optimize,
+                            cache_bytes=args.cache_mb * 1024 * 1024)
+    for path in collect_files(args.preload):
+        server.dataset_future(path)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.socket,
+                          ready=lambda address: print(f"Serving {len(server.actions)} actions on {address}")))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
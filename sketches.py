@@ -0,0 +1,369 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from accumulators import RunningStats
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_NULL_HASH = np.uint64(0x5851F42D4C957F2D)
+# Values sorted per KLL compaction and row hashes probed per Bloom batch: bounds the temporaries
+QUANTILE_BATCH = 8192
+BLOOM_BATCH = 65536
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """64-bit hashes of a Series/DataFrame's non-index content (one per row)."""
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def mix64(hashes: np.ndarray) -> np.ndarray:
+    """A second, independent-looking hash derived from the first (splitmix64 finalizer)."""
+    z = hashes * _MIX
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _leading_zeros(words: np.ndarray) -> np.ndarray:
+    """Exact count of leading zero bits of non-zero uint64 values, via two exact 32-bit halves."""
+    high = (words >> np.uint64(32)).astype("float64")
+    low = (words & np.uint64(0xFFFFFFFF)).astype("float64")
+    with np.errstate(divide="ignore"):
+        high_bits = np.floor(np.log2(high))
+        low_bits = np.floor(np.log2(low))
+    return np.where(high > 0, 31 - high_bits, 63 - low_bits).astype("uint8")
+
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**precision registers; relative standard error 1.04 / sqrt(m)."""
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype="uint8")
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if hashes.size == 0:
+            return
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype("int64")
+        # a guard bit keeps the remaining word non-zero so the rank is bounded
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        ranks = _leading_zeros(rest) + 1
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.registers.size)
+
+    def estimate(self) -> int:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype("int64"))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))  # linear counting for small cardinalities
+        return int(round(raw))
+
+
+class QuantileSketch:
+    """
+    KLL-style mergeable quantile sketch over numeric values.
+
+    Items live in a hierarchy of compactors; an item at level h stands for 2**h
+    inputs. Normalized rank error is roughly 2.296 / k**0.9723 (about 1.3% at k=200).
+    """
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype="float64")]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: Any) -> None:
+        """Add values QUANTILE_BATCH at a time, so no compaction sorts more than about a batch."""
+        arr = np.asarray(values, dtype="float64")
+        arr = arr[~np.isnan(arr)]
+        for start in range(0, arr.size, QUANTILE_BATCH):
+            batch = arr[start:start + QUANTILE_BATCH]
+            self.count += int(batch.size)
+            self.levels[0] = np.concatenate([self.levels[0], batch])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype="float64"))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype="float64"))
+                items = np.sort(items)
+                # an odd leftover stays behind so no weight is lost
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                survivors = paired[int(self._rng.integers(2))::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], survivors])
+            level += 1
+
+    @property
+    def rank_error(self) -> float:
+        return 2.296 / self.k ** 0.9723
+
+    def quantiles(self, qs: List[float]) -> List[Optional[float]]:
+        if self.count == 0:
+            return [None for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype="float64")
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        total = cumulative[-1]
+        return [float(values[min(np.searchsorted(cumulative, q * total, side="left"), len(values) - 1)])
+                for q in qs]
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent-items summary with `capacity` counters.
+
+    Every reported count is a lower bound and undercounts by at most `error`,
+    so true counts lie in [count, count + error]. Summaries merge exactly.
+    Each batch is counted with one factorize, added to the counters and the
+    counters are cut back to `capacity` in one vectorized step.
+    """
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.values = pd.Index([])
+        self.counts = np.empty(0, dtype="int64")
+        self.error = 0
+        self.total = 0
+
+    def update(self, series: pd.Series) -> None:
+        codes, uniques = pd.factorize(series)
+        self.add_counts(uniques, np.bincount(codes[codes >= 0], minlength=len(uniques)))
+
+    def add_counts(self, values: Any, counts: np.ndarray) -> None:
+        """Add a batch already counted: distinct `values` seen `counts` times each."""
+        self.total += int(counts.sum())
+        self._absorb(pd.Index(values), counts)
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.error += other.error
+        self.total += other.total
+        self._absorb(other.values, other.counts)
+
+    def _absorb(self, values: pd.Index, counts: np.ndarray) -> None:
+        codes, uniques = pd.factorize(self.values.append(values))
+        totals = np.bincount(codes, weights=np.concatenate([self.counts, counts]), minlength=len(uniques))
+        totals = totals.astype("int64")
+        if len(totals) > self.capacity:
+            # subtract the (capacity+1)-th largest count from every counter and drop the non-positive ones
+            cut = int(np.partition(totals, len(totals) - self.capacity - 1)[len(totals) - self.capacity - 1])
+            self.error += cut
+            kept = totals > cut
+            uniques, totals = uniques[kept], totals[kept] - cut
+        self.values, self.counts = pd.Index(uniques), totals
+
+    def top(self, k: int = 10) -> Dict[Any, int]:
+        order = np.argsort(-self.counts, kind="stable")[:k]
+        return dict(zip(self.values[order].tolist(), self.counts[order].tolist()))
+
+
+class BloomFilter:
+    """
+    Bloom filter over 64-bit row hashes, used to estimate duplicate rows.
+
+    Sized for `capacity` distinct items at `false_positive_rate`. Duplicates are
+    counted as rows whose hash was (probably) seen before; false positives can
+    only inflate that count. Merged filters estimate distinct rows from the
+    fraction of bits set instead.
+    """
+    def __init__(self, capacity: int = 1_000_000, false_positive_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.num_bits = max(64, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype="uint8")
+        self.rows = 0
+        self.duplicates = 0
+        self.expected_false_positives = 0.0
+        self.merged = False
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        second = mix64(hashes) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype="uint64")
+        return ((hashes[:, None] + steps[None, :] * second[:, None]) % np.uint64(self.num_bits)).astype("int64")
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        self.rows += int(hashes.size)
+        unique = np.unique(hashes)
+        self.duplicates += int(hashes.size - unique.size)  # repeats inside the batch are exact
+        if unique.size == 0:
+            return
+        if self.rows > hashes.size:
+            # probes against an already populated filter may collide
+            self.expected_false_positives += self.current_false_positive_rate() * unique.size
+        # the position matrix is BLOOM_BATCH x num_hashes at most
+        for start in range(0, unique.size, BLOOM_BATCH):
+            positions = self._positions(unique[start:start + BLOOM_BATCH])
+            present = (self.bits[positions >> 3] >> (positions & 7).astype("uint8")) & 1
+            self.duplicates += int(np.count_nonzero(present.all(axis=1)))
+            flat = positions.ravel()
+            np.bitwise_or.at(self.bits, flat >> 3, (np.uint8(1) << (flat & 7).astype("uint8")))
+
+    def merge(self, other: "BloomFilter") -> None:
+        if other.num_bits != self.num_bits or other.num_hashes != self.num_hashes:
+            raise ValueError("Bloom filters must share size and hash count to merge.")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        self.rows += other.rows
+        self.duplicates += other.duplicates
+        self.merged = True
+
+    def fill_ratio(self) -> float:
+        # bits past num_bits in the last byte are never set
+        return int(np.bitwise_count(self.bits).sum()) / self.num_bits
+
+    def current_false_positive_rate(self) -> float:
+        return self.fill_ratio() ** self.num_hashes
+
+    def estimate_distinct(self) -> int:
+        fill = min(self.fill_ratio(), 1 - 1e-12)
+        return int(round(-self.num_bits / self.num_hashes * math.log(1 - fill)))
+
+    def estimate_duplicates(self) -> int:
+        if self.merged:
+            return max(0, self.rows - self.estimate_distinct())
+        return self.duplicates
+
+    def duplicate_error(self) -> float:
+        """
+        Error bound of estimate_duplicates(): the expected number of false-positive
+        duplicates for a sequentially filled filter, or the standard error of the
+        bit-count distinct estimate for merged filters.
+        """
+        if not self.merged:
+            return self.expected_false_positives
+        load = self.num_hashes * self.estimate_distinct() / self.num_bits
+        return math.sqrt(self.num_bits * (math.exp(load) - 1 - load)) / self.num_hashes
+
+
+class FrameSketch:
+    """
+    Approximate, mergeable summary of a DataFrame fed in one or more chunks:
+    per-column HyperLogLog distinct counts, Misra-Gries top values and KLL
+    quantiles for numeric columns, exact null counts, and a Bloom filter over
+    row hashes for duplicate estimation.
+    """
+    def __init__(self, expected_rows: int = 1_000_000, precision: int = 12, k: int = 200, top_capacity: int = 64):
+        self.expected_rows = expected_rows
+        self.precision = precision
+        self.k = k
+        self.top_capacity = top_capacity
+        self.rows = 0
+        self.nulls: Dict[str, int] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.top: Dict[str, HeavyHitters] = {}
+        self.quantiles: Dict[str, QuantileSketch] = {}
+        self.moments: Dict[str, RunningStats] = {}
+        self.row_filter = BloomFilter(expected_rows)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a chunk in. Each column is factorized once: the codes give the null and
+        value counts, only the distinct values are hashed (HyperLogLog ignores repeats),
+        and row hashes for the Bloom filter are combined from those column hashes.
+        """
+        self.rows += len(chunk)
+        row_hashes = np.zeros(len(chunk), dtype="uint64")
+        for col in chunk.columns:
+            series = chunk[col]
+            if col not in self.distinct:
+                self.nulls[col] = 0
+                self.distinct[col] = HyperLogLog(self.precision)
+                self.top[col] = HeavyHitters(self.top_capacity)
+            codes, uniques = pd.factorize(series)
+            present = codes >= 0
+            self.nulls[col] += int(len(codes) - np.count_nonzero(present))
+            hashes = hash_values(pd.Series(uniques))
+            self.distinct[col].add_hashes(hashes)
+            self.top[col].add_counts(uniques, np.bincount(codes[present], minlength=len(uniques)))
+            # code -1 (null) picks the trailing null hash
+            row_hashes = mix64(row_hashes ^ np.append(hashes, _NULL_HASH)[codes])
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                values = series.to_numpy(dtype="float64", na_value=np.nan)
+                self.quantiles.setdefault(col, QuantileSketch(self.k)).update(values)
+                self.moments.setdefault(col, RunningStats()).update(values)
+        if len(chunk):
+            self.row_filter.add_hashes(row_hashes)
+
+    def merge(self, other: "FrameSketch") -> None:
+        self.rows += other.rows
+        for col in other.distinct:
+            if col not in self.distinct:
+                self.nulls[col] = other.nulls[col]
+                self.distinct[col], self.top[col] = other.distinct[col], other.top[col]
+                continue
+            self.nulls[col] += other.nulls[col]
+            self.distinct[col].merge(other.distinct[col])
+            self.top[col].merge(other.top[col])
+        for col, sketch in other.quantiles.items():
+            if col in self.quantiles:
+                self.quantiles[col].merge(sketch)
+                self.moments[col].merge(other.moments[col])
+            else:
+                self.quantiles[col] = sketch
+                self.moments[col] = other.moments[col]
+        self.row_filter.merge(other.row_filter)
+
+    def quality_report(self) -> Dict[str, Any]:
+        return {
+            "total_rows": self.rows,
+            "total_columns": len(self.distinct),
+            "missing_values": dict(self.nulls),
+            "missing_percentages": {
+                col: (count / self.rows) * 100 if self.rows else 0.0 for col, count in self.nulls.items()
+            },
+            "duplicate_rows": {
+                "estimate": self.row_filter.estimate_duplicates(),
+                "error": round(self.row_filter.duplicate_error(), 1),
+            },
+            "unique_values": {col: hll.estimate() for col, hll in self.distinct.items()},
+            "unique_values_relative_error": round(1.04 / math.sqrt(1 << self.precision), 4),
+        }
+
+    def distribution(self, col: str) -> Dict[str, Any]:
+        top = self.top[col]
+        sketch = self.quantiles.get(col)
+        percentiles = [0.25, 0.5, 0.75, 0.9, 0.99]
+        values = sketch.quantiles(percentiles) if sketch else [None] * len(percentiles)
+        top_values = top.top(10)
+        best = max(top_values.values()) if top_values else None
+        return {
+            "value_counts": top_values,
+            "value_counts_max_undercount": top.error,
+            "basic_stats": {
+                "mean": self.moments[col].mean if sketch else None,
+                "median": values[1],
+                "percentiles": {f"p{int(q * 100)}": v for q, v in zip(percentiles, values)},
+                "percentile_rank_error": round(sketch.rank_error, 4) if sketch else None,
+                # exact only when no counter was ever decremented
+                "mode": [value for value, count in top_values.items() if count == best],
+                "unique_values": self.distinct[col].estimate(),
+                "unique_values_relative_error": round(self.distinct[col].relative_error, 4),
+                "null_count": self.nulls[col],
+            },
+        }
@@ -0,0 +1,45 @@
+"""
+Start-up phase timing for `main.py --startup-timing`. main imports this module
+first, so the clock starts right after the interpreter itself is up.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+_STARTED = time.perf_counter()
+# CPU time the interpreter spent before running main (site, encodings, ...)
+_INTERPRETER_CPU = time.process_time()
+
+
+class StartupTimer:
+    """Consecutive start-up phases; time spent waiting for the user is listed but not counted."""
+    def __init__(self) -> None:
+        self.phases: List[Dict[str, object]] = [
+            {"phase": "interpreter (CPU)", "ms": round(_INTERPRETER_CPU * 1000, 1), "counted": True}]
+        self._last = _STARTED
+
+    def mark(self, name: str) -> None:
+        """Close the phase that ran since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append({"phase": name, "ms": round((now - self._last) * 1000, 1), "counted": True})
+        self._last = now
+
+    @contextmanager
+    def excluded(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last = time.perf_counter()
+            self.phases.append({"phase": name, "ms": round((self._last - started) * 1000, 1), "counted": False})
+
+    def report(self, printer: Callable) -> List[Dict[str, object]]:
+        rows, total = [], 0.0
+        for phase in self.phases:
+            if phase["counted"]:
+                total += phase["ms"]
+            rows.append({"phase": phase["phase"], "ms": phase["ms"],
+                         "total_ms": round(total, 1) if phase["counted"] else "(excluded)"})
+        printer("Start-up timing:", "info")
+        printer(rows, "table")
+        return rows
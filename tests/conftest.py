@@ -0,0 +1,29 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def imdb_csv(tmp_path, monkeypatch):
+    """A private copy of data/imdb_top_movies.csv; caches go under tmp_path/.cache."""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "imdb_top_movies.csv"
+    shutil.copy(os.path.join(ROOT, "data", "imdb_top_movies.csv"), path)
+    return str(path)
+
+
+@pytest.fixture
+def imdb_large_csv(tmp_path, monkeypatch):
+    """imdb_top_movies.csv with its rows repeated ten times (about 450 KB, many 64 KB blocks)."""
+    monkeypatch.chdir(tmp_path)
+    with open(os.path.join(ROOT, "data", "imdb_top_movies.csv"), "r", encoding="utf-8") as f:
+        header, *rows = f.read().splitlines(keepends=True)
+    path = tmp_path / "imdb_large.csv"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header + "".join(rows) * 10)
+    return str(path)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from accumulators import FrameAccumulator, HashSet
+from main import DataAnalysis
+
+
+def test_streamed_exact_summary_matches_in_memory(imdb_large_csv):
+    streamed = DataAnalysis(imdb_large_csv, chunksize=100, use_cache=False, exact_distinct=True).analyzer
+    in_memory = DataAnalysis(imdb_large_csv, use_cache=False).analyzer
+    assert streamed.check_data_quality() == in_memory.check_data_quality()
+    for col in ("Duration", "Title"):
+        ours, theirs = streamed.analyze_distribution(col), in_memory.analyze_distribution(col)
+        # values tied at the tenth count may be cut differently
+        assert sorted(ours["value_counts"].values()) == sorted(theirs["value_counts"].values())
+        counts = in_memory.data[col].value_counts()
+        assert all(counts[value] == count for value, count in ours["value_counts"].items())
+        for stat in ("unique_values", "null_count", "mode"):
+            assert ours["basic_stats"][stat] == theirs["basic_stats"][stat]
+
+
+def test_streamed_estimated_summary_is_within_error_bounds(imdb_large_csv):
+    streamed = DataAnalysis(imdb_large_csv, chunksize=100, use_cache=False).analyzer
+    in_memory = DataAnalysis(imdb_large_csv, use_cache=False).analyzer
+    ours, exact = streamed.check_data_quality(), in_memory.check_data_quality()
+    assert ours["missing_values"] == exact["missing_values"]
+    assert abs(ours["duplicate_rows"]["estimate"] - exact["duplicate_rows"]) <= ours["duplicate_rows"]["error"] + 1
+    bound = 3 * ours["unique_values_relative_error"]
+    for col, count in exact["unique_values"].items():
+        assert ours["unique_values"][col] == pytest.approx(count, rel=bound)
+
+
+def test_hash_set_counts_distinct_hashes():
+    hashes = np.random.default_rng(0).integers(0, 5000, 40_000).astype("uint64")
+    whole, halves = HashSet(), [HashSet(), HashSet()]
+    for start in range(0, len(hashes), 700):
+        whole.add(hashes[start:start + 700])
+        halves[start * 2 // len(hashes)].add(hashes[start:start + 700])
+    halves[0].merge(halves[1])
+    for merged in (whole, halves[0]):
+        assert len(merged) == np.unique(hashes).size
+        assert np.array_equal(np.sort(np.concatenate(merged.runs)), np.unique(hashes))
+    # runs stay few: each is more than twice the size of the next
+    assert len(whole.runs) <= np.log2(np.unique(hashes).size) + 1
+
+
+def test_merged_accumulators_match_one_pass():
+    frame = pd.DataFrame({"a": np.arange(3000) % 400, "b": np.arange(3000) % 3})
+    one_pass, first, second = FrameAccumulator(), FrameAccumulator(), FrameAccumulator()
+    one_pass.update(frame)
+    first.update(frame.iloc[:1000])
+    second.update(frame.iloc[1000:])
+    first.merge(second)
+    assert first.quality_report() == one_pass.quality_report()
+    assert one_pass.duplicate_rows == int(frame.duplicated().sum())
+    with pytest.raises(ValueError):
+        first.merge(FrameAccumulator(exact=False))
@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import batch
+from main import DataAnalysis
+
+
+@pytest.fixture
+def two_files(imdb_csv, tmp_path):
+    """imdb_top_movies.csv and a copy holding only its first 100 movies."""
+    with open(imdb_csv, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    shorter = tmp_path / "top100.csv"
+    shorter.write_text("".join(lines[:101]), encoding="utf-8")
+    return [imdb_csv, str(shorter)]
+
+
+def test_batch_results_match_interactive_runs(two_files, tmp_path):
+    actions = [batch.parse_action(["group_analysis", "group_col=Year:50", "agg_col=Duration", "sort_by=count",
+                                   "top_n=2"]),
+               batch.parse_action(["correlation_analysis", "method=pearson", "top_k=all"]),
+               batch.parse_action(["analyze_distribution", "col_name=Nope"])]
+    out = str(tmp_path / "out")
+    summaries = batch.run_batch(two_files, actions, out, workers=2, options={"use_cache": False})
+    assert [summary["file"] for summary in summaries] == sorted(two_files)
+    for summary, path in zip(summaries, sorted(two_files)):
+        assert not summary["ok"]  # the unknown column is reported, not raised
+        with open(summary["output"], "r", encoding="utf-8") as f:
+            report = json.load(f)
+        analyzer = DataAnalysis(path, use_cache=False).analyzer
+        assert report["rows"] == len(analyzer.data)
+        grouped, correlations, missing = report["actions"]
+        assert grouped["ok"] and correlations["ok"]
+        expected = analyzer.group_analysis(group_col="Year:50", agg_col="Duration", sort_by="count", top_n="2")
+        assert grouped["result"] == json.loads(json.dumps({str(k): v for k, v in expected.items()}))
+        assert correlations["result"] == json.loads(json.dumps(analyzer.correlation_analysis(method="pearson",
+                                                                                             top_k="all")))
+        assert missing["errors"] == ["Column 'Nope' not found."]
+
+
+def test_collect_files_and_command_line(two_files, tmp_path, capsys):
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    for path in two_files:
+        shutil.copy(path, folder)
+    (folder / "notes.txt").write_text("not a csv")
+    assert [os.path.basename(f) for f in batch.collect_files([str(folder)])] == ["imdb_top_movies.csv",
+                                                                               "top100.csv"]
+    out = str(tmp_path / "cli")
+    assert batch.main([str(folder), "--action", "analyze", "--out", out, "--workers", "1", "--no-cache"]) == 0
+    assert sorted(os.listdir(out)) == ["imdb_top_movies.json", "top100.json"]
+    with pytest.raises(SystemExit):
+        batch.main([str(folder), "--action", "no_such_action"])
+    with pytest.raises(SystemExit):
+        batch.main([str(folder), "--action", "group_analysis", "group_col"])
@@ -0,0 +1,37 @@
+import json
+import os
+
+import pandas as pd
+
+import benchmark
+
+
+def test_every_benchmark_runs_on_small_generated_data(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    paths = benchmark.generate("bench_data", [300], sorted(benchmark.SCHEMAS))
+    for path in paths:
+        assert len(pd.read_csv(path)) == 300
+    report = benchmark.run("bench_data", "results/run.json", repeat=1)
+    names = {key.split("/")[1] for key in report["results"]}
+    assert {"load_data", "group_analysis", "correlation_analysis", "rolling_statistics",
+            "query_rows_from_file", "print_records_table"} <= names
+    assert all(result["seconds"] >= 0 and result["peak_bytes"] >= 0 for result in report["results"].values())
+    with open("results/run.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["results"] == report["results"]
+
+
+def test_compare_flags_time_and_memory_regressions(tmp_path, capsys):
+    def write(name, results):
+        path = os.path.join(tmp_path, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f)
+        return path
+    baseline = write("baseline.json", {"a/x": {"seconds": 1.0, "peak_bytes": 100},
+                                       "a/y": {"seconds": 1.0, "peak_bytes": 100}})
+    same = write("same.json", {"a/x": {"seconds": 1.05, "peak_bytes": 100},
+                               "a/y": {"seconds": 0.5, "peak_bytes": 90}})
+    worse = write("worse.json", {"a/x": {"seconds": 1.0, "peak_bytes": 150}})
+    assert benchmark.compare(baseline, same, threshold=0.1) == 0
+    assert benchmark.compare(baseline, worse, threshold=0.1) == 1
+    out = capsys.readouterr().out
+    assert "MEMORY" in out and "a/y" in out and "missing from current run" in out
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache
+from cache import ColumnCache
+from loader import DataLoader
+
+
+def mixed_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "int": np.arange(5, dtype="int16"),
+        "float": [1.5, np.nan, 3.0, 4.25, 5.0],
+        "flag": [True, False, True, True, False],
+        "when": pd.to_datetime(["2024-01-01", None, "2024-03-01", "2024-04-01", "2024-05-01"]),
+        "team": pd.Categorical(["a", "b", "a", None, "b"], categories=["b", "a"], ordered=True),
+        "text": pd.Series(["x", None, "y", "x", "z"]),
+        "mixed": pd.Series([1, "one", np.nan, 2.5, "one"], dtype=object),  # read_csv leaves NaN, not None
+    })
+
+
+def test_round_trip_keeps_values_and_dtypes(imdb_csv):
+    store = ColumnCache()
+    frame = mixed_frame()
+    store.put(imdb_csv, frame)
+    pd.testing.assert_frame_equal(store.get(imdb_csv), frame)
+    # variants are separate entries
+    assert store.get(imdb_csv, "optimized") is None
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_cached_load_matches_parsed_load(imdb_csv, optimize):
+    parsed = DataLoader(imdb_csv, cache=ColumnCache(), optimize=optimize).load_data()
+    loader = DataLoader(imdb_csv, cache=ColumnCache(), optimize=optimize)
+    pd.testing.assert_frame_equal(loader.load_data(), parsed)
+    assert loader.fingerprint == cache.file_fingerprint(imdb_csv)
+
+
+def test_unchanged_file_is_a_hit_without_hashing(imdb_csv, monkeypatch):
+    store = ColumnCache()
+    store.put(imdb_csv, mixed_frame())
+
+    def no_hashing(path):
+        raise AssertionError("the source was hashed")
+    monkeypatch.setattr(cache, "file_fingerprint", no_hashing)
+    assert ColumnCache().get(imdb_csv) is not None
+
+
+def test_changed_content_is_a_miss_but_a_touch_is_not(imdb_csv):
+    store = ColumnCache()
+    store.put(imdb_csv, mixed_frame())
+    stat = os.stat(imdb_csv)
+    os.utime(imdb_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert ColumnCache().get(imdb_csv) is not None
+    with open(imdb_csv, "r+b") as f:
+        f.write(b"Ronk")  # same size, different bytes
+    os.utime(imdb_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert ColumnCache().get(imdb_csv) is None
+    assert not os.listdir(store.cache_dir)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sources = []
+    for i in range(3):
+        path = tmp_path / f"source{i}.csv"
+        path.write_text(f"a\n{i}\n")
+        sources.append(str(path))
+    frame = pd.DataFrame({"a": np.arange(1000, dtype="int64")})
+    store = ColumnCache(max_bytes=20_000)  # room for two 8 KB entries
+    store.put(sources[0], frame)
+    store.put(sources[1], frame)
+    assert store.get(sources[0]) is not None  # now more recently used than source1
+    store.put(sources[2], frame)
+    assert store.get(sources[1]) is None
+    assert store.get(sources[0]) is not None and store.get(sources[2]) is not None
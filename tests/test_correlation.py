@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import CorrelationEngine
+from main import DataAnalysis
+
+
+@pytest.fixture
+def wide() -> pd.DataFrame:
+    """Ten related numeric columns with missing values in different rows, plus a text column."""
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(500, 1))
+    values = base * np.linspace(-1, 1, 10) + rng.normal(size=(500, 10))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    frame = pd.DataFrame(values, columns=[f"c{i}" for i in range(10)])
+    frame["label"] = "x"
+    return frame
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 64])
+def test_blocked_matrix_matches_pandas(wide, block_size):
+    ours = CorrelationEngine(wide, block_size=block_size, workers=2).matrix()
+    pd.testing.assert_frame_equal(ours, wide.drop(columns="label").corr(), rtol=1e-9, atol=1e-12)
+
+
+def test_spearman_matches_pandas_without_missing_values(wide):
+    complete = wide.drop(columns="label").fillna(0.0)
+    ours = CorrelationEngine(complete, method="spearman", block_size=4).matrix()
+    pd.testing.assert_frame_equal(ours, complete.corr(method="spearman"), rtol=1e-9, atol=1e-12)
+
+
+def test_top_pairs_are_the_strongest_of_the_matrix(wide):
+    expected = wide.drop(columns="label").corr()
+    upper = expected.where(np.triu(np.ones(expected.shape, dtype=bool), k=1)).stack()
+    strongest = upper.abs().sort_values(ascending=False)
+    pairs = CorrelationEngine(wide, block_size=3).top_pairs(k=5)
+    assert [(pair["column_a"], pair["column_b"]) for pair in pairs] == list(strongest.index[:5])
+    for pair in pairs:
+        assert pair["r"] == pytest.approx(expected.loc[pair["column_a"], pair["column_b"]], abs=1e-12)
+        assert pair["n"] == int(wide[[pair["column_a"], pair["column_b"]]].notna().all(axis=1).sum())
+    threshold = float(strongest.iloc[2] + strongest.iloc[3]) / 2
+    assert len(CorrelationEngine(wide).top_pairs(k=50, threshold=threshold)) == 3
+
+
+def test_correlation_analysis_on_imdb(imdb_csv):
+    analyzer = DataAnalysis(imdb_csv, use_cache=False).analyzer
+    matrix = analyzer.correlation_analysis(method="pearson", top_k="all")
+    expected = analyzer.data.select_dtypes(include="number").corr().round(2).to_dict("index")
+    assert matrix == expected
+    pairs = analyzer.correlation_analysis(method="spearman", top_k="2", threshold="0")
+    assert len(pairs) == 2 and abs(pairs[0]["r"]) >= abs(pairs[1]["r"])
@@ -0,0 +1,71 @@
+import pstats
+import time
+
+import pytest
+
+from diagnostics import Diagnostics
+from main import DataAnalysis
+from phases import phase
+
+
+def run(app, label):
+    """Call a menu action the way the menu dispatches it."""
+    return app.diagnostics.wrap(label, app.menu.find(label))()
+
+
+def test_menu_actions_are_recorded_with_rows_and_phases(imdb_csv):
+    app = DataAnalysis(imdb_csv, use_cache=False)
+    run(app, "analyze")
+    record = app.diagnostics.records[-1]
+    assert record["action"] == "analyze" and record["ok"]
+    assert record["rows"] == 250
+    assert sum(record["phases"].values()) == pytest.approx(record["wall"], abs=1e-3)
+    assert record["phases"]["print"] > 0
+    # tracing and profiling are opt-in
+    assert record["peak_bytes"] is None and not app.diagnostics.profiles
+
+
+def test_streamed_actions_report_the_rows_read(imdb_csv):
+    app = DataAnalysis(imdb_csv, chunksize=50, use_cache=False)
+    run(app, "analyze")
+    record = app.diagnostics.records[-1]
+    assert record["rows"] == 250
+    assert record["phases"]["load"] > 0
+
+
+def test_memory_and_profiles_when_asked_for(imdb_csv, tmp_path):
+    app = DataAnalysis(imdb_csv, use_cache=False, profile=True, trace_memory=True)
+    for _ in range(2):
+        run(app, "analyze")
+    assert all(record["peak_bytes"] > 0 for record in app.diagnostics.records)
+    path = str(tmp_path / "actions.prof")
+    dumped = app.diagnostics.dump_profile(count="2", path=path)
+    assert dumped["invocations"] == ["analyze", "analyze"]
+    assert any(name == "analyze" for _, _, name in pstats.Stats(path).stats)
+    stats = app.diagnostics.action_stats()
+    assert stats[0]["action"] == "analyze" and stats[0]["calls"] == 2 and stats[0]["peak_mib"] is not None
+
+
+def test_failures_are_recorded_and_raised():
+    diagnostics = Diagnostics(rows=lambda: 7)
+
+    def broken():
+        raise RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        diagnostics.wrap("broken", broken)()
+    assert diagnostics.records[-1]["ok"] is False and diagnostics.records[-1]["rows"] == 7
+    assert diagnostics.recent_actions("many") is None
+    assert diagnostics.wrap("hidden", broken, section="Diagnostics") is broken
+
+
+def test_phases_are_exclusive():
+    def action():
+        with phase("load"):
+            time.sleep(0.02)
+            with phase("print"):
+                time.sleep(0.03)
+    diagnostics = Diagnostics()
+    diagnostics.invoke("nested", action)
+    phases = diagnostics.records[-1]["phases"]
+    assert phases["print"] == pytest.approx(0.03, abs=0.015)
+    assert phases["load"] == pytest.approx(0.02, abs=0.015)
@@ -0,0 +1,29 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from groupby import order_groups
+
+
+@pytest.fixture
+def stats():
+    columns = pd.MultiIndex.from_product([["HR", "RBI"], ["mean", "count"]])
+    return pd.DataFrame([[10.0, 2, 50.0, 2], [20.0, 1, 40.0, 1], [5.0, 3, 60.0, 3]],
+                        index=["NYY", "BOS", "LAD"], columns=columns)
+
+
+def test_bare_stat_sorts_by_first_column(stats):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # no PerformanceWarning from partial-key lookups
+        ordered = order_groups(stats, "count")
+    assert ordered.index.tolist() == ["LAD", "NYY", "BOS"]
+
+
+def test_column_stat(stats):
+    assert order_groups(stats, "RBI.mean", top_n=2).index.tolist() == ["LAD", "NYY"]
+
+
+def test_unknown_stat_lists_choices(stats):
+    with pytest.raises(KeyError, match="HR.mean, HR.count, RBI.mean, RBI.count"):
+        order_groups(stats, "median")
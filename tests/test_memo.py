@@ -0,0 +1,36 @@
+import gc
+
+import pandas as pd
+
+from analyzer import Analyzer
+from memo import ResultCache
+
+
+def _frame(value):
+    return pd.DataFrame({"a": [value, value + 1.0, value + 2.0], "b": [1, 2, 3]})
+
+
+def test_replaced_frame_is_not_served_old_results():
+    results = ResultCache()
+    first = Analyzer(_frame(1.0), results=results).analyze()
+    gc.collect()  # the first frame's id() may now be reused by the next one
+    for value in (10.0, 100.0, 1000.0):
+        assert Analyzer(_frame(value), results=results).analyze()["a"]["mean"] == value + 1.0
+    assert first["a"]["mean"] == 2.0
+
+
+def test_frame_changed_in_place_is_recomputed():
+    data = _frame(1.0)
+    analyzer = Analyzer(data, results=ResultCache())
+    assert analyzer.analyze()["a"]["mean"] == 2.0
+    analyzer.data.loc[0, "a"] = 4.0
+    analyzer.mark_data_changed()
+    assert analyzer.analyze()["a"]["mean"] == 3.0
+
+
+def test_analyzers_over_one_frame_share_results():
+    data, results = _frame(1.0), ResultCache()
+    Analyzer(data, results=results).analyze()
+    hits = results.hits
+    Analyzer(data, results=results).analyze()
+    assert results.hits > hits
@@ -0,0 +1,75 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from main import DataAnalysis
+from prefetch import Prefetcher, RecentFiles, quiet_loader
+
+
+@pytest.fixture
+def files(imdb_csv, tmp_path):
+    """imdb_top_movies.csv plus two smaller copies, all in tmp_path."""
+    with open(imdb_csv, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    paths = [imdb_csv]
+    for count in (50, 100):
+        path = tmp_path / f"top{count}.csv"
+        path.write_text("".join(lines[:count + 1]), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_recent_files_come_first(files, tmp_path):
+    recent = RecentFiles(str(tmp_path / "recent.json"))
+    recent.touch(files[2])
+    recent.touch(files[0])
+    ordered = RecentFiles(str(tmp_path / "recent.json")).order(list(reversed(files)))
+    assert ordered == [files[0], files[2], files[1]]
+
+
+def test_budget_limits_what_is_prefetched(files):
+    sizes = [os.path.getsize(path) for path in files]
+    prefetcher = Prefetcher(pd.read_csv, max_bytes=sizes[1] + sizes[2])
+    prefetcher.start(files)
+    assert prefetcher.state(files[0]) == "not prefetched"
+    assert len(prefetcher.get(files[1])) == 50 and prefetcher.state(files[1]) == "ready"
+    assert len(prefetcher.get(files[0])) == 250  # loaded on demand
+
+
+def test_a_queued_file_is_loaded_at_once_instead_of_waiting(files):
+    started, release = threading.Event(), threading.Event()
+
+    def load(path):
+        if path == files[0]:
+            started.set()
+            release.wait(10)
+        return pd.read_csv(path)
+    prefetcher = Prefetcher(load, workers=1)
+    prefetcher.start(files)
+    assert started.wait(10)
+    # the only worker is stuck on the first file; the third is taken over by this thread
+    assert len(prefetcher.get(files[2])) == 100
+    assert prefetcher.state(files[0]) == "loading"
+    release.set()
+    assert len(prefetcher.get(files[0])) == 250
+
+
+def test_failed_loads_are_reported(tmp_path):
+    broken = tmp_path / "broken.csv"
+    broken.write_text("")
+    prefetcher = Prefetcher(pd.read_csv)
+    prefetcher.start([str(broken)])
+    with pytest.raises(Exception):
+        prefetcher.get(str(broken))
+    assert prefetcher.state(str(broken)) == "failed"
+
+
+def test_prefetched_switch_matches_a_direct_load(files):
+    prefetcher = Prefetcher(quiet_loader(True, True))
+    prefetcher.start(files)
+    app = DataAnalysis(files[0], prefetcher=prefetcher)
+    switched = app.switch_dataset(path=files[2])
+    assert switched["rows"] == 100 and prefetcher.state(files[2]) == "ready"
+    pd.testing.assert_frame_equal(app.data, DataAnalysis(files[2], use_cache=False).data)
@@ -0,0 +1,54 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from main import DataAnalysis
+from printer import Printer, Sink, dumps, open_sink, to_jsonable
+
+
+def test_dumps_normalizes_analysis_results():
+    result = {("Team", 2024): {"mean": np.float64(1.5), "count": np.int64(3), "std": float("nan")},
+              "when": pd.Timestamp("2024-01-02"), "values": np.arange(3)}
+    text = dumps(result)
+    assert json.loads(text) == to_jsonable(result) == {
+        "Team.2024": {"mean": 1.5, "count": 3, "std": None}, "when": "2024-01-02T00:00:00", "values": [0, 1, 2]}
+    assert "\n" not in dumps(result, indent=False)
+
+
+def test_file_sinks_round_trip_a_table(imdb_csv, tmp_path):
+    frame = DataAnalysis(imdb_csv, use_cache=False).data.head(30)[["Rank", "Title", "Rating", "Duration"]]
+    paths = [str(tmp_path / name) for name in ("out.ndjson", "out.csv", "out.txt")]
+    sinks = [open_sink(path) for path in paths]
+    printer = Printer(sinks)
+    printer.printer("Top movies:", "info")
+    printer.printer(frame, "table")
+    printer.printer({"rows": 30}, "json")
+    for sink in sinks:
+        sink.close()
+
+    with open(paths[0], "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records[0] == {"type": "info", "message": "Top movies:"}
+    assert [record["data"] for record in records[1:31]] == to_jsonable(frame.to_dict("records"))
+    assert records[31] == {"type": "json", "data": {"rows": 30}}
+
+    read_back = pd.read_csv(paths[1], nrows=30)  # the JSON dict follows as key/value rows
+    pd.testing.assert_frame_equal(read_back, frame.astype({"Title": str}), check_dtype=False)
+
+    with open(paths[2], "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "Top movies:"
+    assert lines[1].split() == ["Rank", "Title", "Rating", "Duration"]
+    assert len(lines) == 1 + 2 + 30 + 3  # message, header and rule, rows, pretty JSON
+
+
+def test_tables_stop_at_a_declined_page():
+    class OnePage(Sink):
+        def _next_page(self):
+            return False
+    out = io.StringIO()
+    Printer([OnePage(out, page_size=60)]).printer(pd.DataFrame({"i": np.arange(100_000)}), "table")
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2 + 60 and lines[-1] == "59"
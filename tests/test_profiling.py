@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from main import DataAnalysis
+from profiling import ProfileStore, profile_frame
+
+
+def tricky_frame() -> pd.DataFrame:
+    """Rows equal up to one column, swapped values across columns, nulls and repeats."""
+    return pd.DataFrame({
+        "a": [1, 2, 1, 2, 1, None, None, 3, 3, 1],
+        "b": [2, 1, 2, 1, 3, None, None, "x", "x", 2],
+        "c": ["u", "u", "u", "u", "u", "v", "v", None, None, "u"],
+    })
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_duplicate_rows_match_pandas(workers):
+    frame = tricky_frame()
+    profile = profile_frame(frame, workers=workers)
+    assert profile.duplicate_rows == int(frame.duplicated().sum()) == 5
+    for col in frame.columns:
+        assert profile.columns[col]["nulls"] == int(frame[col].isnull().sum())
+        assert profile.columns[col]["distinct"] == frame[col].nunique()
+
+
+def test_profile_of_imdb_matches_pandas(imdb_large_csv):
+    analyzer = DataAnalysis(imdb_large_csv, use_cache=False).analyzer
+    data = analyzer.data
+    profile = profile_frame(data)
+    assert profile.rows == len(data)
+    assert profile.duplicate_rows == int(data.duplicated().sum()) == 2250
+    # the same rows once more with one Title changed: one fewer duplicate
+    changed = data.copy()
+    changed["Title"] = changed["Title"].astype(str)
+    changed.loc[len(changed) - 1, "Title"] = "Not a movie"
+    assert profile_frame(changed).duplicate_rows == int(changed.duplicated().sum()) == 2249
+    for col in data.columns:
+        assert profile.columns[col]["distinct"] == data[col].nunique()
+        assert profile.columns[col]["nulls"] == 0
+    assert profile.columns["Duration"]["min"] == int(data["Duration"].min())
+    assert profile.columns["Title"]["max_length"] == int(data["Title"].astype(str).str.len().max())
+
+
+def test_stored_profile_is_reused_until_the_file_changes(imdb_csv):
+    # profiles are persisted under .cache/profiles when the cache is on
+    analyzer = DataAnalysis(imdb_csv).analyzer
+    first = analyzer.data_profile()
+    assert not first.stored
+    again = DataAnalysis(imdb_csv).analyzer.data_profile()
+    assert again.stored
+    assert again.quality_report() == first.quality_report()
+    with open(imdb_csv, "a", encoding="utf-8") as f:
+        f.write("251,Extra,2001,7.0,1h 40m,u,v\n")
+    assert ProfileStore().get(imdb_csv, analyzer.data) is None
+    fresh = DataAnalysis(imdb_csv).analyzer.data_profile()
+    assert not fresh.stored and fresh.rows == 251
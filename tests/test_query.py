@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from loader import DataLoader
+from query import CsvSource, FrameSource, Query
+
+PLANS = [
+    ("Duration > 180", None),
+    ("Duration >= 120 and Year < 1990", ("Rating", False)),
+    ("Rating > 8.5 and Title ~ the", ("Duration", True)),
+]
+
+
+@pytest.mark.parametrize("where, order", PLANS)
+def test_file_and_frame_return_the_same_rows(imdb_large_csv, where, order):
+    data = DataLoader(imdb_large_csv, optimize=True).load_data()
+    for _ in range(2):  # the second scan prunes blocks with the zone map built by the first
+        plans = [Query(FrameSource(data)).where(where), Query(CsvSource(imdb_large_csv, optimize=True)).where(where)]
+        if order:
+            plans = [plan.sort(*order).limit(25) for plan in plans]
+        in_memory, from_file = (plan.collect() for plan in plans)
+        assert len(from_file) > 0
+        pd.testing.assert_frame_equal(from_file.astype(str), in_memory.astype(str))
+
+
+def test_file_pages_have_the_loaded_types(imdb_csv):
+    data = DataLoader(imdb_csv, optimize=True).load_data()
+    page = CsvSource(imdb_csv, optimize=True).slice(10, 20)
+    assert page["Duration"].tolist() == data["Duration"].iloc[10:20].tolist()
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from main import DataAnalysis
+from prefetch import Prefetcher, quiet_loader
+from refresh import APPENDED, RELOAD, UNCHANGED, TailReader
+
+NEW_ROW = "251,New Movie,2025,8.0,2h 0m,https://example.com/,https://example.com/x.jpg\n"
+
+
+def _append(path, line=NEW_ROW):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _edit_first_rating(path):
+    """9.3 -> 1.0 in row 0, keeping the file's length."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text.replace("1994,9.3,", "1994,1.0,", 1))
+
+
+@pytest.fixture(params=["parsed", "cached", "prefetched"])
+def app(request, imdb_large_csv):
+    """The large file opened the three ways a load can happen."""
+    assert os.path.getsize(imdb_large_csv) > 256 * 1024  # row 0 is far from the end
+    if request.param == "parsed":
+        return DataAnalysis(imdb_large_csv, use_cache=False)
+    DataAnalysis(imdb_large_csv)  # fills the column cache
+    if request.param == "cached":
+        return DataAnalysis(imdb_large_csv)
+    prefetcher = Prefetcher(quiet_loader(True, True))
+    prefetcher.start([imdb_large_csv])
+    return DataAnalysis(imdb_large_csv, prefetcher=prefetcher)
+
+
+def test_appends_are_picked_up(app, imdb_large_csv):
+    rows = len(app.data)
+    assert app.refresh_data()["status"] == UNCHANGED
+    for count in (1, 2):
+        _append(imdb_large_csv)
+        result = app.refresh_data()
+        assert (result["status"], result["new_rows"]) == (APPENDED, 1)
+        assert len(app.data) == rows + count
+
+
+def test_edit_far_from_the_end_reloads(app, imdb_large_csv):
+    assert app.data.loc[0, "Rating"] == 9.3
+    _edit_first_rating(imdb_large_csv)
+    _append(imdb_large_csv)
+    result = app.refresh_data()
+    assert result["status"] == RELOAD
+    assert app.data.loc[0, "Rating"] == 1.0
+    assert len(app.data) == result["rows"]
+
+
+def test_edit_after_an_append_reloads(app, imdb_large_csv):
+    _append(imdb_large_csv)
+    assert app.refresh_data()["status"] == APPENDED
+    _edit_first_rating(imdb_large_csv)
+    assert app.refresh_data()["status"] == RELOAD
+
+
+def test_without_a_fingerprint_a_changed_file_reloads(imdb_large_csv):
+    tail = TailReader(imdb_large_csv)
+    tail.baseline(2500, ["Rank", "Title", "Year", "Rating", "Duration", "IMDb URL", "Image URL"])
+    _append(imdb_large_csv)
+    assert tail.refresh() == (RELOAD, None)
+
+
+def test_row_without_newline_is_completed_by_the_append(imdb_csv):
+    with open(imdb_csv, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        f.truncate()  # drop the final newline
+    app = DataAnalysis(imdb_csv, use_cache=False)
+    rows = len(app.data)
+    _append(imdb_csv, "\n" + NEW_ROW)
+    result = app.refresh_data()
+    assert (result["status"], len(app.data)) == (APPENDED, rows + 1)
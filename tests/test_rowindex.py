@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rowindex import RowIndex, parse_rows
+
+
+@pytest.fixture
+def quoted_csv(tmp_path, monkeypatch):
+    """Quoted fields holding newlines and commas, CRLF line ends and no newline at the end."""
+    monkeypatch.chdir(tmp_path)
+    frame = pd.DataFrame({"id": np.arange(60),
+                          "note": [f'line {i}\nnext, "quoted"' if i % 4 == 0 else f"plain {i}" for i in range(60)],
+                          "value": np.arange(60) * 0.5})
+    path = tmp_path / "quoted.csv"
+    path.write_bytes(frame.to_csv(index=False, lineterminator="\r\n").encode().rstrip(b"\r\n"))
+    return str(path)
+
+
+@pytest.mark.parametrize("stride", [1, 7, 1024])
+def test_pages_match_iloc(imdb_large_csv, stride):
+    expected = pd.read_csv(imdb_large_csv)
+    index = RowIndex(imdb_large_csv, stride=stride)
+    assert index.rows == len(expected)
+    for start, stop in ((0, 10), (5, 23), (stride * 2 - 1, stride * 2 + 2), (2490, 2510)):
+        page = parse_rows(index.read(start, stop), first_row=start)
+        pd.testing.assert_frame_equal(page, expected.iloc[start:stop])
+    past_end = parse_rows(index.read(2600, 2610), first_row=2600)
+    assert past_end.empty and list(past_end.columns) == list(expected.columns)
+    rows = np.array([0, 1, stride, 999, 2499])
+    pd.testing.assert_frame_equal(parse_rows(index.take(rows), rows=rows), expected.iloc[rows])
+
+
+def test_quoted_newlines_and_missing_final_newline(quoted_csv):
+    expected = pd.read_csv(quoted_csv)
+    index = RowIndex(quoted_csv, stride=4)
+    assert index.rows == len(expected) == 60
+    pd.testing.assert_frame_equal(parse_rows(index.read(0, 60)), expected)
+    pd.testing.assert_frame_equal(parse_rows(index.read(55, 60), first_row=55), expected.iloc[55:])
+    rows = np.array([3, 4, 8, 59])
+    pd.testing.assert_frame_equal(parse_rows(index.take(rows), rows=rows), expected.iloc[rows])
+
+
+def test_index_is_stored_and_rebuilt_when_the_file_changes(imdb_csv, monkeypatch):
+    first = RowIndex(imdb_csv, stride=16)
+    with monkeypatch.context() as patch:
+        patch.setattr(RowIndex, "_build", lambda self: pytest.fail("the stored index was not used"))
+        again = RowIndex(imdb_csv, stride=16)
+    np.testing.assert_array_equal(again.offsets, first.offsets)
+    with open(imdb_csv, "a", encoding="utf-8") as f:
+        f.write("251,Extra,2001,7.0,1h 40m,u,v\n")
+    grown = RowIndex(imdb_csv, stride=16)
+    assert grown.rows == first.rows + 1
+    assert parse_rows(grown.read(250, 251), first_row=250).at[250, "Title"] == "Extra"
@@ -0,0 +1,16 @@
+import pandas as pd
+
+from search import TokenIndex
+
+TITLES = pd.Series(["The Dark Knight", "The Dark Knight Rises", None, "Spider-Man: No Way Home", "Dark City"])
+
+
+def test_substring_within_a_token():
+    assert TokenIndex(TITLES).search_substring("knig").tolist() == [0, 1]
+
+
+def test_substring_spanning_tokens():
+    index = TokenIndex(TITLES)
+    assert index.search_substring("Dark Kn").tolist() == [0, 1]
+    assert index.search_substring("man: no").tolist() == [3]
+    assert index.search_substring("Knight Dark").tolist() == []
@@ -0,0 +1,51 @@
+import asyncio
+import builtins
+import http.client
+import json
+import threading
+
+import pytest
+
+from server import AnalysisServer, serve
+
+REAL_INPUT = builtins.input
+
+
+@pytest.fixture
+def address(imdb_csv):
+    """host, port of a server on a free port with the imdb copy loaded."""
+    server = AnalysisServer(workers=2, use_cache=False)
+    server.dataset_future(imdb_csv).result()
+    ready = threading.Event()
+    bound = {}
+
+    def on_ready(url):
+        bound["url"] = url
+        ready.set()
+
+    threading.Thread(target=lambda: asyncio.run(serve(server, port=0, ready=on_ready)), daemon=True).start()
+    assert ready.wait(10)
+    host, port = bound["url"].rsplit("/", 1)[1].split(":")
+    return host, int(port)
+
+
+def _post(address, path, body):
+    connection = http.client.HTTPConnection(*address, timeout=30)
+    connection.request("POST", path, json.dumps(body))
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_run_action(address, imdb_csv):
+    status, reply = _post(address, "/run", {"dataset": "imdb_top_movies", "action": "group_analysis",
+                                            "params": {"group_col": "Year:50", "agg_col": "Duration",
+                                                       "sort_by": "count", "top_n": "1"}})
+    assert status == 200 and reply["ok"]
+    assert list(reply["result"].values())[0]["count"] == 120
+
+
+def test_missing_parameter_is_an_error_and_input_is_left_alone(address):
+    status, reply = _post(address, "/run", {"dataset": "imdb_top_movies", "action": "preview_column",
+                                            "params": {}})
+    assert status == 400 and "Missing parameter" in reply["error"]
+    assert builtins.input is REAL_INPUT
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sketches
+from main import DataAnalysis
+from sketches import FrameSketch, HeavyHitters, QuantileSketch
+
+
+@pytest.fixture
+def apps(imdb_large_csv):
+    """The ten-times file streamed into sketches, sketched in memory, and summarized exactly."""
+    return (DataAnalysis(imdb_large_csv, chunksize=100, use_cache=False, approximate=True),
+            DataAnalysis(imdb_large_csv, use_cache=False, approximate=True),
+            DataAnalysis(imdb_large_csv, use_cache=False))
+
+
+def test_streamed_quality_report_is_within_error_bounds(apps):
+    streamed, in_memory, exact = (app.analyzer.check_data_quality() for app in apps)
+    assert streamed["total_rows"] == exact["total_rows"] == 2500
+    assert streamed["missing_values"] == exact["missing_values"]
+    # every row repeats, so the Bloom filter sees each distinct row before its copies
+    duplicates = streamed["duplicate_rows"]
+    assert abs(duplicates["estimate"] - exact["duplicate_rows"]) <= duplicates["error"] + 1
+    bound = 3 * streamed["unique_values_relative_error"]
+    for col, count in exact["unique_values"].items():
+        assert streamed["unique_values"][col] == pytest.approx(count, rel=bound)
+    # HyperLogLog registers do not depend on how the rows were chunked
+    assert streamed["unique_values"] == in_memory["unique_values"]
+
+
+def test_streamed_distribution_is_within_error_bounds(apps):
+    streamed = apps[0].analyzer.analyze_distribution("Duration")
+    column = apps[2].analyzer.data["Duration"]
+    counts = column.value_counts()
+    undercount = streamed["value_counts_max_undercount"]
+    for value, count in streamed["value_counts"].items():
+        assert count <= counts[value] <= count + undercount
+    stats = streamed["basic_stats"]
+    assert stats["mean"] == pytest.approx(column.mean())
+    ordered = np.sort(column.to_numpy())
+    for name, value in stats["percentiles"].items():
+        q = int(name[1:]) / 100
+        low, high = (np.searchsorted(ordered, value, side=side) / len(ordered) for side in ("left", "right"))
+        assert low - stats["percentile_rank_error"] <= q <= high + stats["percentile_rank_error"]
+
+
+def test_heavy_hitters_bound_true_counts():
+    values = pd.Series(np.random.default_rng(0).zipf(1.5, 20_000) % 500)
+    exact = values.value_counts()
+    hitters = HeavyHitters(capacity=32)
+    for start in range(0, len(values), 1000):
+        hitters.update(values.iloc[start:start + 1000])
+    merged = HeavyHitters(capacity=32)
+    for half in (values.iloc[:10_000], values.iloc[10_000:]):
+        part = HeavyHitters(capacity=32)
+        part.update(half)
+        merged.merge(part)
+    for summary in (hitters, merged):
+        assert summary.total == len(values)
+        assert summary.error <= len(values) / (summary.capacity + 1)
+        for value, count in summary.top(10).items():
+            assert count <= exact[value] <= count + summary.error
+        assert next(iter(summary.top(1))) == exact.index[0]
+
+
+def test_batches_do_not_change_exact_parts(monkeypatch):
+    frame = pd.DataFrame({"a": np.arange(3000) % 700, "b": (np.arange(3000) % 7).astype(str)})
+    whole = FrameSketch(expected_rows=len(frame))
+    whole.update(frame)
+    monkeypatch.setattr(sketches, "BLOOM_BATCH", 64)
+    monkeypatch.setattr(sketches, "QUANTILE_BATCH", 100)
+    batched = FrameSketch(expected_rows=len(frame))
+    batched.update(frame)
+    assert batched.row_filter.rows == whole.row_filter.rows == 3000
+    assert batched.row_filter.duplicates == whole.row_filter.duplicates == 3000 - 700
+    assert batched.quality_report()["unique_values"] == whole.quality_report()["unique_values"]
+    quantiles = QuantileSketch()
+    quantiles.update(frame["a"])
+    assert quantiles.count == batched.quantiles["a"].count == 3000
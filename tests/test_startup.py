@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+from main import DataAnalysis
+from startup import StartupTimer
+
+
+def test_importing_main_does_not_load_pandas_or_the_subsystems():
+    code = ("import sys, main; "
+            "print(sorted(m for m in ('pandas', 'numpy', 'analyzer', 'cache', 'viewer', 'search') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_subsystems_are_built_on_first_use(imdb_csv):
+    app = DataAnalysis(imdb_csv, use_cache=False, background=True)
+    # the menu exists before the data is needed
+    assert app.menu.find("analyze") is not None
+    assert app._analyzer is None and app._viewer is None and app._searcher is None
+    assert len(app.data) == 250
+    assert app.analyzer is app.analyzer and app._viewer is None
+
+
+def test_waiting_for_input_is_not_counted():
+    timer = StartupTimer()
+    timer.mark("imports")
+    with timer.excluded("waiting for file choice"):
+        pass
+    timer.mark("setup")
+    rows = timer.report(lambda message, output_type="plain": None)
+    assert [row["phase"] for row in rows] == ["interpreter (CPU)", "imports", "waiting for file choice", "setup"]
+    assert rows[2]["total_ms"] == "(excluded)"
+    counted = [row["ms"] for row in rows if row["total_ms"] != "(excluded)"]
+    assert rows[-1]["total_ms"] == round(sum(counted), 1)
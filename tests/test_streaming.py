@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from main import DataAnalysis
+
+
+@pytest.fixture
+def apps(imdb_csv):
+    """The same file streamed in 50-row chunks and loaded in memory, both schema-optimized."""
+    return (DataAnalysis(imdb_csv, chunksize=50, use_cache=False, profile=False),
+            DataAnalysis(imdb_csv, use_cache=False, profile=False))
+
+
+def test_streamed_group_analysis_matches_in_memory(apps):
+    # Duration is parsed from "2h 22m" to minutes by the schema optimizer
+    streamed, in_memory = (app.analyzer.group_analysis(group_col="Year:50", agg_col="Duration", sort_by="",
+                                                       top_n="") for app in apps)
+    assert streamed == in_memory
+    assert all(group["count"] > 0 for group in streamed.values())
+
+
+def test_streamed_analyze_matches_in_memory(apps):
+    streamed, in_memory = (app.analyzer.analyze() for app in apps)
+    assert streamed.keys() == in_memory.keys()
+    for stat in ("count", "mean", "min", "max"):
+        assert streamed["Duration"][stat] == pytest.approx(in_memory["Duration"][stat])
+
+
+def test_chunks_after_a_cache_hit_use_the_cached_schema(imdb_csv, capsys):
+    from cache import ColumnCache
+    from loader import DataLoader
+    DataLoader(imdb_csv, cache=ColumnCache(), optimize=True).load_data()
+    capsys.readouterr()
+    loader = DataLoader(imdb_csv, cache=ColumnCache(), optimize=True)
+    data = loader.load_data()
+    assert "Memory usage after schema inference" in capsys.readouterr().out
+    for chunk in loader.iter_chunks(50):
+        # as cached, not as inferred from the first 50 rows (Rank 1-50 would fit int8)
+        for name in ("Rank", "Year", "Duration"):
+            assert chunk[name].dtype == data[name].dtype
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from main import DataAnalysis
+
+
+@pytest.fixture
+def imdb(imdb_csv):
+    """The in-memory analyzer and the raw file indexed by 1 January of each Year."""
+    analyzer = DataAnalysis(imdb_csv, use_cache=False).analyzer
+    raw = pd.read_csv(imdb_csv)
+    raw["Duration"] = analyzer.data["Duration"].to_numpy()  # "2h 22m" as parsed to minutes
+    raw.index = pd.to_datetime(raw["Year"].astype(str), format="%Y")
+    return analyzer, raw
+
+
+@pytest.fixture
+def scores_csv(tmp_path, monkeypatch):
+    """Daily scores of two teams over different date ranges, with gaps and missing values."""
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    frames = []
+    for team, start, days in (("red", "2023-01-05", 400), ("blue", "2023-03-20", 250)):
+        dates = pd.date_range(start, periods=days, freq="D")
+        frame = pd.DataFrame({"Date": dates.strftime("%Y-%m-%d"), "Team": team,
+                              "Score": rng.normal(50, 10, days).round(2)})
+        frame.loc[rng.random(days) < 0.1, "Score"] = np.nan
+        frames.append(frame[rng.random(days) < 0.7])  # whole days (and some months) missing
+    path = tmp_path / "scores.csv"
+    pd.concat(frames).sample(frac=1, random_state=0).to_csv(path, index=False)
+    return str(path)
+
+
+def test_yearly_resample_matches_pandas(imdb):
+    analyzer, raw = imdb
+    ours = pd.DataFrame(analyzer.resample_time_series(date_col="Year", freq="Y", columns="Rating,Duration",
+                                                      aggs="mean,sum,count,max", by=""))
+    theirs = raw.resample("YS")[["Rating", "Duration"]].agg(["mean", "sum", "count", "max"])
+    assert ours["period"].tolist() == theirs.index.strftime("%Y-%m-%d").tolist()
+    for col, agg in theirs.columns:
+        np.testing.assert_allclose(ours[f"{col}.{agg}"], theirs[(col, agg)].astype(float), rtol=1e-9)
+
+
+def test_yearly_rolling_matches_pandas(imdb):
+    analyzer, raw = imdb
+    ours = pd.DataFrame(analyzer.rolling_statistics(date_col="Year", column="Rating", freq="Y", agg="mean",
+                                                    window="3", stats="mean,sum,std,min,max,count", by=""))
+    yearly = raw.resample("YS")["Rating"].mean()
+    rolling = yearly.rolling(3, min_periods=1)
+    for stat in ("mean", "sum", "std", "min", "max", "count"):
+        np.testing.assert_allclose(ours[f"rolling_{stat}"], getattr(rolling, stat)(), rtol=1e-9, atol=1e-9)
+    expanding = pd.DataFrame(analyzer.rolling_statistics(date_col="Year", column="Rating", freq="Y", agg="mean",
+                                                         window="expanding", stats="mean,max", by=""))
+    np.testing.assert_allclose(expanding["expanding_mean"], yearly.expanding().mean(), rtol=1e-9)
+    np.testing.assert_allclose(expanding["expanding_max"], yearly.expanding().max(), rtol=1e-9)
+
+
+def test_grouped_monthly_series_match_pandas(scores_csv):
+    analyzer = DataAnalysis(scores_csv, use_cache=False).analyzer
+    raw = pd.read_csv(scores_csv, parse_dates=["Date"]).set_index("Date")
+    grouped = raw.groupby("Team").resample("MS")["Score"]
+    ours = pd.DataFrame(analyzer.resample_time_series(date_col="Date", freq="M", columns="Score",
+                                                      aggs="mean,count,std", by="Team"))
+    theirs = grouped.agg(["mean", "count", "std"]).reset_index()
+    ours = ours.sort_values(["Team", "period"], kind="stable").reset_index(drop=True)
+    assert ours["period"].tolist() == theirs["Date"].dt.strftime("%Y-%m-%d").tolist()
+    for agg in ("mean", "count", "std"):
+        np.testing.assert_allclose(ours[f"Score.{agg}"], theirs[agg].astype(float), rtol=1e-9)
+
+    rolled = pd.DataFrame(analyzer.rolling_statistics(date_col="Date", column="Score", freq="M", agg="mean",
+                                                      window="2", stats="mean,std", by="Team"))
+    rolled = rolled.sort_values(["Team", "period"], kind="stable").reset_index(drop=True)
+    monthly = grouped.mean()
+    for stat in ("mean", "std"):
+        expected = getattr(monthly.groupby(level="Team").rolling(2, min_periods=1), stat)()
+        np.testing.assert_allclose(rolled[f"rolling_{stat}"], expected.to_numpy(), rtol=1e-9, atol=1e-9)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from main import DataAnalysis
+from workspace import Workspace
+
+
+def same_rows(ours: pd.DataFrame, theirs: pd.DataFrame) -> None:
+    """Equal as multisets of rows (joins promise no row order)."""
+    theirs = theirs[list(ours.columns)]
+    ordered = [frame.sort_values(list(frame.columns), kind="stable").reset_index(drop=True)
+               for frame in (ours, theirs)]
+    pd.testing.assert_frame_equal(*ordered, check_dtype=False)
+
+
+@pytest.fixture
+def workspace() -> Workspace:
+    """Two tables with repeated, unmatched and shared keys and a clashing 'score' column."""
+    rng = np.random.default_rng(0)
+    space = Workspace(load=pd.read_csv)
+    space.add("players.csv", pd.DataFrame({
+        "team": rng.choice(["a", "b", "c", "d"], 40), "season": rng.integers(2020, 2024, 40),
+        "id": np.arange(40), "score": rng.normal(size=40).round(3)}))
+    space.add("teams.csv", pd.DataFrame({
+        "team": ["a", "b", "b", "e"] * 3, "season": np.repeat([2020, 2021, 2025], 4),
+        "id": np.arange(100, 112), "score": np.arange(12.0)}))
+    return space
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+@pytest.mark.parametrize("keys, method", [(["id"], "merge"), (["id"], "hash"), (["team"], "hash"),
+                                          (["team", "season"], "auto")])
+def test_join_matches_pd_merge(workspace, how, keys, method):
+    left, right = workspace.datasets["players"], workspace.datasets["teams"]
+    if keys == ["id"]:
+        right = right.assign(id=right["id"] - 80)  # ids 20-31 overlap the players' 0-39
+        workspace.add("teams.csv", right)
+    view = workspace.join("players", "teams", keys, how=how, method=method)
+    expected = pd.merge(left, right, on=keys, how=how, suffixes=("_players", "_teams"))
+    assert len(view) == len(expected)
+    same_rows(view.materialize(), expected)
+
+
+def test_projection_and_missing_keys(workspace):
+    players = workspace.datasets["players"].copy()
+    players.loc[:4, "team"] = None
+    workspace.add("players.csv", players)
+    view = workspace.join("players", "teams", ["team"], how="left")
+    # unlike pd.merge, a missing key never matches; a left join keeps those rows unmatched
+    matched = pd.merge(players.dropna(subset=["team"]), workspace.datasets["teams"], on="team", how="left")
+    assert len(view) == len(matched) + int(players["team"].isna().sum())
+    projected = view.materialize(["team", "score"])
+    assert list(projected.columns) == ["team", "score_players", "score_teams"]
+    with pytest.raises(KeyError):
+        view.materialize(["nope"])
+
+
+def test_join_on_imdb_year(imdb_csv):
+    app = DataAnalysis(imdb_csv, use_cache=False)
+    movies = app.data
+    years = pd.DataFrame({"Year": [1994, 1972, 2008, 1950], "Era": ["90s", "70s", "00s", "50s"]})
+    space = Workspace(load=pd.read_csv)
+    space.add(imdb_csv, movies, name="movies")
+    space.add("years.csv", years)
+    view = space.join("movies", "years", ["Year"])
+    same_rows(view.materialize(["Title", "Year", "Era"]), pd.merge(movies, years, on="Year"))
@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Resampling frequencies: code -> unit the timestamps are floored to
+FREQUENCIES = {"D": "day", "W": "week", "M": "month", "Q": "quarter", "Y": "year"}
+AGGREGATIONS = ("mean", "sum", "min", "max", "count", "std", "median", "first", "last")
+# Window statistics; all of them are updated incrementally as the window slides
+WINDOW_STATS = ("mean", "sum", "min", "max", "std", "count")
+# Integer columns whose values all fall in this range are read as years
+YEAR_RANGE = (1000, 9999)
+
+
+def parse_datetimes(series: pd.Series) -> pd.Series:
+    """
+    Parse a column into datetime64 without touching the original. Each distinct value is
+    parsed once, with a single format inferred from the first value ("mixed" only when
+    that format does not fit every value); integer columns of plausible years become
+    1 January of that year. ValueError when nothing in the column is a date.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        present = values[~np.isnan(values)]
+        if present.size and YEAR_RANGE[0] <= present.min() and present.max() <= YEAR_RANGE[1]:
+            years = np.full(values.shape, np.datetime64("NaT"), dtype="datetime64[Y]")
+            years[~np.isnan(values)] = (present - 1970).astype("int64").astype("datetime64[Y]")
+            return pd.Series(years.astype("datetime64[ns]"), index=series.index, name=series.name)
+        raise ValueError(f"Column '{series.name}' holds numbers, not years or dates")
+
+    codes, uniques = pd.factorize(series)
+    if not len(uniques):
+        raise ValueError(f"Column '{series.name}' has no values")
+    text = pd.Series(uniques).astype(str)
+    fmt = guess_datetime_format(text.iloc[0])
+    parsed = pd.to_datetime(text, format=fmt or "mixed", errors="coerce")
+    if fmt and parsed.isnull().any():
+        parsed = pd.to_datetime(text, format="mixed", errors="coerce")
+    if parsed.isnull().all():
+        raise ValueError(f"Column '{series.name}' could not be parsed as dates")
+    values = parsed.to_numpy(dtype="datetime64[ns]")
+    result = np.where(codes >= 0, values[np.maximum(codes, 0)], np.datetime64("NaT"))
+    return pd.Series(result.astype("datetime64[ns]"), index=series.index, name=series.name)
+
+
+def floor_times(times: pd.Series, freq: str) -> np.ndarray:
+    """Start of the day/week (Monday)/month/quarter/year containing each timestamp."""
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{freq}'. Choose from: {', '.join(FREQUENCIES)}")
+    values = times.to_numpy(dtype="datetime64[ns]")
+    if freq == "D":
+        floored = values.astype("datetime64[D]")
+    elif freq == "W":
+        days = values.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday, so day number + 3 counts from a Monday
+        floored = days - ((days.astype("int64") + 3) % 7).astype("timedelta64[D]")
+    elif freq == "M":
+        floored = values.astype("datetime64[M]")
+    elif freq == "Q":
+        months = values.astype("datetime64[M]").astype("int64")
+        floored = (months - months % 3).astype("datetime64[M]")
+    else:
+        floored = values.astype("datetime64[Y]")
+    floored = floored.astype("datetime64[ns]")
+    floored[np.isnat(values)] = np.datetime64("NaT")
+    return floored
+
+
+def period_grid(start: np.datetime64, end: np.datetime64, freq: str) -> np.ndarray:
+    """Every period start from `start` to `end` (both already floored)."""
+    if freq == "D":
+        grid = np.arange(start.astype("datetime64[D]"), end.astype("datetime64[D]") + 1)
+    elif freq == "W":
+        grid = np.arange(start.astype("datetime64[D]"), end.astype("datetime64[D]") + 1, 7)
+    elif freq in ("M", "Q"):
+        step = 3 if freq == "Q" else 1
+        grid = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1, step)
+    else:
+        grid = np.arange(start.astype("datetime64[Y]"), end.astype("datetime64[Y]") + 1)
+    return grid.astype("datetime64[ns]")
+
+
+def resample(data: pd.DataFrame, times: pd.Series, freq: str, columns: List[str], aggs: List[str],
+             by: Optional[str] = None) -> pd.DataFrame:
+    """
+    Aggregate `columns` per period (and per `by` group) on a regular grid: periods
+    without rows are present, with 0 for count/sum and NaN otherwise, like
+    DataFrame.resample. Each group's grid spans that group's own first to last period.
+    """
+    unknown = [agg for agg in aggs if agg not in AGGREGATIONS]
+    if unknown:
+        raise ValueError(f"Unknown aggregation '{unknown[0]}'. Choose from: {', '.join(AGGREGATIONS)}")
+    periods = floor_times(times, freq)
+    valid = ~np.isnat(periods)
+    frame = data.loc[valid, columns].apply(pd.to_numeric, errors="coerce")
+    frame["period"] = periods[valid]
+    keys = ["period"]
+    if by:
+        frame[by] = data.loc[valid, by].to_numpy()
+        keys = [by, "period"]
+    stats = frame.groupby(keys, observed=True, sort=True)[columns].agg(aggs)
+    if not len(stats):
+        return stats
+
+    zero = [col for col in stats.columns if col[1] in ("count", "sum")]
+    if by:
+        starts = stats.index.get_level_values("period")
+        groups = stats.index.get_level_values(by)
+        span = pd.DataFrame({"start": starts, "group": groups}).groupby("group", observed=True, sort=False)["start"]
+        bounds = span.agg(["min", "max"])
+        index = pd.MultiIndex.from_tuples(
+            [(group, period) for group, (low, high) in bounds.iterrows()
+             for period in period_grid(np.datetime64(low), np.datetime64(high), freq)], names=keys)
+    else:
+        index = pd.DatetimeIndex(period_grid(periods[valid].min(), periods[valid].max(), freq), name="period")
+    stats = stats.reindex(index)
+    stats[zero] = stats[zero].fillna(0)
+    return stats
+
+
+def _segment_starts(groups: Optional[np.ndarray], n: int) -> np.ndarray:
+    if groups is None or n == 0:
+        return np.array([0, n])
+    change = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    return np.concatenate([[0], change, [n]])
+
+
+def _window_extreme(values: np.ndarray, window: int, stat: str) -> np.ndarray:
+    """
+    Trailing-window max/min in O(n) for any window (van Herk / Gil-Werman): within blocks
+    of `window` values a running max from the left and one from the right give every
+    window as the combination of two lookups. NaN values are skipped.
+    """
+    func = np.fmax if stat == "max" else np.fmin
+    n = values.size
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, np.nan)
+    padded[:n] = values
+    shaped = padded.reshape(blocks, window)
+    prefix = func.accumulate(shaped, axis=1).ravel()
+    suffix = func.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].ravel()
+    result = func.accumulate(values) if n else values.copy()  # windows still growing at the start
+    ends = np.arange(window - 1, n)
+    result[window - 1:] = func(suffix[ends - window + 1], prefix[ends])
+    return result
+
+
+def _window(values: np.ndarray, window: Optional[int], stat: str, min_periods: int) -> np.ndarray:
+    """Trailing window (or expanding, with window=None) statistic of one contiguous series."""
+    n = values.size
+    present = ~np.isnan(values)
+    count = np.cumsum(present)
+    if window is not None:
+        count = count - np.concatenate([np.zeros(min(window, n), dtype=np.int64), count[:max(n - window, 0)]])
+    if stat == "count":
+        return count.astype(np.float64)
+    if stat in ("min", "max"):
+        if window is None:
+            result = (np.fmax if stat == "max" else np.fmin).accumulate(values) if n else values.copy()
+        else:
+            result = _window_extreme(values, window, stat)
+    else:
+        # Every window is the previous one plus the new value minus the one leaving it:
+        # differences of cumulative sums (of values centered on the series mean, which keeps them small)
+        shift = values[present].mean() if present.any() else 0.0
+        centered = np.where(present, values - shift, 0.0)
+        sums, squares = np.cumsum(centered), np.cumsum(centered * centered)
+        if window is not None:
+            lag = np.concatenate([np.zeros(min(window, n)), sums[:max(n - window, 0)]])
+            lag_sq = np.concatenate([np.zeros(min(window, n)), squares[:max(n - window, 0)]])
+            sums, squares = sums - lag, squares - lag_sq
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums / count
+            if stat == "mean":
+                result = mean + shift
+            elif stat == "sum":
+                result = sums + shift * count
+            else:
+                variance = (squares - sums * mean) / (count - 1)
+                result = np.sqrt(np.maximum(variance, 0.0))
+                result[count < 2] = np.nan
+    result = np.asarray(result, dtype=np.float64)
+    result[count < min_periods] = np.nan
+    return result
+
+
+def window_stats(values: np.ndarray, stats: List[str], window: Optional[int] = None,
+                 groups: Optional[np.ndarray] = None, min_periods: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Rolling (`window` periods) or expanding (window=None) statistics of a regular series,
+    restarting at every change of `groups` (the series must be sorted by group).
+    Windows with fewer than `min_periods` values (default: the window, or 1) are NaN.
+    """
+    unknown = [stat for stat in stats if stat not in WINDOW_STATS]
+    if unknown:
+        raise ValueError(f"Unknown window statistic '{unknown[0]}'. Choose from: {', '.join(WINDOW_STATS)}")
+    if window is not None and window < 1:
+        raise ValueError("The window must be at least 1 period")
+    if min_periods is None:
+        min_periods = window or 1
+    values = np.asarray(values, dtype=np.float64)
+    bounds = _segment_starts(groups, values.size)
+    results = {stat: np.empty(values.size) for stat in stats}
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        for stat in stats:
+            results[stat][start:end] = _window(values[start:end], window, stat, min_periods)
+    return results
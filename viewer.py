@@ -1,52 +1,183 @@
 from printer import Printer
+from query import FrameSource, Query, Source, parse_order
+from typing import List, Optional, Union
 
 class Viewer:
-    def __init__(self, data) -> None:
+    """
+    Previews go through a lazy Query on `source`: the loaded frame by default, or the
+    CSV file itself (see query.CsvSource), which then reads only the columns and the
+    first rows shown instead of the whole file. Paging and sampling read single rows the
+    same way, through the file's row index (see rowindex.RowIndex).
+    """
+    def __init__(self, data=None, source: Optional[Source] = None) -> None:
         self.printer = Printer().printer
         self.rows = 5
         self.data = data
-        if self.data is None or self.data.empty:
-            self.printer("No data loaded.", "error")
-            return
+        self.source = source if source is not None else FrameSource(data) if data is not None else None
         self.data_output_style = "table"
+        # Paging: rows per page and the first row of the page shown last (None before any)
+        self.page_rows = 20
+        self.position: Optional[int] = None
+        if self.source is None or not self.source.columns():
+            self.printer("No data loaded.", "error")
+
+    def _columns(self) -> List[str]:
+        return self.source.columns() if self.source is not None else []
 
     def preview_rows(self):
         num_rows = self.rows
         # Display  few rows of the dataset
         self.printer(f"Displaying {num_rows} rows of the dataset:", "info")
-        self.printer(self.data.head(num_rows).to_dict('records'), self.data_output_style)
-    
-    def preview_column(self):
+        result = Query(self.source).limit(num_rows).collect().to_dict('records')
+        self.printer(result, self.data_output_style)
+        return result
+
+    def preview_column(self, column_name: Optional[str] = None):
         num_rows = self.rows
-        column_name = input("Enter the column name to preview: ").strip()
+        if column_name is None:
+            column_name = input("Enter the column name to preview: ").strip()
         # Display  few entries of a specific column
-        if self.data.empty:
+        if not self._columns():
             self.printer("No data loaded.", "error")
             return
-        if column_name not in self.data.columns:
+        if column_name not in self._columns():
             self.printer(f"Column '{column_name}' not found in the dataset.", "error")
             return
         self.printer(f"Displaying {num_rows} entries of column '{column_name}':", "info")
-        self.printer([{"value": val} for val in self.data[column_name].head(num_rows)], self.data_output_style)
+        values = Query(self.source).select(column_name).limit(num_rows).collect()[column_name]
+        result = [{"value": val} for val in values]
+        self.printer(result, self.data_output_style)
+        return result
 
-    def preview_multiple_columns(self):
+    def preview_multiple_columns(self, column_names: Optional[Union[str, List[str]]] = None):
         num_rows = self.rows
-        column_names = input("Enter the column names to preview (comma-separated): ").strip().split(",")
+        if column_names is None:
+            column_names = input("Enter the column names to preview (comma-separated): ")
+        if isinstance(column_names, str):
+            column_names = column_names.strip().split(",")
         column_names = [name.strip() for name in column_names]
         # Display  few entries of specific columns
-        if self.data.empty:
+        if not self._columns():
             self.printer("No data loaded.", "error")
             return
-        missing_columns = [name for name in column_names if name not in self.data.columns]
+        missing_columns = [name for name in column_names if name not in self._columns()]
         if missing_columns:
             self.printer(f"Columns '{', '.join(missing_columns)}' not found in the dataset.", "error")
             return
         self.printer(f"Displaying {num_rows} entries of columns '{', '.join(column_names)}':", "info")
         first_col = column_names[0]
-        result = self.data[column_names].head(num_rows).set_index(first_col).to_dict('index')
+        frame = Query(self.source).select(*column_names).limit(num_rows).collect()
+        result = frame.set_index(first_col).to_dict('index')
+        self.printer(result, self.data_output_style)
+        return result
+
+    def query_rows(self, where: Optional[str] = None, columns: Optional[Union[str, List[str]]] = None,
+                   order_by: Optional[str] = None, limit: Optional[int] = None):
+        """Rows matching a filter, optionally sorted; only the columns involved are read."""
+        if where is None:
+            where = input("Filter, e.g. 'HR >= 10 and Team == NYY' (press Enter for none): ").strip()
+        if columns is None:
+            columns = input("Columns to show, comma-separated (press Enter for all): ").strip()
+        if order_by is None:
+            order_by = input("Sort by, e.g. 'HR desc' (press Enter for file order): ").strip()
+        if limit is None:
+            limit = input(f"Number of rows (press Enter for {self.rows}): ").strip() or self.rows
+        try:
+            limit = int(limit)
+        except ValueError:
+            self.printer("The number of rows must be an integer.", "error")
+            return None
+        if isinstance(columns, str):
+            columns = [name.strip() for name in columns.split(",") if name.strip()]
+        plan = Query(self.source)
+        try:
+            if where:
+                plan = plan.where(where)
+            if columns:
+                plan = plan.select(*columns)
+            order = parse_order(order_by)
+            if order:
+                plan = plan.sort(*order)
+            plan = plan.limit(limit)
+            frame = plan.collect()
+        except (KeyError, ValueError) as e:
+            self.printer(str(e).strip("'\""), "error")
+            return None
+        self.printer("Plan: " + " -> ".join(plan.explain()), "info")
+        stats = plan.stats
+        if "blocks_read" in stats:
+            self.printer(f"Read {stats['blocks_read']} block(s) ({stats['bytes_read'] / 1024:.0f} KiB, "
+                         f"{stats['rows_scanned']} rows); {stats['blocks_skipped']} skipped by zone maps"
+                         + ("; stopped early" if stats["stopped_early"] else "") + ".", "info")
+        result = frame.to_dict('records')
+        self.printer(f"{len(result)} matching row(s):", "info")
+        self.printer(result, self.data_output_style)
+        return result
+
+    @staticmethod
+    def _numbered(frame) -> List[dict]:
+        return [{"row": int(label), **record} for label, record in zip(frame.index, frame.to_dict('records'))]
+
+    def _show_page(self, start: int):
+        if not self._columns():
+            self.printer("No data loaded.", "error")
+            return
+        total = self.source.row_count()
+        if not total:
+            self.printer("The dataset has no rows.", "info")
+            return []
+        start = max(0, min(start, total - 1))
+        frame = self.source.slice(start, start + self.page_rows)
+        self.position = start
+        self.printer(f"Rows {start}-{start + len(frame) - 1} of {total} (numbered from 0):", "info")
+        result = self._numbered(frame)
         self.printer(result, self.data_output_style)
-    
+        return result
+
+    def next_page(self):
+        if self.position is None:
+            return self._show_page(0)
+        last = max(self.source.row_count() - self.page_rows, 0)
+        return self._show_page(min(self.position + self.page_rows, last))
+
+    def prev_page(self):
+        return self._show_page(max((self.position or 0) - self.page_rows, 0))
+
+    def jump_to_row(self, row: Optional[Union[int, str]] = None):
+        if row is None:
+            row = input("Row number to jump to (numbered from 0): ").strip()
+        try:
+            row = int(row)
+        except ValueError:
+            self.printer("The row number must be an integer.", "error")
+            return
+        return self._show_page(row)
+
+    def tail_rows(self):
+        return self._show_page(max(self.source.row_count() - self.page_rows, 0))
+
+    def sample_rows(self, count: Optional[Union[int, str]] = None, seed: Optional[int] = None):
+        """Rows drawn uniformly at random, shown in file order."""
+        if count is None:
+            count = input(f"Number of rows to sample (press Enter for {self.rows}): ").strip() or self.rows
+        try:
+            count = int(count)
+            seed = int(seed) if seed not in (None, "") else None
+        except ValueError:
+            self.printer("The number of rows and the seed must be integers.", "error")
+            return
+        if not self._columns():
+            self.printer("No data loaded.", "error")
+            return
+        frame = self.source.sample(count, seed)
+        self.printer(f"{len(frame)} random row(s) of {self.source.row_count()}:", "info")
+        result = self._numbered(frame)
+        self.printer(result, self.data_output_style)
+        return result
+
     def list_columns(self):
         self.printer("Columns in the dataset:", "info")
         # Show columns in a table format
-        self.printer([{"column": col} for col in self.data.columns.tolist()], self.data_output_style)
\ No newline at end of file
+        result = [{"column": col} for col in self._columns()]
+        self.printer(result, self.data_output_style)
+        return result
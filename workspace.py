@@ -0,0 +1,308 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from printer import Printer
+
+JOIN_TYPES = ("inner", "left", "outer")
+JOIN_METHODS = ("auto", "hash", "merge")
+
+
+def _row_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of range(start, start + count) for every pair, without a Python loop."""
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+class HashJoinIndex:
+    """Rows of a dataset grouped by key value; probes are one hash lookup per distinct key."""
+    kind = "hash"
+
+    def __init__(self, data: pd.DataFrame, keys: List[str]) -> None:
+        frame = data[keys]
+        valid = frame.notna().all(axis=1).to_numpy()
+        if len(keys) == 1:
+            codes, uniques = pd.factorize(frame.iloc[:, 0])
+            self.uniques: pd.Index = pd.Index(uniques)
+        else:
+            codes, uniques = pd.factorize(pd.MultiIndex.from_frame(frame))
+            self.uniques = uniques
+        codes = np.where(valid, codes, -1)
+        matched = np.flatnonzero(codes >= 0)
+        # positions grouped by key code; key k owns positions[starts[k]:starts[k] + counts[k]]
+        self.positions = matched[np.argsort(codes[matched], kind="stable")]
+        self.counts = np.bincount(codes[matched], minlength=len(self.uniques))
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def lookup(self, probe: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """For every probe row, the start and count of its matches in `positions`."""
+        if probe.shape[1] == 1:
+            found = self.uniques.get_indexer(probe.iloc[:, 0])
+        else:
+            found = self.uniques.get_indexer(pd.MultiIndex.from_frame(probe))
+        found[~probe.notna().all(axis=1).to_numpy()] = -1  # missing keys never match
+        hit = found >= 0
+        starts = np.zeros(len(probe), dtype=np.int64)
+        counts = np.zeros(len(probe), dtype=np.int64)
+        starts[hit] = self.starts[found[hit]]
+        counts[hit] = self.counts[found[hit]]
+        return starts, counts
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self.positions.nbytes + self.counts.nbytes * 2 + \
+            int(self.uniques.memory_usage(deep=True))
+
+
+class SortedJoinIndex:
+    """A single key column in sorted order; two of them are joined with a vectorized merge."""
+    kind = "merge"
+
+    def __init__(self, data: pd.DataFrame, keys: List[str]) -> None:
+        if len(keys) != 1:
+            raise ValueError("A sorted join index needs exactly one key column")
+        column = data[keys[0]]
+        valid = np.flatnonzero(column.notna().to_numpy())
+        values = column.to_numpy()[valid]
+        order = np.argsort(values, kind="stable")
+        self.positions = valid[order]
+        self.values = values[order]
+
+    def merge(self, other: "SortedJoinIndex") -> Tuple[np.ndarray, np.ndarray]:
+        """Matches of every row of this index in `other`: start and count within other.positions."""
+        starts = np.searchsorted(other.values, self.values, side="left")
+        counts = np.searchsorted(other.values, self.values, side="right") - starts
+        return starts, counts
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self.positions.nbytes + self.values.nbytes
+
+
+class JoinedView:
+    """
+    Lazy join of two workspace datasets. Only the matching row positions are
+    computed (once, on first use); columns are gathered from the source tables
+    when a projection is materialized.
+    """
+    def __init__(self, workspace: "Workspace", left: str, right: str, keys: List[str],
+                 how: str = "inner", method: str = "auto") -> None:
+        self.workspace = workspace
+        self.left, self.right = left, right
+        self.keys = keys
+        self.how = how
+        self.method = method
+        self._pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _resolve_method(self) -> str:
+        if self.method != "auto":
+            return "hash" if len(self.keys) > 1 else self.method
+        column = self.workspace.datasets[self.left][self.keys[0]]
+        return "merge" if len(self.keys) == 1 and pd.api.types.is_numeric_dtype(column) else "hash"
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Left and right row positions of the joined rows; -1 marks the missing side of an outer row."""
+        if self._pairs is not None:
+            return self._pairs
+        left_data = self.workspace.datasets[self.left]
+        right_data = self.workspace.datasets[self.right]
+        if self._resolve_method() == "merge":
+            left_index = self.workspace.index(self.left, self.keys, "merge")
+            right_index = self.workspace.index(self.right, self.keys, "merge")
+            starts, counts = left_index.merge(right_index)
+            probe_rows = left_index.positions
+        else:
+            right_index = self.workspace.index(self.right, self.keys, "hash")
+            starts, counts = right_index.lookup(left_data[self.keys])
+            probe_rows = np.arange(len(left_data))
+        left_pos = np.repeat(probe_rows, counts)
+        right_pos = right_index.positions[_row_ranges(starts, counts)]
+
+        if self.how in ("left", "outer"):
+            unmatched = np.setdiff1d(np.arange(len(left_data)), left_pos, assume_unique=False)
+            left_pos = np.concatenate([left_pos, unmatched])
+            right_pos = np.concatenate([right_pos, np.full(len(unmatched), -1)])
+        if self.how == "outer":
+            unmatched = np.setdiff1d(np.arange(len(right_data)), right_pos)
+            left_pos = np.concatenate([left_pos, np.full(len(unmatched), -1)])
+            right_pos = np.concatenate([right_pos, unmatched])
+        self._pairs = (left_pos, right_pos)
+        return self._pairs
+
+    def __len__(self) -> int:
+        return len(self.pairs()[0])
+
+    def _all_sources(self) -> Dict[str, Tuple[Optional[str], str]]:
+        """Output column -> (dataset, source column); join keys appear once, with dataset None."""
+        left_cols = list(self.workspace.datasets[self.left].columns)
+        right_cols = list(self.workspace.datasets[self.right].columns)
+        shared = set(left_cols) & set(right_cols)
+        sources: Dict[str, Tuple[Optional[str], str]] = {}
+        for name, cols in ((self.left, left_cols), (self.right, right_cols)):
+            for col in cols:
+                if col in self.keys:
+                    sources.setdefault(col, (None, col))
+                else:
+                    sources[f"{col}_{name}" if col in shared else col] = (name, col)
+        return sources
+
+    def columns(self) -> List[str]:
+        """Output column names: other columns present in both datasets are suffixed with the dataset name."""
+        return list(self._all_sources())
+
+    def materialize(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Build a DataFrame holding only the projected columns (all of them when None).
+        A clashing column requested by its plain name ('HR') brings both suffixed copies.
+        """
+        left_pos, right_pos = self.pairs()
+        sources = self._all_sources()
+        if columns is not None:
+            unknown = [col for col in columns if col not in sources
+                       and not any(src == col for _, src in sources.values())]
+            if unknown:
+                raise KeyError(f"Unknown column(s) in projection: {', '.join(unknown)}")
+            sources = {out: src for out, src in sources.items() if out in columns or src[1] in columns}
+        result = {}
+        for out, (name, col) in sources.items():
+            if name is None:
+                # join keys: taken from the left row, or the right one for right-only outer rows
+                values = self._take(self.left, col, left_pos)
+                if self.how == "outer" and (left_pos < 0).any():
+                    values = values.where(left_pos >= 0, self._take(self.right, col, right_pos))
+                result[out] = values
+            else:
+                result[out] = self._take(name, col, left_pos if name == self.left else right_pos)
+        return pd.DataFrame(result)
+
+    def _take(self, dataset: str, column: str, positions: np.ndarray) -> pd.Series:
+        series = self.workspace.datasets[dataset][column]
+        if (positions >= 0).all():
+            return pd.Series(series.array.take(positions), name=column)
+        return pd.Series(series.array.take(positions, allow_fill=True), name=column)
+
+
+class Workspace:
+    """Several datasets loaded side by side, with join indexes cached per (dataset, keys, kind)."""
+    def __init__(self, load: Callable[[str], pd.DataFrame]) -> None:
+        self.printer = Printer().printer
+        self.load = load
+        self.datasets: Dict[str, pd.DataFrame] = {}
+        self.paths: Dict[str, str] = {}
+        self._indexes: Dict[tuple, object] = {}
+        self.data_output_style = "table"
+
+    @staticmethod
+    def name_for(path: str) -> str:
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def add(self, path: str, data: Optional[pd.DataFrame] = None, name: Optional[str] = None) -> str:
+        """Register a dataset (loading it unless `data` is given); indexes of a replaced dataset are dropped."""
+        name = name or self.name_for(path)
+        self.datasets[name] = data if data is not None else self.load(path)
+        self.paths[name] = path
+        self._indexes = {key: index for key, index in self._indexes.items() if key[0] != name}
+        return name
+
+    def index(self, name: str, keys: List[str], kind: str):
+        """Build or reuse the join index of one dataset on `keys`."""
+        key = (name, tuple(keys), kind)
+        if key not in self._indexes:
+            data = self.datasets[name]
+            self._indexes[key] = SortedJoinIndex(data, keys) if kind == "merge" else HashJoinIndex(data, keys)
+        return self._indexes[key]
+
+    def candidate_keys(self, left: str, right: str) -> List[str]:
+        """Shared integer columns that are unique in both datasets, e.g. PlayerId and MLBAMID."""
+        left_data, right_data = self.datasets[left], self.datasets[right]
+        return [col for col in left_data.columns if col in right_data.columns
+                and pd.api.types.is_integer_dtype(left_data[col]) and pd.api.types.is_integer_dtype(right_data[col])
+                and left_data[col].is_unique and right_data[col].is_unique]
+
+    def join(self, left: str, right: str, keys: List[str], how: str = "inner", method: str = "auto") -> JoinedView:
+        for name in (left, right):
+            if name not in self.datasets:
+                raise KeyError(f"Dataset '{name}' is not loaded")
+            missing = [key for key in keys if key not in self.datasets[name].columns]
+            if missing:
+                raise KeyError(f"Dataset '{name}' has no column(s) {', '.join(missing)}")
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Unknown join type '{how}'. Choose from: {', '.join(JOIN_TYPES)}")
+        if method not in JOIN_METHODS:
+            raise ValueError(f"Unknown join method '{method}'. Choose from: {', '.join(JOIN_METHODS)}")
+        return JoinedView(self, left, right, keys, how, method)
+
+    def list_datasets(self):
+        rows = [{"dataset": name, "rows": len(data), "columns": len(data.columns), "path": self.paths[name]}
+                for name, data in self.datasets.items()]
+        self.printer(rows, self.data_output_style)
+        return rows
+
+    def load_dataset(self, path: Optional[str] = None, folder: str = "data/"):
+        """Add another CSV to the workspace, chosen from `folder` unless a path is given."""
+        if path is None:
+            loaded = set(self.paths.values())
+            files = [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+                     if f.endswith(".csv") and os.path.join(folder, f) not in loaded]
+            if not files:
+                self.printer("Every CSV file in the data folder is already loaded.", "info")
+                return self.list_datasets()
+            self.printer([{"id": str(i), "file": os.path.basename(f)} for i, f in enumerate(files, 1)], "table")
+            choice = input("Enter the number of the CSV file to add: ").strip()
+            try:
+                path = files[int(choice) - 1]
+            except (ValueError, IndexError):
+                self.printer("Invalid selection.", "error")
+                return None
+        if not os.path.exists(path):
+            self.printer(f"File '{path}' not found.", "error")
+            return None
+        name = self.add(path)
+        if self.datasets[name].empty:
+            del self.datasets[name], self.paths[name]
+            return None
+        self.printer(f"Loaded '{name}'.", "info")
+        return self.list_datasets()
+
+    def join_datasets(self, left: str, right: Optional[str] = None, on: Optional[str] = None,
+                      how: Optional[str] = None, columns: Optional[str] = None,
+                      method: str = "auto") -> Optional[pd.DataFrame]:
+        """Join two datasets on key columns and materialize the projected columns of the result."""
+        others = [name for name in self.datasets if name != left]
+        if not others:
+            self.printer("Load another dataset first (load_dataset).", "error")
+            return None
+        if right is None:
+            self.printer([{"dataset": name} for name in others], "table")
+            right = input(f"Dataset to join with '{left}' (press Enter for '{others[0]}'): ").strip() or others[0]
+        if right not in self.datasets:
+            self.printer(f"Dataset '{right}' is not loaded.", "error")
+            return None
+        if on is None:
+            candidates = self.candidate_keys(left, right)
+            hint = f"press Enter for {', '.join(candidates)}" if candidates else "comma-separated"
+            on = input(f"Join key column(s) ({hint}): ").strip() or ", ".join(candidates)
+        keys = [key.strip() for key in on.split(",") if key.strip()]
+        if not keys:
+            self.printer("No join keys given.", "error")
+            return None
+        if how is None:
+            how = input("Join type inner, left or outer (press Enter for inner): ").strip()
+        try:
+            view = self.join(left, right, keys, (how or "inner").lower(), method)
+        except (KeyError, ValueError) as e:
+            self.printer(str(e.args[0]), "error")
+            return None
+        if columns is None:
+            self.printer(f"Joined columns: {', '.join(view.columns())}", "info")
+            columns = input("Columns to keep, comma-separated (press Enter for all): ").strip()
+        projection = [col.strip() for col in columns.split(",") if col.strip()] or None
+        try:
+            data = view.materialize(projection)
+        except KeyError as e:
+            self.printer(str(e.args[0]), "error")
+            return None
+        self.printer(f"Joined '{left}' with '{right}' on {', '.join(keys)} ({view.how}): "
+                     f"{len(data)} rows, {len(data.columns)} columns.", "info")
+        return data